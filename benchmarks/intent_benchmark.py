@@ -0,0 +1,184 @@
+"""
+Measure command routing cost of the compiled intent matcher against the old substring scans
+
+Replays transcripts, one per line from a file, or a generated mix of commands
+and questions built from the phrase tables and config.json:
+
+    python benchmarks/intent_benchmark.py --count 5000
+    python benchmarks/intent_benchmark.py --transcripts fixtures/transcripts.txt
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.intent_matcher import (IntentMatcher, COMMAND_VARIATIONS, SLEEP_PHRASES, OPEN_VERBS,
+                                    CLOSE_VERBS, MINIMIZE_WORDS, MAXIMIZE_WORDS, SYSTEM_WORDS,
+                                    GOODBYE_WORDS)
+
+QUESTIONS = [
+    "what is the weather like in {}", "tell me a joke about {}", "who won the match yesterday",
+    "how far is the moon", "explain how {} works", "what time is it in {}",
+    "remind me what {} means", "can you summarize the news about {}"
+]
+TOPICS = ["delhi", "python", "cricket", "black holes", "coffee", "mumbai", "the stock market"]
+
+def legacy_route(command, system_commands, media=True):
+    """The routing cascade process_command used before the intent matcher, for comparison"""
+    # The phrase tables were rebuilt on every command
+    variations = {key: list(phrases) for key, phrases in COMMAND_VARIATIONS.items()}
+
+    if command == "open spotify" or any(keyword in command for keyword in variations['music_keywords']):
+        return "music", legacy_music_action(command)
+    if media and any(cmd in command for cmd in variations['volume_commands']):
+        return "volume", legacy_music_action(command)
+    if media and any(cmd in command for cmd in variations['playback_controls']):
+        return "playback", legacy_music_action(command)
+    if any(phrase in command for phrase in SLEEP_PHRASES):
+        return "sleep", None
+    if any(cmd in command for cmd in variations['mute_commands']):
+        return "mute", None
+    if any(cmd in command for cmd in variations['unmute_commands']):
+        return "unmute", None
+    if any(cmd in command for cmd in OPEN_VERBS):
+        return "open", None
+    if command.startswith("write"):
+        return "write", None
+    if any(cmd in command for cmd in CLOSE_VERBS):
+        return "close", None
+    if any(cmd in command for cmd in MINIMIZE_WORDS):
+        return "minimize", None
+    if any(cmd in command for cmd in MAXIMIZE_WORDS):
+        return "maximize", None
+    if any(cmd in command for cmd in SYSTEM_WORDS):
+        for cmd in system_commands:
+            if any(keyword in command for keyword in [cmd, f"{cmd} computer", f"{cmd} system"]):
+                return "system", None
+    if any(word in command for word in GOODBYE_WORDS):
+        return "goodbye", None
+    return "ai", None
+
+def legacy_music_action(command):
+    """The second scan handle_music_command used to do"""
+    if "open spotify" in command:
+        return "launch"
+    if "play" in command:
+        if command in ["play", "play music", "play song", "play something"]:
+            return "play_random"
+        # Search term and category were cut out with more scans
+        search_term = command.replace("play", "").strip()
+        for word in ("playlist", "artist", "album"):
+            if word in search_term:
+                search_term = search_term.replace(word, "").strip()
+                break
+        return "search"
+    if command in ["pause", "stop"]:
+        return "pause"
+    if command in ["resume", "continue"]:
+        return "resume"
+    if command in ["next", "skip", "next song"]:
+        return "next"
+    if command in ["previous", "back", "last song"]:
+        return "previous"
+    if "shuffle" in command:
+        return "shuffle"
+    if "repeat" in command:
+        return "repeat"
+    if "like" in command or "save" in command:
+        return "like"
+    if "volume up" in command or "louder" in command:
+        return "volume_up"
+    if "volume down" in command or "quieter" in command:
+        return "volume_down"
+    if "minimize" in command:
+        return "minimize"
+    if "restore" in command:
+        return "restore"
+    if "close" in command:
+        return "close"
+    return "unknown"
+
+def generate_transcripts(config, count, seed):
+    """A reproducible mix of commands, app and site requests, dictation and questions"""
+    rng = random.Random(seed)
+    apps = [app for group in config.get("applications", {}).values() for app in group]
+    sites = list(config.get("urls", {}))
+    commands = [phrase for phrases in COMMAND_VARIATIONS.values() for phrase in phrases]
+    commands += SLEEP_PHRASES + GOODBYE_WORDS + [f"{cmd} computer" for cmd in config.get("system_commands", {})]
+
+    makers = [
+        lambda: rng.choice(commands),
+        lambda: f"play {rng.choice(['', 'playlist ', 'artist ', 'album '])}{rng.choice(TOPICS)}",
+        lambda: f"{rng.choice(OPEN_VERBS)} {rng.choice(apps + sites)}",
+        lambda: f"open {rng.choice(apps)} and write {rng.choice(TOPICS)}",
+        lambda: f"{rng.choice(CLOSE_VERBS[:4])} {rng.choice(apps)}",
+        lambda: f"{rng.choice(MINIMIZE_WORDS + MAXIMIZE_WORDS)} {rng.choice(apps)}",
+        lambda: f"write {rng.choice(TOPICS)}",
+        lambda: rng.choice(QUESTIONS).format(rng.choice(TOPICS)),
+        lambda: rng.choice(QUESTIONS).format(rng.choice(TOPICS)),
+    ]
+    return [rng.choice(makers)().strip() for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transcripts", help="file with one transcript per line")
+    parser.add_argument("--count", type=int, default=3000, help="transcripts to generate")
+    parser.add_argument("--seed", type=int, default=7, help="seed for generated transcripts")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the transcripts")
+    parser.add_argument("--no-media", action="store_true", help="route as if Spotify isn't set up")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(base_dir, "config.json"), "r", encoding="utf-8") as f:
+        config = json.load(f)
+    system_commands = config.get("system_commands", {})
+    media = not args.no_media
+
+    if args.transcripts:
+        with open(args.transcripts, "r", encoding="utf-8") as f:
+            transcripts = [line.strip().lower() for line in f if line.strip()]
+    else:
+        transcripts = generate_transcripts(config, args.count, args.seed)
+
+    started = time.perf_counter()
+    matcher = IntentMatcher(COMMAND_VARIATIONS, system_commands, media=media)
+    build_seconds = time.perf_counter() - started
+
+    # intent -> [count, legacy seconds, compiled seconds, disagreements]
+    results = {}
+    for _ in range(args.repeat):
+        for command in transcripts:
+            started = time.perf_counter()
+            legacy = legacy_route(command, system_commands, media)
+            legacy_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            intent = matcher.match(command)
+            compiled_seconds = time.perf_counter() - started
+
+            row = results.setdefault(intent.name, [0, 0.0, 0.0, 0])
+            row[0] += 1
+            row[1] += legacy_seconds
+            row[2] += compiled_seconds
+            action = intent.slots.get("action") if intent.name in ("music", "volume", "playback") else None
+            if (intent.name, action) != legacy:
+                row[3] += 1
+
+    print(f"{len(transcripts)} transcripts x {args.repeat} passes, matcher built in {1000 * build_seconds:.2f} ms\n")
+    print(f"{'intent':<10} {'count':>7} {'legacy us':>10} {'compiled us':>12} {'speedup':>8} {'differ':>7}")
+    totals = [0, 0.0, 0.0, 0]
+    for name, (count, legacy_seconds, compiled_seconds, differ) in sorted(results.items(), key=lambda item: -item[1][0]):
+        print(f"{name:<10} {count:>7} {1e6 * legacy_seconds / count:>10.2f} {1e6 * compiled_seconds / count:>12.2f} "
+              f"{legacy_seconds / compiled_seconds if compiled_seconds else 0:>7.1f}x {differ:>7}")
+        totals = [total + value for total, value in zip(totals, (count, legacy_seconds, compiled_seconds, differ))]
+    count, legacy_seconds, compiled_seconds, differ = totals
+    print(f"{'all':<10} {count:>7} {1e6 * legacy_seconds / count:>10.2f} {1e6 * compiled_seconds / count:>12.2f} "
+          f"{legacy_seconds / compiled_seconds if compiled_seconds else 0:>7.1f}x {differ:>7}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Measure local wake word spotting on recorded or generated fixtures
+
+Expects a fixture folder with positive/ (phrases containing the wake word)
+and negative/ (ambient speech and noise without it) sub-folders of WAV files:
+
+    python benchmarks/wake_word_benchmark.py fixtures/wake_word --templates wake_words
+
+Without a fixture folder, a reproducible synthetic set is generated: a
+vowel-sequence "wake word" with enrollment templates, phrases containing it
+at other pitches and speeds over background noise, and other vowel
+sequences, hum and noise without it:
+
+    python benchmarks/wake_word_benchmark.py --seed 7
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.wake_spotter import WakeWordSpotter, read_wav, write_wav, SAMPLE_RATE
+
+# First two formants of the vowels the synthetic speech is made of
+VOWELS = {
+    "a": (730, 1090), "e": (530, 1840), "i": (270, 2290),
+    "o": (570, 840), "u": (300, 870), "ae": (660, 1720)
+}
+WAKE_WORD = ("a", "i", "u")
+OTHER_WORDS = [("o", "e", "a"), ("u", "a", "e"), ("e", "o"), ("ae", "u", "o"), ("i", "ae", "a", "o")]
+
+def synthesize(vowels, rng, pitch=120.0, tempo=1.0):
+    """A vowel sequence as int16 samples: harmonics shaped by gliding formants and a syllable envelope"""
+    syllable = int(0.18 * SAMPLE_RATE / tempo)
+    formants = np.repeat(np.array([VOWELS[vowel] for vowel in vowels], dtype=np.float64), syllable, axis=0)
+    # Smooth the jumps between vowels into glides
+    kernel = np.hanning(syllable // 2)
+    kernel /= kernel.sum()
+    padded = np.pad(formants, ((len(kernel), len(kernel)), (0, 0)), mode="edge")
+    formants = np.stack([np.convolve(padded[:, k], kernel, mode="same")[len(kernel):-len(kernel)]
+                         for k in range(2)], axis=1)
+
+    t = np.arange(len(formants)) / SAMPLE_RATE
+    f0 = pitch * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(2, 4) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    signal = np.zeros(len(t))
+    for k in range(1, int(4000 / pitch)):
+        harmonic = k * f0
+        gain = sum(1 / (1 + ((harmonic - formants[:, j]) / 90) ** 2) for j in range(2))
+        signal += gain / np.sqrt(k) * np.sin(k * phase)
+    envelope = np.tile(np.sin(np.pi * np.arange(syllable) / syllable) ** 0.5, len(vowels))
+    signal *= envelope / (np.abs(signal).max() + 1e-9)
+    return signal * 8000
+
+def background(length, rng, level):
+    """Mains hum and hiss at a given amplitude"""
+    t = np.arange(length) / SAMPLE_RATE
+    hum = sum(np.sin(2 * np.pi * 50 * k * t + rng.uniform(0, 2 * np.pi)) / k for k in (1, 2, 3))
+    return level * (0.5 * hum + rng.normal(0, 0.5, length))
+
+def phrase(parts, rng, level):
+    """Words separated by short pauses over background noise, as 16-bit PCM"""
+    gap = np.zeros(int(rng.uniform(0.1, 0.25) * SAMPLE_RATE))
+    lead = np.zeros(int(rng.uniform(0.2, 0.5) * SAMPLE_RATE))
+    speech = np.concatenate([lead] + [np.concatenate([part, gap]) for part in parts] + [lead])
+    samples = speech + background(len(speech), rng, level)
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+def generate_fixtures(folder, seed, templates=5, count=20):
+    """Write synthetic templates/, positive/ and negative/ WAV fixtures and return the template folder"""
+    rng = np.random.default_rng(seed)
+    template_dir = os.path.join(folder, "templates", "wake")
+    positive_dir = os.path.join(folder, "positive")
+    negative_dir = os.path.join(folder, "negative")
+    for directory in (template_dir, positive_dir, negative_dir):
+        os.makedirs(directory, exist_ok=True)
+
+    def voice():
+        return dict(pitch=rng.uniform(110, 150), tempo=rng.uniform(0.9, 1.1))
+
+    for index in range(templates):
+        pcm = phrase([synthesize(WAKE_WORD, rng, **voice())], rng, level=rng.uniform(20, 300))
+        write_wav(os.path.join(template_dir, f"{index}.wav"), pcm)
+    for index in range(count):
+        words = [synthesize(WAKE_WORD, rng, **voice())]
+        if index % 2:
+            words.append(synthesize(OTHER_WORDS[rng.integers(len(OTHER_WORDS))], rng, **voice()))
+        write_wav(os.path.join(positive_dir, f"{index}.wav"), phrase(words, rng, level=rng.uniform(20, 300)))
+    for index in range(count):
+        if index % 4 == 3:
+            # Hum and hiss only
+            pcm = phrase([np.zeros(int(SAMPLE_RATE * rng.uniform(0.5, 1.5)))], rng, level=rng.uniform(100, 800))
+        else:
+            words = [synthesize(OTHER_WORDS[rng.integers(len(OTHER_WORDS))], rng, **voice())
+                     for _ in range(1 + index % 2)]
+            pcm = phrase(words, rng, level=rng.uniform(20, 300))
+        write_wav(os.path.join(negative_dir, f"{index}.wav"), pcm)
+    return os.path.join(folder, "templates")
+
+def load_fixtures(folder):
+    """Read every WAV file in a folder as 16 kHz PCM"""
+    fixtures = []
+    if os.path.isdir(folder):
+        for filename in sorted(os.listdir(folder)):
+            if filename.lower().endswith(".wav"):
+                fixtures.append((filename, read_wav(os.path.join(folder, filename))))
+    return fixtures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", nargs="?",
+                        help="folder with positive/ and negative/ WAV recordings, generated if omitted")
+    parser.add_argument("--templates", default="wake_words", help="enrolled wake word recordings")
+    parser.add_argument("--threshold", type=float, default=None, help="fixed acceptance distance")
+    parser.add_argument("--margin", type=float, default=1.25, help="margin on the calibrated threshold")
+    parser.add_argument("--seed", type=int, default=7, help="seed for generated fixtures")
+    parser.add_argument("--count", type=int, default=20, help="generated fixtures of each kind")
+    args = parser.parse_args()
+
+    generated = None
+    if args.fixtures is None:
+        generated = tempfile.mkdtemp(prefix="wake_word_fixtures_")
+        args.templates = generate_fixtures(generated, args.seed, count=args.count)
+        args.fixtures = generated
+        print(f"Generated synthetic fixtures in {generated} (seed {args.seed})")
+    try:
+        return run(args)
+    finally:
+        if generated:
+            shutil.rmtree(generated, ignore_errors=True)
+
+def run(args):
+    """Spot every fixture and print error rates, latency and CPU cost"""
+    spotter = WakeWordSpotter(args.templates, threshold=args.threshold, margin=args.margin)
+    if not spotter.ready:
+        print(f"Not enough enrolled recordings in {args.templates}")
+        return 1
+
+    positives = load_fixtures(os.path.join(args.fixtures, "positive"))
+    negatives = load_fixtures(os.path.join(args.fixtures, "negative"))
+    print(f"{len(spotter.templates)} templates, threshold {spotter.threshold:.3f}")
+    print(f"{len(positives)} positive and {len(negatives)} negative fixtures\n")
+
+    false_rejects = 0
+    false_accepts = 0
+    latencies = []
+    for expected, fixtures in ((True, positives), (False, negatives)):
+        for filename, pcm in fixtures:
+            started = time.perf_counter()
+            match = spotter.spot(pcm)
+            latencies.append(time.perf_counter() - started)
+
+            if expected and match is None:
+                false_rejects += 1
+            elif not expected and match is not None:
+                false_accepts += 1
+            result = f"{match[0]} at {match[2]:.2f}s, distance {match[1]:.3f}" if match else "rejected"
+            print(f"{'+' if expected else '-'} {filename}: {result}")
+
+    stats = spotter.get_stats()
+    print()
+    if positives:
+        print(f"False reject rate: {false_rejects}/{len(positives)} ({100 * false_rejects / len(positives):.1f}%)")
+    if negatives:
+        print(f"False accept rate: {false_accepts}/{len(negatives)} ({100 * false_accepts / len(negatives):.1f}%)")
+        hours = sum(len(pcm) for _, pcm in negatives) / 2 / SAMPLE_RATE / 3600
+        if hours:
+            print(f"False accepts per hour of negative audio: {false_accepts / hours:.1f}")
+    if latencies:
+        latencies.sort()
+        print(f"Latency per phrase: median {1000 * latencies[len(latencies) // 2]:.1f} ms, "
+              f"max {1000 * latencies[-1]:.1f} ms")
+    print(f"CPU time: {stats['cpu_seconds']:.3f} s for {stats['audio_seconds']:.1f} s of audio "
+          f"(real-time factor {stats['real_time_factor']:.4f})")
+    print(f"Cloud requests avoided: {stats['rejected']} of {stats['phrases']} phrases")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import os
+import sys
+import json
+from modules.speech import SpeechRecognitionManager
+
+def main():
+    """Record a few samples of the wake word for local wake word spotting"""
+    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    word = sys.argv[1] if len(sys.argv) > 1 else config["assistant_settings"]["name"][-1]
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    speech = SpeechRecognitionManager(config)
+    if speech.spotter is None:
+        print("Wake word spotting is disabled in config.json")
+        return
+
+    print(f"Say '{word}' after each prompt, with a short pause in between.")
+    recorded = 0
+    while recorded < samples:
+        input(f"\nPress Enter and say '{word}' ({recorded + 1}/{samples})...")
+        path = speech.enroll_wake_word(word)
+        if path:
+            recorded += 1
+            print(f"Saved {path}")
+
+    stats = speech.spotter.get_stats()
+    print(f"\n{stats['templates']} recordings of {', '.join(stats['words']) or 'no wake word'} in use, "
+          f"acceptance threshold {stats['threshold']}")
+    speech.stream.stop()
+
+if __name__ == "__main__":
+    main()
@@ -20,11 +20,15 @@ import threading
 import queue
 
 # Import custom modules
-from modules.audio import AudioManager
+from modules.audio import AudioManager, SpeechPriority, SpeechStream
 from modules.speech import SpeechRecognitionManager
 from modules.system import SystemController
 from modules.memory import MemoryManager
 from modules.spotify_controller import SpotifyController
+from modules.text_segmenter import SentenceBoundaryDetector
+from modules.barge_in import BargeInMonitor
+from modules.intent_matcher import (IntentMatcher, Intent, COMMAND_VARIATIONS,
+                                    SLEEP_PHRASES, GOODBYE_WORDS)
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -33,6 +37,49 @@ class Assistant:
     """
     Main Assistant class that integrates all components and manages the voice assistant's operation
     """
+    # Simple, clear greetings without special characters
+    ACTIVATION_GREETINGS = [
+        "How can I help?",
+        "Ready to assist you",
+        "What can I do for you?",
+        "Yes, I'm here",
+        "I'm listening",
+        "How may I assist?",
+        "At your service",
+        "Ready for your command",
+        # Additional natural responses
+        "What do you need?",
+        "I'm all ears",
+        "Tell me what you need",
+        "How can I be of help?"
+    ]
+    
+    DEACTIVATION_MESSAGES = [
+        "Going offline",
+        "As you wish",
+        "Until next time",
+        "Standing by"
+    ]
+    
+    CLEANUP_MESSAGES = [
+        "Shutting down now. Goodbye!",
+        "All systems shutting down. See you later!",
+        "Goodbye! Have a great day!",
+        "Powering down. Thanks for using me!",
+        "Shutting down systems. Farewell!"
+    ]
+    
+    # Music actions that map to a Spotify playback control
+    PLAYBACK_ACTIONS = {
+        "pause": "pause",
+        "resume": "play",
+        "next": "next",
+        "previous": "previous",
+        "shuffle": "shuffle",
+        "repeat": "repeat",
+        "like": "like"
+    }
+    
     def __init__(self):
         """Initialize the assistant and all its components"""
         # Create necessary directories
@@ -42,13 +89,29 @@ class Assistant:
         self.load_config()
         self.setup_ai()
         
-        self.audio = AudioManager(self.config)
-        self.speech = SpeechRecognitionManager(self.config)
-        
         # Initialize Spotify first
         spotify_path = self.config["applications"]["media"].get("spotify")
         self.spotify = SpotifyController(spotify_path) if spotify_path else None
         
+        # Command routing, compiled once from the phrase tables
+        self.intents = IntentMatcher(COMMAND_VARIATIONS, self.config.get("system_commands"),
+                                     media=self.spotify is not None)
+        
+        self.audio = AudioManager(self.config)
+        self.speech = SpeechRecognitionManager(self.config)
+        # Partial transcripts arrive while the user is still talking
+        self.speech.on_partial = self._on_partial
+        # Commands that are complete once heard end on a short pause and are handed
+        # over as soon as that pause is confirmed, without waiting for the final transcript
+        self.speech.set_command_vocabulary(*self._endpoint_vocabulary())
+        # Let speech recognition tell our own voice from the user's
+        if self.speech.echo:
+            self.audio.on_playback = self.speech.echo.on_playback
+        
+        # Lets the user interrupt long answers by talking over them
+        self.barge_in = BargeInMonitor(self.config, self.audio, self.speech)
+        self.barge_in.start()
+        
         # Initialize system controller only once
         self.system = SystemController(self.config)
         self.memory = MemoryManager(self.config)
@@ -63,11 +126,12 @@ class Assistant:
         # Start background threads
         self._start_idle_checker()
         self._start_command_processor()
+        self._prewarm_audio_cache()
 
     def _create_directories(self):
         """Create necessary directories for the assistant"""
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        #os.makedirs(os.path.join(base_dir, 'audio_cache'), exist_ok=True)
+        os.makedirs(os.path.join(base_dir, 'audio_cache'), exist_ok=True)
         os.makedirs(os.path.join(base_dir, 'audio_temp'), exist_ok=True)
 
     def load_config(self):
@@ -105,6 +169,54 @@ class Assistant:
         self.command_processor = threading.Thread(target=self._process_command_queue, daemon=True)
         self.command_processor.start()
 
+    def _prewarm_audio_cache(self):
+        """Pre-synthesize the fixed response phrases so they play without a network round trip"""
+        if not self.config.get("audio_settings", {}).get("prewarm", {}).get("enabled", True):
+            return
+        
+        phrases = [
+            self._welcome_message(),
+            *self.ACTIVATION_GREETINGS,
+            *self.DEACTIVATION_MESSAGES,
+            *self.CLEANUP_MESSAGES
+        ]
+        for responses in self.config.get("responses", {}).values():
+            phrases.extend(responses)
+        
+        self.audio.prewarm([self._clean_text_for_tts(phrase) for phrase in phrases])
+
+    def _on_partial(self, text):
+        """
+        Track a command while it is still being spoken
+        
+        Args:
+            text (str): Partial transcript so far
+        """
+        # The user is talking, don't let the session time out under them
+        self.last_activity = time.time()
+
+    def _endpoint_vocabulary(self):
+        """
+        Commands process_command handles without free text, for adaptive endpointing
+        
+        Returns:
+            tuple: (command phrases, leading words of commands that take free text)
+        """
+        commands = []
+        for key in ('mute_commands', 'unmute_commands', 'volume_commands', 'playback_controls'):
+            commands.extend(COMMAND_VARIATIONS[key])
+        commands.extend(SLEEP_PHRASES)
+        commands.extend(GOODBYE_WORDS + ["see you later"])
+        
+        # Websites can't be written to, so "open <site>" is complete; "open <app>" may go on
+        # with "and write ..." and keeps the normal pause
+        commands.extend(f"open {site}" for site in self.config.get("urls", {}))
+        for apps in self.config.get("applications", {}).values():
+            commands.extend(f"close {app}" for app in apps)
+        
+        open_ended = ["play", "music", "song", "track", "write", "search"]
+        return commands, open_ended
+
     def _check_idle(self):
         """Check for idle timeout"""
         while self.is_listening:
@@ -167,16 +279,44 @@ class Assistant:
         responses = self.config["responses"].get(response_type, [])
         return random.choice(responses) if responses else None
 
+    def feedback(self, event, voice_text=None, priority=SpeechPriority.HIGH, ttl=None):
+        """
+        Give feedback for an event as an earcon, a spoken phrase or not at all, per config
+        
+        Args:
+            event (str): "wake", "ack", "success" or "error"
+            voice_text (str, optional): Phrase to speak when the event is set to "voice"
+            priority (int): Speech priority of the voice phrase
+            ttl (float, optional): Seconds after which the voice phrase is dropped
+            
+        Returns:
+            str: Feedback mode that was used
+        """
+        events = self.config.get("audio_settings", {}).get("earcons", {}).get("events", {})
+        mode = events.get(event, "voice")
+        
+        if mode == "earcon" and self.audio.play_earcon(event):
+            return mode
+        if mode in ("earcon", "voice") and voice_text:
+            # Earcons fall back to the voice phrase when they can't be played
+            self.audio.speak(self._clean_text_for_tts(voice_text), priority=priority, ttl=ttl)
+            return "voice"
+        return "none"
+
     def get_ai_response(self, text):
-        """Get AI response for user input"""
+        """
+        Get AI response for user input, speaking it sentence by sentence as it is generated
+        
+        Returns:
+            str: Full cleaned response (or error message) that was spoken
+        """
+        spoken = None
         try:
             # Add user message to memory
             self.memory.add_to_history("user", text)
 
-            # Get acknowledgment
-            ack = self.get_response("acknowledgments")
-            if ack:
-                self.audio.speak(self._clean_text_for_tts(ack), priority=True)
+            # Acknowledge instantly while the answer is being generated
+            self.feedback("ack", self.get_response("acknowledgments"), ttl=3)
 
             # Get conversation history for context
             messages = [
@@ -193,155 +333,75 @@ class Assistant:
                 stream=True
             )
 
-            response = "".join(chunk.choices[0].delta.content or "" 
-                             for chunk in completion)
+            # Speak each sentence as soon as the model has finished it
+            spoken = SpeechStream()
+            self.audio.speak(spoken)
+            detector = SentenceBoundaryDetector()
+            chunks = []
+            for chunk in completion:
+                token = chunk.choices[0].delta.content or ""
+                chunks.append(token)
+                for sentence in detector.feed(token):
+                    spoken.put(self._clean_text_for_tts(sentence))
+            
+            remainder = detector.flush()
+            if remainder:
+                spoken.put(self._clean_text_for_tts(remainder))
+            spoken.close()
 
             # Add assistant response to memory
+            response = "".join(chunks)
             self.memory.add_to_history("assistant", response)
             return self._clean_text_for_tts(response)
 
         except Exception as e:
             print(f"AI error: {e}")
-            error_msg = self.get_response("errors")
-            return self._clean_text_for_tts(error_msg if error_msg else "I encountered an error.")
-
-    def _get_command_variations(self):
-        """Get command variations for better recognition"""
-        return {
-            'mute_commands': [
-                # AI speech muting
-                "shut up", "stop talking", "be quiet",
-                "silence please", "stop speaking", "mute voice",
-                "quiet now", "stop ai", "ai mute",
-                "stop assistant", "quiet please", "hush"
-            ],
-            'unmute_commands': [
-                # AI speech unmuting
-                "speak up", "continue talking", "unmute voice",
-                "start speaking", "unmute ai", "ai unmute",
-                "resume speaking", "voice on", "assistant speak",
-                "you can talk", "resume voice","mute"
-            ],
-            
-            'music_keywords': [
-                # Basic music commands
-                "play", "music", "song", "track",
-                
-                # Playlist commands
-                "play playlist", "start playlist",
-                "shuffle playlist", "play mix",
-                
-                # Artist commands
-                "play artist", "music by",
-                
-                # Album commands
-                "play album", "start album",
-                
-                # Genre commands
-                "play rock", "play jazz", "play pop",
-                "play classical", "play hip hop"
-            ],
-            
-            'volume_commands': [
-                # Volume up
-                "volume up", "louder", "increase volume",
-                "turn it up", "raise volume",
-                
-                # Volume down
-                "volume down", "quieter", "decrease volume",
-                "turn it down", "lower volume"
-            ],
-            
-            'playback_controls': [
-                # Play/Pause
-                "play", "pause", "resume", "stop",
-                
-                # Navigation
-                "next", "previous", "skip", "back",
-                "next song", "previous song",
-                
-                # Shuffle/Repeat
-                "shuffle", "repeat", "repeat one",
-                "shuffle on", "shuffle off",
-                
-                # Like/Save
-                "like song", "save song", "like this",
-                "add to favorites"
-            ]
-        }
-
+            if spoken:
+                spoken.close()
+            error_msg = self.get_response("errors") or "I encountered an error."
+            self.feedback("error", error_msg)
+            return self._clean_text_for_tts(error_msg)
 
     # 1. Update the music command handling section in the handle_music_command method:
 
-    def handle_music_command(self, command: str) -> Tuple[bool, str]:
-        """Enhanced music command handler"""
+    def handle_music_command(self, command: str, intent: Optional[Intent] = None) -> Tuple[bool, str]:
+        """
+        Run a music command on Spotify
+        
+        Args:
+            command (str): Command text
+            intent (Intent, optional): Already matched intent whose slots name the music action
+            
+        Returns:
+            Tuple[bool, str]: (success, message to speak)
+        """
         if not self.spotify:
             return False, "Spotify controller not initialized"
 
         try:
-            command = command.lower()
-            success, msg = False, "Unknown command"
-
-            # Launch Spotify
-            if "open spotify" in command:
-                success, msg = self.spotify.launch_spotify()
-                
-            # Handle play commands
-            elif "play" in command:
-                if command in ["play", "play music", "play song", "play something"]:
-                    success, msg = self.spotify.play_random_music()
-                else:
-                    # Extract search term after "play"
-                    search_term = command.replace("play", "").strip()
-                    
-                    # Determine category based on command
-                    if "playlist" in search_term:
-                        category = "playlists"
-                        search_term = search_term.replace("playlist", "").strip()
-                    elif "artist" in search_term:
-                        category = "artists"
-                        search_term = search_term.replace("artist", "").strip()
-                    elif "album" in search_term:
-                        category = "albums"
-                        search_term = search_term.replace("album", "").strip()
-                    else:
-                        category = "songs"
-                    
-                    success, msg = self.spotify.search_and_play(search_term, category)
-
-            # Handle playback controls
-            elif command in ["pause", "stop"]:
-                success, msg = self.spotify.control_playback("pause")
-            elif command in ["resume", "continue"]:
-                success, msg = self.spotify.control_playback("play")
-            elif command in ["next", "skip", "next song"]:
-                success, msg = self.spotify.control_playback("next")
-            elif command in ["previous", "back", "last song"]:
-                success, msg = self.spotify.control_playback("previous")
-            #elif command == "mute":
-              #  success, msg = self.spotify.toggle_mute()
-            elif "shuffle" in command:
-                success, msg = self.spotify.control_playback("shuffle")
-            elif "repeat" in command:
-                success, msg = self.spotify.control_playback("repeat")
-            elif "like" in command or "save" in command:
-                success, msg = self.spotify.control_playback("like")
-
-            # Handle volume
-            elif "volume up" in command or "louder" in command:
-                success, msg = self.spotify.adjust_volume("up", 2)
-            elif "volume down" in command or "quieter" in command:
-                success, msg = self.spotify.adjust_volume("down", 2)
-
-            # Window controls
-            elif "minimize" in command:
-                success, msg = self.spotify.minimize_window()
-            elif "restore" in command:
-                success, msg = self.spotify.restore_window()
-            elif "close" in command:
-                success, msg = self.spotify.close_spotify()
-
-            return success, msg
+            slots = intent.slots if intent and "action" in intent.slots else \
+                self.intents.music_slots(command.lower().strip())
+            action = slots["action"]
+
+            if action == "launch":
+                return self.spotify.launch_spotify()
+            if action == "play_random":
+                return self.spotify.play_random_music()
+            if action == "search":
+                return self.spotify.search_and_play(slots["search_term"], slots["category"])
+            if action in self.PLAYBACK_ACTIONS:
+                return self.spotify.control_playback(self.PLAYBACK_ACTIONS[action])
+            if action == "volume_up":
+                return self.spotify.adjust_volume("up", 2)
+            if action == "volume_down":
+                return self.spotify.adjust_volume("down", 2)
+            if action == "minimize":
+                return self.spotify.minimize_window()
+            if action == "restore":
+                return self.spotify.restore_window()
+            if action == "close":
+                return self.spotify.close_spotify()
+            return False, "Unknown command"
 
         except Exception as e:
             print(f"Error in music command handler: {e}")
@@ -354,158 +414,113 @@ class Assistant:
             return
 
         command = command.lower().strip()
-        variations = self._get_command_variations()
+        intent = self.intents.match(command)
         
         # Music commands - Handle these before AI
-        if command == "open spotify" or any(keyword in command for keyword in variations['music_keywords']):
+        if intent.name in ("music", "volume", "playback"):
             try:
                 if self.spotify:
-                    print(f"Processing music command: {command}")  # Debug output
-                    success, msg = self.handle_music_command(command)
+                    print(f"Processing {intent.name} command: {command}")  # Debug output
+                    success, msg = self.handle_music_command(command, intent)
                     
                     if success is not None and msg is not None:
                         msg = self._clean_text_for_tts(msg)
+                        self.feedback("success" if success else "error")
                         self.audio.speak(msg)
-                        if "play" in command or "pause" in command:
+                        if intent.slots["action"] in ("play_random", "search", "pause", "resume"):
                             time.sleep(1)  # Give time for playback to start/stop
                         self.audio.wait_until_done()
                     return
                 else:
-                    self.audio.speak("Spotify controller is not initialized")
+                    self.audio.speak("Spotify controller is not initialized", priority=SpeechPriority.HIGH)
                     return
             except Exception as e:
                 print(f"Error processing music command: {e}")
-                self.audio.speak("There was an error with the music command")
-                return
-
-        # Volume control
-        if any(cmd in command for cmd in variations['volume_commands']):
-            try:
-                if self.spotify:
-                    success, msg = self.handle_music_command(command)
-                    if success is not None and msg is not None:
-                        msg = self._clean_text_for_tts(msg)
-                        self.audio.speak(msg)
-                        self.audio.wait_until_done()
-                    return
-            except Exception as e:
-                print(f"Error adjusting volume: {e}")
-                return
-
-        # Playback control
-        if any(cmd in command for cmd in variations['playback_controls']):
-            try:
-                if self.spotify:
-                    success, msg = self.handle_music_command(command)
-                    if success is not None and msg is not None:
-                        msg = self._clean_text_for_tts(msg)
-                        self.audio.speak(msg)
-                        if "play" in command or "pause" in command:
-                            time.sleep(1)  # Give time for playback to start/stop
-                        self.audio.wait_until_done()
-                    return
-            except Exception as e:
-                print(f"Error controlling playback: {e}")
+                self.audio.speak("There was an error with the music command", priority=SpeechPriority.HIGH)
                 return
         
         # Handle sleep/deactivation commands
-        if any(phrase in command for phrase in [
-            "go to sleep", "sleep now", "sleep mode", 
-            "stop listening", "you can sleep"
-        ]):
+        if intent.name == "sleep":
             self.deactivate(reason="user_requested")
             return
 
         # Voice control commands get immediate priority
-        if any(cmd in command for cmd in variations['mute_commands']):
+        if intent.name == "mute":
             # Stop any ongoing AI speech
             self.audio.stop()
             self.audio.toggle_mute()
             print("AI voice muted")
             return
             
-        elif any(cmd in command for cmd in variations['unmute_commands']):
+        elif intent.name == "unmute":
             self.audio.unmute()
             print("AI voice unmuted")
             return
 
-        
-
         # Application control with variations
-        if any(cmd in command for cmd in ["open", "start", "launch", "run"]):
-            target = command
-            for cmd in ["open", "start", "launch", "run"]:
-                target = target.replace(cmd, "").strip()
-            
-            if "and write" in target:
-                parts = target.split("and write", 1)
-                app_name = parts[0].strip()
-                text_to_write = parts[1].strip()
-                success, msg = self.system.open_application(app_name, text_to_write)
+        if intent.name == "open":
+            target, text_to_write = intent.slots["target"], intent.slots["text"]
+            if text_to_write is not None:
+                success, msg = self.system.open_application(target, text_to_write)
             else:
                 success, msg = self.system.open_website(target)
                 if not success:
                     success, msg = self.system.open_application(target)
             
+            self.feedback("success" if success else "error")
             self.audio.speak(self._clean_text_for_tts(msg))
             self.audio.wait_until_done()
             return
 
         # Writing commands
-        if command.startswith("write"):
-            text = command.replace("write", "", 1).strip()
-            success, msg = self.system.write_to_current_app(text)
+        if intent.name == "write":
+            success, msg = self.system.write_to_current_app(intent.slots["text"])
+            self.feedback("success" if success else "error")
             self.audio.speak(self._clean_text_for_tts(msg))
             self.audio.wait_until_done()
             return
 
         # Close/Exit variations
-        if any(cmd in command for cmd in ["close", "exit", "quit", "terminate", "stop"]):
-            target = command
-            for cmd in ["close", "exit", "quit", "terminate", "stop"]:
-                target = target.replace(cmd, "").strip()
-            
-            if any(word in target for word in ["spotify", "music", "song", "player"]):
+        if intent.name == "close":
+            if intent.slots["music"]:
                 success, msg = self.system.handle_music_command("close")
             else:
-                success, msg = self.system.close_application(target)
+                success, msg = self.system.close_application(intent.slots["target"])
             
+            self.feedback("success" if success else "error")
             self.audio.speak(self._clean_text_for_tts(msg))
             self.audio.wait_until_done()
             return
 
         # Window control with variations
-        if any(cmd in command for cmd in ["minimize", "hide", "shrink"]):
-            target = command.replace("minimize", "").replace("hide", "").replace("shrink", "").strip()
-            success, msg = self.system.minimize_window(target)
+        if intent.name == "minimize":
+            success, msg = self.system.minimize_window(intent.slots["target"])
+            self.feedback("success" if success else "error")
             self.audio.speak(self._clean_text_for_tts(msg))
             self.audio.wait_until_done()
             return
 
-        if any(cmd in command for cmd in ["maximize", "expand", "full screen"]):
-            target = command.replace("maximize", "").replace("expand", "").replace("full screen", "").strip()
-            success, msg = self.system.maximize_window(target)
+        if intent.name == "maximize":
+            success, msg = self.system.maximize_window(intent.slots["target"])
+            self.feedback("success" if success else "error")
             self.audio.speak(self._clean_text_for_tts(msg))
             self.audio.wait_until_done()
             return
 
         # System commands with variations
-        if any(cmd in command for cmd in ["shutdown", "restart", "sleep", "hibernate", "power off", "reboot"]):
-            for cmd, msg in self.config["system_commands"].items():
-                if any(keyword in command for keyword in [cmd, f"{cmd} computer", f"{cmd} system"]):
-                    success, msg = self.system.execute_system_command(msg)
-                    self.audio.speak(f"Executing {cmd} command")
-                    self.audio.wait_until_done()
-                    return
+        if intent.name == "system":
+            success, msg = self.system.execute_system_command(intent.slots["action"])
+            self.audio.speak(f"Executing {intent.slots['command']} command")
+            self.audio.wait_until_done()
+            return
 
         # Exit assistant command variations
-        if any(word in command for word in ["goodbye", "bye", "see you", "later", "good night"]):
+        if intent.name == "goodbye":
             self.cleanup()
             return
 
-        # Default to AI conversation for unhandled commands
-        response = self.get_ai_response(command)
-        self.audio.speak(response)
+        # Default to AI conversation for unhandled commands (spoken while streaming)
+        self.get_ai_response(command)
         return
         self.audio.wait_until_done()
         
@@ -515,26 +530,9 @@ class Assistant:
         self.is_active = True
         self.last_activity = time.time()
         
-        # Simple, clear greetings without special characters
-        greetings = [
-            "How can I help?",
-            "Ready to assist you",
-            "What can I do for you?",
-            "Yes, I'm here",
-            "I'm listening",
-            "How may I assist?",
-            "At your service",
-            "Ready for your command",
-            # Additional natural responses
-            "What do you need?",
-            "I'm all ears",
-            "Tell me what you need",
-            "How can I be of help?"
-        ]
-        
-        greeting = random.choice(greetings)
-        self.audio.speak(self._clean_text_for_tts(greeting))
-        self.audio.wait_until_done()
+        greeting = random.choice(self.ACTIVATION_GREETINGS)
+        if self.feedback("wake", greeting) == "voice":
+            self.audio.wait_until_done()
         print("\nAssistant activated and ready for commands")
 
     def deactivate(self, reason="timeout"):
@@ -548,13 +546,7 @@ class Assistant:
         if self.is_active:
             # Only speak a message for user-requested deactivation
             if reason == "user_requested":
-                messages = [
-                    "Going offline",
-                    "As you wish",
-                    "Until next time",
-                    "Standing by"
-                ]
-                msg = random.choice(messages)
+                msg = random.choice(self.DEACTIVATION_MESSAGES)
                 self.audio.speak(self._clean_text_for_tts(msg))
                 self.audio.wait_until_done()
             
@@ -567,26 +559,23 @@ class Assistant:
         print("\nCleaning up...")
         self.is_listening = False
         
-        cleanup_messages = [
-            "Shutting down now. Goodbye!",
-            "All systems shutting down. See you later!",
-            "Goodbye! Have a great day!",
-            "Powering down. Thanks for using me!",
-            "Shutting down systems. Farewell!"
-        ]
-        
-        goodbye = random.choice(cleanup_messages)
+        goodbye = random.choice(self.CLEANUP_MESSAGES)
         self.audio.speak(self._clean_text_for_tts(goodbye))
         self.audio.wait_until_done()
         time.sleep(1)
-        self.audio.stop()
+        self.audio.shutdown()
+        self.barge_in.stop()
+        self.speech.stream.stop()
         sys.exit(0)
 
+    def _welcome_message(self):
+        """Get the startup announcement"""
+        return f"System ready. Wake word is {self.config['assistant_settings']['name']}"
+
     def run(self):
         """Main run loop with minimal interruptions"""
         print(f"\nStarting {self.config['assistant_settings']['name']}...")
-        welcome_msg = f"System ready. Wake word is {self.config['assistant_settings']['name']}"
-        self.audio.speak(self._clean_text_for_tts(welcome_msg))
+        self.audio.speak(self._clean_text_for_tts(self._welcome_message()))
         self.audio.wait_until_done()
         
         consecutive_failures = 0
@@ -3,7 +3,7 @@ Voice Assistant Modules Package
 Includes all core components for the voice assistant
 """
 
-from .audio import AudioManager
+from .audio import AudioManager, SpeechPriority, SpeechStream
 from .speech import SpeechRecognitionManager
 from .system import SystemController
 from .memory import MemoryManager
@@ -14,6 +14,8 @@ __author__ = "Your Name"
 
 __all__ = [
     'AudioManager',
+    'SpeechPriority',
+    'SpeechStream',
     'SpeechRecognitionManager',
     'SystemController',
     'MemoryManager',
@@ -0,0 +1,669 @@
+import os
+import json
+import time
+import wave
+import bisect
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Optional
+import speech_recognition as sr
+
+class ASRStream:
+    """
+    Incremental recognition of a single phrase, fed while it is still being captured
+    """
+    def feed(self, pcm: bytes) -> Optional[str]:
+        """
+        Add the next chunk of audio
+
+        Args:
+            pcm (bytes): 16-bit mono PCM at the stream's sample rate
+
+        Returns:
+            Optional[str]: Current partial hypothesis if it changed, None otherwise
+        """
+        raise NotImplementedError
+
+    def finish(self) -> str:
+        """
+        End the phrase and get the final transcript
+
+        Returns:
+            str: Recognized text
+
+        Raises:
+            sr.UnknownValueError: If no speech could be recognized
+        """
+        raise NotImplementedError
+
+    def finish_alternatives(self) -> List[str]:
+        """
+        End the phrase and get the recognizer's best transcripts
+
+        Returns:
+            List[str]: Alternatives, best first; only finish()'s transcript by default
+
+        Raises:
+            sr.UnknownValueError: If no speech could be recognized
+        """
+        return [self.finish()]
+
+
+class ASRBackend:
+    """
+    Base class for speech-to-text engines used by SpeechRecognitionManager
+    """
+    name = "base"
+    # Whether start_stream() is supported
+    streaming = False
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """
+        Transcribe a captured phrase
+
+        Args:
+            audio (sr.AudioData): Captured phrase
+
+        Returns:
+            str: Recognized text
+
+        Raises:
+            sr.UnknownValueError: If no speech could be recognized
+            sr.RequestError: If the engine couldn't be reached
+        """
+        raise NotImplementedError
+
+    def recognize_alternatives(self, audio: sr.AudioData) -> List[str]:
+        """
+        Transcribe a captured phrase, keeping the engine's other guesses
+
+        Args:
+            audio (sr.AudioData): Captured phrase
+
+        Returns:
+            List[str]: Hypotheses, most likely first; just the one for engines without N-best
+
+        Raises:
+            sr.UnknownValueError: If no speech could be recognized
+            sr.RequestError: If the engine couldn't be reached
+        """
+        return [self.recognize(audio)]
+
+    def start_stream(self, sample_rate: int) -> ASRStream:
+        """
+        Start incremental recognition of a phrase
+
+        Args:
+            sample_rate (int): Sample rate of the audio that will be fed
+
+        Returns:
+            ASRStream: Stream to feed the phrase into
+        """
+        raise NotImplementedError
+
+
+class GoogleASRBackend(ASRBackend):
+    """
+    Google Web Speech API, needs network access
+    """
+    name = "google"
+
+    def __init__(self, recognizer, language="en-IN"):
+        """
+        Initialize the GoogleASRBackend
+
+        Args:
+            recognizer (sr.Recognizer): Recognizer used to make the request
+            language (str): Recognition language
+        """
+        self.recognizer = recognizer
+        self.language = language
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe a phrase through the Google Web Speech API"""
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+    def recognize_alternatives(self, audio: sr.AudioData) -> List[str]:
+        """Transcribe a phrase through the Google Web Speech API, with all its alternatives"""
+        result = self.recognizer.recognize_google(audio, language=self.language, show_all=True)
+        # An empty list instead of a dict when nothing was recognized
+        alternatives = result.get("alternative", []) if isinstance(result, dict) else []
+        transcripts = [alternative["transcript"] for alternative in alternatives if alternative.get("transcript")]
+        if not transcripts:
+            raise sr.UnknownValueError()
+        return transcripts
+
+
+class VoskASRStream(ASRStream):
+    """
+    Incremental recognition with a Vosk recognizer
+    """
+    def __init__(self, recognizer, n_best=1):
+        """
+        Initialize the VoskASRStream
+
+        Args:
+            recognizer (KaldiRecognizer): Fresh recognizer for this phrase
+            n_best (int): Alternatives returned by finish_alternatives()
+        """
+        self.recognizer = recognizer
+        if n_best > 1:
+            self.recognizer.SetMaxAlternatives(n_best)
+        # Vosk finalizes segments on its own at internal pauses
+        self.segments = []
+        self.partial = ""
+
+    def _text(self, partial=""):
+        """Join the finalized segments and the current partial"""
+        return " ".join(part for part in self.segments + [partial] if part)
+
+    @staticmethod
+    def _transcripts(result: str) -> List[str]:
+        """Transcripts of a Result()/FinalResult(), which lists alternatives once they are enabled"""
+        result = json.loads(result)
+        if "alternatives" in result:
+            return [alternative.get("text", "").strip() for alternative in result["alternatives"]]
+        return [result.get("text", "").strip()]
+
+    def feed(self, pcm: bytes) -> Optional[str]:
+        """Decode the next chunk, returning the hypothesis when it changes"""
+        if self.recognizer.AcceptWaveform(pcm):
+            # Earlier segments keep their best transcript, only the last one is re-ranked
+            segment = self._transcripts(self.recognizer.Result())[0]
+            if segment:
+                self.segments.append(segment)
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+
+        text = self._text(partial)
+        if text == self.partial:
+            return None
+        self.partial = text
+        return text or None
+
+    def finish(self) -> str:
+        """Flush the decoder and return the full transcript"""
+        return self.finish_alternatives()[0]
+
+    def finish_alternatives(self) -> List[str]:
+        """Flush the decoder and return the full transcript for each alternative of the last segment"""
+        transcripts = list(dict.fromkeys(
+            text for text in (self._text(final) for final in self._transcripts(self.recognizer.FinalResult())) if text
+        ))
+        if not transcripts:
+            raise sr.UnknownValueError()
+        return transcripts
+
+
+class VoskASRBackend(ASRBackend):
+    """
+    Offline recognition with a Vosk (Kaldi) model on the CPU
+    """
+    name = "vosk"
+    streaming = True
+    sample_rate = 16000
+
+    def __init__(self, model_path, n_best=5):
+        """
+        Initialize the VoskASRBackend
+
+        Args:
+            model_path (str): Folder of an unpacked Vosk model; it decides the language
+            n_best (int): Alternatives returned by recognize_alternatives()
+        """
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Vosk model not found: {model_path}")
+        SetLogLevel(-1)
+        self.recognizer_class = KaldiRecognizer
+        self.n_best = n_best
+        # Loading the model takes seconds, so it happens once
+        self.model = Model(model_path)
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe a phrase with the local model"""
+        recognizer = self.recognizer_class(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def recognize_alternatives(self, audio: sr.AudioData) -> List[str]:
+        """Transcribe a phrase with the local model, keeping the n-best list of the lattice"""
+        recognizer = self.recognizer_class(self.model, self.sample_rate)
+        recognizer.SetMaxAlternatives(self.n_best)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        alternatives = json.loads(recognizer.FinalResult()).get("alternatives", [])
+        transcripts = [alternative["text"].strip() for alternative in alternatives if alternative.get("text", "").strip()]
+        if not transcripts:
+            raise sr.UnknownValueError()
+        return transcripts
+
+    def start_stream(self, sample_rate: int) -> ASRStream:
+        """Start incremental recognition; Vosk resamples from the capture rate itself"""
+        return VoskASRStream(self.recognizer_class(self.model, sample_rate), n_best=self.n_best)
+
+
+class FixtureASRStream(ASRStream):
+    """
+    Reveals a fixture transcript one word per chunk fed
+    """
+    def __init__(self, backend):
+        """
+        Initialize the FixtureASRStream
+
+        Args:
+            backend (FixtureASRBackend): Backend providing the transcript
+        """
+        self.backend = backend
+        self.frames = []
+        self.words = None
+        self.revealed = 0
+
+    def feed(self, pcm: bytes) -> Optional[str]:
+        """Store the chunk and reveal the next word of the scripted transcript"""
+        self.frames.append(bytes(pcm))
+        if self.words is None:
+            self.words = (self.backend.next_scripted() or "").split()
+        if self.revealed >= len(self.words):
+            return None
+        self.revealed += 1
+        return " ".join(self.words[:self.revealed])
+
+    def finish(self) -> str:
+        """Return the transcript of a known recording, else the scripted one"""
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        text = self.backend.known.get(self.backend._fingerprint(b"".join(self.frames)))
+        if text is None and self.words:
+            text = " ".join(self.words)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class FixtureASRBackend(ASRBackend):
+    """
+    Deterministic transcripts without any engine, for tests and benchmarks on offline machines
+
+    Audio matching a recording listed in the fixture folder's transcripts.json
+    gets that recording's transcript; anything else gets the next scripted
+    transcript, if there are any left.
+    """
+    name = "fixture"
+    streaming = True
+
+    def __init__(self, fixture_dir=None, transcripts=None, latency=0.0):
+        """
+        Initialize the FixtureASRBackend
+
+        Args:
+            fixture_dir (str, optional): Folder with WAV recordings and a transcripts.json
+                mapping file names to their text
+            transcripts (List[str], optional): Transcripts returned in order for unknown audio
+            latency (float): Artificial recognition delay in seconds
+        """
+        self.latency = latency
+        self.script = list(transcripts or [])
+        self.lock = threading.Lock()
+        self.known = {}
+
+        if fixture_dir:
+            with open(os.path.join(fixture_dir, "transcripts.json"), "r", encoding="utf-8") as f:
+                for filename, text in json.load(f).items():
+                    with wave.open(os.path.join(fixture_dir, filename), "rb") as recording:
+                        frames = recording.readframes(recording.getnframes())
+                    self.known[self._fingerprint(frames)] = text
+
+    @staticmethod
+    def _fingerprint(frames: bytes) -> str:
+        """Identify a recording by its raw frames"""
+        return hashlib.sha1(frames).hexdigest()
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Return the transcript for a known recording or the next scripted one"""
+        if self.latency:
+            time.sleep(self.latency)
+        text = self.known.get(self._fingerprint(audio.get_raw_data()))
+        if text is None:
+            text = self.next_scripted()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def next_scripted(self) -> Optional[str]:
+        """Take the next scripted transcript, None once they are used up"""
+        with self.lock:
+            return self.script.pop(0) if self.script else None
+
+    def start_stream(self, sample_rate: int) -> ASRStream:
+        """Start revealing a transcript word by word"""
+        return FixtureASRStream(self)
+
+
+class LatencyHistogram:
+    """
+    Latency distribution in logarithmic buckets, cheap enough to update on every request
+    """
+    def __init__(self, smallest=0.05, largest=30.0, growth=1.25):
+        """
+        Initialize the LatencyHistogram
+
+        Args:
+            smallest (float): Upper bound of the first bucket in seconds
+            largest (float): Latencies above this all land in the last bucket
+            growth (float): Ratio between consecutive bucket bounds
+        """
+        self.bounds = [smallest]
+        while self.bounds[-1] < largest:
+            self.bounds.append(self.bounds[-1] * growth)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+
+    def add(self, latency: float):
+        """Count one latency sample"""
+        self.counts[bisect.bisect_left(self.bounds, latency)] += 1
+        self.total += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Estimate a latency percentile
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Upper bound of the bucket holding the percentile, None without samples
+        """
+        if not self.total:
+            return None
+        wanted = self.total * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def buckets(self) -> dict:
+        """Non-empty buckets keyed by their upper bound in milliseconds"""
+        labels = [f"<={bound * 1000:.0f}ms" for bound in self.bounds] + [f">{self.bounds[-1] * 1000:.0f}ms"]
+        return {label: count for label, count in zip(labels, self.counts) if count}
+
+
+class ASRMetrics:
+    """
+    Per-backend recognition latency and outcome counters
+    """
+    def __init__(self):
+        """Initialize the ASRMetrics"""
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.histograms = {}
+
+    def _backend_stats(self, backend: str) -> dict:
+        """Counters of a backend, created on first use; the lock must be held"""
+        if backend not in self.stats:
+            self.stats[backend] = {
+                "requests": 0,
+                "recognized": 0,
+                "unrecognized": 0,
+                "failed": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
+                "total_latency": 0.0,
+                "last_latency": None,
+                "max_latency": 0.0
+            }
+        return self.stats[backend]
+
+    def record(self, backend: str, latency: float, outcome: str):
+        """
+        Account for one recognition request
+
+        Args:
+            backend (str): Backend name
+            latency (float): Seconds the request took
+            outcome (str): "recognized", "unrecognized" or "failed"
+        """
+        with self.lock:
+            stats = self._backend_stats(backend)
+            stats["requests"] += 1
+            stats[outcome] += 1
+            stats["total_latency"] += latency
+            stats["last_latency"] = latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+            # Quick failures (e.g. no network) would make the backend look fast
+            if outcome != "failed":
+                self.histograms.setdefault(backend, LatencyHistogram()).add(latency)
+
+    def count(self, backend: str, event: str):
+        """
+        Count an event that isn't a request, such as a hedge being sent
+
+        Args:
+            backend (str): Backend name
+            event (str): "hedges" or "hedge_wins"
+        """
+        with self.lock:
+            self._backend_stats(backend)[event] += 1
+
+    def percentile(self, backend: str, percent: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a latency percentile of a backend
+
+        Args:
+            backend (str): Backend name
+            percent (float): Percentile between 0 and 100
+            min_samples (int): Samples needed before an estimate is returned
+
+        Returns:
+            Optional[float]: Latency in seconds, None without enough samples
+        """
+        with self.lock:
+            histogram = self.histograms.get(backend)
+            if histogram is None or histogram.total < min_samples:
+                return None
+            return histogram.percentile(percent)
+
+    def get_stats(self) -> dict:
+        """
+        Get per-backend statistics
+
+        Returns:
+            dict: Request counts by outcome, average, last, maximum, p50 and p95 latency
+            and the latency histogram per backend
+        """
+        with self.lock:
+            result = {}
+            for name, stats in self.stats.items():
+                result[name] = {k: v for k, v in stats.items() if k != "total_latency"}
+                if stats.get("requests"):
+                    result[name]["avg_latency"] = stats["total_latency"] / stats["requests"]
+                histogram = self.histograms.get(name)
+                if histogram:
+                    result[name]["p50_latency"] = histogram.percentile(50)
+                    result[name]["p95_latency"] = histogram.percentile(95)
+                    result[name]["histogram"] = histogram.buckets()
+            return result
+
+
+class HedgedASRBackend(ASRBackend):
+    """
+    Sends a phrase to a secondary backend when the primary is slower than usual
+
+    The hedge delay follows the primary's latency percentile, so requests are
+    only duplicated in the tail. Whichever backend recognizes the phrase first
+    wins; the others are cancelled if they haven't started, or their late
+    results are ignored.
+    """
+    name = "hedged"
+
+    def __init__(self, primary: ASRBackend, secondaries: List[ASRBackend], metrics: ASRMetrics,
+                 percentile=95, initial_delay=1.5, min_delay=0.3, max_delay=3.0, min_samples=20):
+        """
+        Initialize the HedgedASRBackend
+
+        Args:
+            primary (ASRBackend): Backend asked first
+            secondaries (List[ASRBackend]): Backends asked when the primary is late or fails
+            metrics (ASRMetrics): Latency metrics, also updated per backend here
+            percentile (float): Primary latency percentile used as hedge delay
+            initial_delay (float): Hedge delay until the primary has enough samples
+            min_delay (float): Lower bound of the hedge delay in seconds
+            max_delay (float): Upper bound of the hedge delay in seconds
+            min_samples (int): Primary samples needed before the delay adapts
+        """
+        self.primary = primary
+        self.secondaries = secondaries
+        self.metrics = metrics
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.streaming = primary.streaming
+        # Late losers keep their worker busy until they return
+        self.executor = ThreadPoolExecutor(max_workers=2 * (1 + len(secondaries)))
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary before asking a secondary"""
+        delay = self.metrics.percentile(self.primary.name, self.percentile, self.min_samples)
+        if delay is None:
+            delay = self.initial_delay
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def _call(self, backend: ASRBackend, audio: sr.AudioData) -> List[str]:
+        """Run one backend, recording its latency"""
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            alternatives = backend.recognize_alternatives(audio)
+            outcome = "recognized"
+            return alternatives
+        except sr.UnknownValueError:
+            outcome = "unrecognized"
+            raise
+        finally:
+            self.metrics.record(backend.name, time.perf_counter() - start, outcome)
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        """Transcribe with the primary, hedging to the secondaries when it is late or fails"""
+        return self.recognize_alternatives(audio)[0]
+
+    def recognize_alternatives(self, audio: sr.AudioData) -> List[str]:
+        """Get the hypotheses of whichever backend answers first, hedging like recognize()"""
+        pending = {self.executor.submit(self._call, self.primary, audio): self.primary}
+        waiting = list(self.secondaries)
+        unrecognized = False
+        last_error = None
+        deadline = time.monotonic() + self.hedge_delay()
+
+        while pending:
+            timeout = max(0.0, deadline - time.monotonic()) if waiting else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    alternatives = future.result()
+                except sr.UnknownValueError:
+                    unrecognized = True
+                    continue
+                except Exception as e:
+                    last_error = e
+                    continue
+                if backend is not self.primary:
+                    self.metrics.count(backend.name, "hedge_wins")
+                for loser in pending:
+                    loser.cancel()
+                return alternatives
+
+            # Primary is late or failed: send the same audio to the next backend. A phrase
+            # nobody recognized is an answer too, it isn't worth a second request.
+            if waiting and (not done or not (pending or unrecognized)):
+                backend = waiting.pop(0)
+                self.metrics.count(backend.name, "hedges")
+                pending[self.executor.submit(self._call, backend, audio)] = backend
+                deadline = time.monotonic() + self.hedge_delay()
+
+        if unrecognized:
+            raise sr.UnknownValueError()
+        raise sr.RequestError(f"All ASR backends failed: {last_error}")
+
+    def start_stream(self, sample_rate: int) -> ASRStream:
+        """Stream with the primary backend; streamed finals are not hedged"""
+        return self.primary.start_stream(sample_rate)
+
+
+def _create_backend(name, asr_settings, language, recognizer, base_dir) -> ASRBackend:
+    """Build one ASR backend by name"""
+    if name == "google":
+        return GoogleASRBackend(recognizer, language)
+    if name == "vosk":
+        return VoskASRBackend(
+            os.path.join(base_dir, asr_settings.get("vosk_model", "models/vosk")),
+            n_best=asr_settings.get("n_best", 5)
+        )
+    if name == "fixture":
+        fixture_dir = asr_settings.get("fixture_dir")
+        return FixtureASRBackend(
+            fixture_dir=os.path.join(base_dir, fixture_dir) if fixture_dir else None,
+            transcripts=asr_settings.get("fixture_transcripts"),
+            latency=asr_settings.get("fixture_latency", 0.0)
+        )
+    raise ValueError(f"Unknown ASR backend: {name}")
+
+def create_asr_backend(config, recognizer, metrics: Optional[ASRMetrics] = None) -> ASRBackend:
+    """
+    Build the configured ASR backend, falling back to Google if it can't be initialized
+
+    Args:
+        config (dict): Full configuration dictionary
+        recognizer (sr.Recognizer): Recognizer used by network backends
+        metrics (ASRMetrics, optional): Metrics used to adapt the hedge delay
+
+    Returns:
+        ASRBackend: Backend to transcribe with, hedged if configured
+    """
+    rec_settings = config["assistant_settings"]["recognition_settings"]
+    asr_settings = rec_settings.get("asr", {})
+    language = rec_settings.get("language", "en-IN")
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    name = asr_settings.get("backend", "google")
+    try:
+        primary = _create_backend(name, asr_settings, language, recognizer, base_dir)
+    except Exception as e:
+        print(f"Couldn't initialize ASR backend {name}: {e}")
+        primary = GoogleASRBackend(recognizer, language)
+
+    hedge_settings = asr_settings.get("hedge", {})
+    if not (metrics and hedge_settings.get("enabled", False)):
+        return primary
+
+    secondaries = []
+    for secondary_name in hedge_settings.get("backends", []):
+        if secondary_name == primary.name:
+            continue
+        try:
+            secondaries.append(_create_backend(secondary_name, asr_settings, language, recognizer, base_dir))
+        except Exception as e:
+            print(f"Couldn't initialize ASR backend {secondary_name}: {e}")
+    if not secondaries:
+        return primary
+
+    return HedgedASRBackend(
+        primary,
+        secondaries,
+        metrics,
+        percentile=hedge_settings.get("percentile", 95),
+        initial_delay=hedge_settings.get("initial_delay", 1.5),
+        min_delay=hedge_settings.get("min_delay", 0.3),
+        max_delay=hedge_settings.get("max_delay", 3.0),
+        min_samples=hedge_settings.get("min_samples", 20)
+    )
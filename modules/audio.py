@@ -1,10 +1,129 @@
 import os
 import pygame
 import threading
-from queue import Queue
+from queue import PriorityQueue, Queue, Empty
+import io
 import uuid
 import time
-from gtts import gTTS
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from .tts_cache import TTSCache
+from .clip_store import ClipStore
+from .tts_backends import TTSBackendSelector, create_tts_backends
+from .text_segmenter import TextSegmenter
+from .earcons import EarconPlayer
+from .janitor import AudioJanitor
+
+class SpeechPriority:
+    """
+    Scheduling levels for queued speech, lower values are spoken first
+    """
+    INTERRUPT = 0   # Stop current output and speak now
+    HIGH = 1        # Jump ahead of normal speech
+    NORMAL = 2
+    BACKGROUND = 3  # Dropped when anything else is queued or playing
+
+    NAMES = {
+        "interrupt": INTERRUPT,
+        "high": HIGH,
+        "normal": NORMAL,
+        "background": BACKGROUND
+    }
+
+    @classmethod
+    def resolve(cls, priority):
+        """
+        Normalize a priority given as level, name or legacy boolean flag
+        
+        Args:
+            priority (Union[int, str, bool]): Requested priority
+            
+        Returns:
+            int: One of the SpeechPriority levels
+        """
+        if isinstance(priority, bool):
+            return cls.HIGH if priority else cls.NORMAL
+        if isinstance(priority, str):
+            return cls.NAMES.get(priority.lower(), cls.NORMAL)
+        if priority in (cls.INTERRUPT, cls.HIGH, cls.NORMAL, cls.BACKGROUND):
+            return priority
+        return cls.NORMAL
+
+class SpeechStream:
+    """
+    Utterance whose sentences arrive over time, e.g. while an LLM answer is being generated
+    """
+    _END = object()
+
+    def __init__(self, sentences=None):
+        """
+        Initialize the SpeechStream
+        
+        Args:
+            sentences (list, optional): Sentences to queue up front; the stream is
+                closed right away when given
+        """
+        self.sentences = Queue()
+        # Item pulled while merging that didn't fit into the previous chunk
+        self.carry = None
+        self.sentence_count = 0
+        self.chunk_count = 0
+        if sentences is not None:
+            for sentence in sentences:
+                self.put(sentence)
+            self.close()
+
+    def put(self, sentence):
+        """Append a sentence to be spoken"""
+        if sentence and sentence.strip():
+            self.sentences.put(sentence.strip())
+
+    def close(self):
+        """Mark the stream as complete; must be called once the producer is done"""
+        self.sentences.put(self._END)
+
+    def _get(self, timeout):
+        """Take the next queued item, None if nothing arrived in time"""
+        if self.carry is not None:
+            item, self.carry = self.carry, None
+            return item
+        try:
+            if timeout == 0:
+                return self.sentences.get_nowait()
+            return self.sentences.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def next_sentence(self, timeout=None, max_chars=None):
+        """
+        Get the next sentence, merged with the ones already waiting behind it
+        
+        Args:
+            timeout (float, optional): Seconds to wait, 0 to not block at all
+            max_chars (int, optional): Merge sentences that are already available
+                into one chunk up to this length; None disables merging
+            
+        Returns:
+            Union[str, None, object]: The sentence, None if none arrived in time,
+            or SpeechStream._END once the stream is exhausted
+        """
+        chunk = self._get(timeout)
+        if chunk is None or chunk is self._END:
+            return chunk
+        
+        self.sentence_count += 1
+        self.chunk_count += 1
+        while max_chars:
+            following = self._get(0)
+            if following is None:
+                break
+            if following is self._END or len(chunk) + 1 + len(following) > max_chars:
+                self.carry = following
+                break
+            chunk = f"{chunk} {following}"
+            self.sentence_count += 1
+        return chunk
+
 
 class AudioManager:
     """
@@ -19,11 +138,27 @@ class AudioManager:
         """
         # Initialize pygame mixer with specific settings for better file handling
         pygame.mixer.init(frequency=16000, channels=1)
-        self.speech_queue = Queue()
+        # Channel 0 is reserved for decoded speech clips and channel 1 for earcons,
+        # the rest stay free for other overlays
+        pygame.mixer.set_reserved(2)
+        self.speech_channel = pygame.mixer.Channel(0)
+        # Entries are (priority, sequence, expires_at, text, future)
+        self.speech_queue = PriorityQueue()
+        self.speech_sequence = itertools.count()
+        # Utterances queued or playing; wait_until_done() blocks on this condition
+        self.pending_utterances = 0
+        self.speech_done = threading.Condition()
         self.is_speaking = False
+        # Signalled while an utterance is being played, and once it is over
+        self.playback_active = threading.Event()
+        self.playback_idle = threading.Event()
+        self.playback_idle.set()
+        # Called as on_playback(sentence, start, end) when a sentence starts (end None) and stops playing
+        self.on_playback = None
         self.is_muted = False
         self.should_stop = False
         self.volume = config["assistant_settings"]["voice_settings"]["volume"]
+        self.audio_settings = config.get("audio_settings", {})
         
         # Create audio directories in the project folder
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,145 +168,565 @@ class AudioManager:
         # Ensure directories exist with proper permissions
         self._setup_directories()
         
-        self.speech_thread = threading.Thread(target=self._process_speech_queue, daemon=True)
-        self.speech_thread.start()
+        # Persistent phrase cache so repeated phrases skip the network
+        cache_settings = self.audio_settings.get("cache", {})
+        self.cache = None
+        if cache_settings.get("enabled", True):
+            try:
+                self.cache = TTSCache(self.cache_dir, max_size_mb=cache_settings.get("max_size_mb", 50))
+            except Exception as e:
+                print(f"Error setting up audio cache: {e}")
+        
+        # Short clips are kept decoded to PCM at the mixer rate for zero-decode playback
+        clip_settings = self.audio_settings.get("clip_store", {})
+        self.clips = None
+        if clip_settings.get("enabled", True):
+            self.clips = ClipStore(
+                max_size_mb=clip_settings.get("max_size_mb", 32),
+                max_clip_seconds=clip_settings.get("max_clip_seconds", 8.0)
+            )
+        
+        # Sentences are merged into fewer, longer synthesis requests
+        segment_settings = self.audio_settings.get("segmentation", {})
+        self.segmenter = TextSegmenter(
+            max_chunk_chars=segment_settings.get("max_chunk_chars", 100),
+            first_chunk_chars=segment_settings.get("first_chunk_chars", 60)
+        )
+        self.synthesis_calls = 0
+        
+        # TTS engines in order of preference, with latency-aware failover
+        tts_settings = self.audio_settings.get("tts", {})
+        self.tts = TTSBackendSelector(
+            create_tts_backends(config, self.temp_dir),
+            slow_threshold=tts_settings.get("slow_threshold", 2.5),
+            cooldown=tts_settings.get("cooldown", 60)
+        )
+        
+        # Workers synthesize upcoming sentences while the current one plays
+        pipeline_settings = self.audio_settings.get("pipeline", {})
+        self.synthesis_workers = max(1, pipeline_settings.get("synthesis_workers", 3))
+        self.synthesis_lookahead = max(1, pipeline_settings.get("lookahead", 3))
+        # Synthesize into memory buffers instead of temp files
+        self.in_memory = pipeline_settings.get("in_memory", True)
+        self.synthesis_pool = ThreadPoolExecutor(
+            max_workers=self.synthesis_workers,
+            thread_name_prefix="tts-synth"
+        )
+        
+        # Bumped by stop() so in-flight utterances notice they were cancelled
+        self.playback_generation = 0
         
         # Keep track of current audio file
         self.current_audio_file = None
+        
+        # Short feedback tones that play instantly over speech
+        self.earcons = None
+        try:
+            self.earcons = EarconPlayer(config, channel_id=1)
+        except Exception as e:
+            print(f"Error setting up earcons: {e}")
+        
+        # Old and leaked temp files are removed in the background, never blocking startup
+        janitor_settings = self.audio_settings.get("janitor", {})
+        self.janitor = AudioJanitor(
+            self.temp_dir,
+            cache=self.cache,
+            max_temp_age=janitor_settings.get("max_temp_age", 300),
+            max_temp_mb=janitor_settings.get("max_temp_mb", 20),
+            max_cache_age_days=janitor_settings.get("max_cache_age_days", 30),
+            interval=janitor_settings.get("interval", 300)
+        )
+        self.janitor.start()
+        
+        # Background cache warming of known phrases
+        self.prewarm_thread = None
+        self.prewarm_stats = {"queued": 0, "synthesized": 0, "already_cached": 0, "failed": 0}
+        
+        self.speech_thread = threading.Thread(target=self._process_speech_queue, daemon=True)
+        self.speech_thread.start()
 
     def _setup_directories(self):
         """Setup audio directories with proper permissions"""
         try:
             # Create directories if they don't exist
-            #os.makedirs(self.cache_dir, exist_ok=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
             os.makedirs(self.temp_dir, exist_ok=True)
             
             print(f"Audio directories setup completed:")
-            #print(f"Cache dir: {self.cache_dir}")
+            print(f"Cache dir: {self.cache_dir}")
             print(f"Temp dir: {self.temp_dir}")
-            
-            # Clean any existing files
-            self._cleanup_old_files(initial=True)
         except Exception as e:
             print(f"Error setting up audio directories: {e}")
             raise
 
-    def _cleanup_old_files(self, initial=False):
+    def _get_temp_filepath(self, extension='.mp3'):
+        """Generate a unique temporary file path"""
+        return os.path.join(self.temp_dir, f'speech_{uuid.uuid4()}{extension}')
+
+    def _memory_clip(self, data, extension):
+        """Wrap encoded audio in a buffer the mixer can load, named after its format"""
+        buffer = io.BytesIO(data)
+        buffer.name = 'speech' + extension
+        return buffer
+
+    def _decode_clip(self, key, data):
+        """
+        Decode a short clip to PCM once and keep it in the clip store
+        
+        Args:
+            key (str): Clip key, the same as its audio cache key
+            data (bytes): Encoded audio
+            
+        Returns:
+            Optional[pygame.mixer.Sound]: Decoded clip, None if it is too long or can't be decoded
+        """
+        if not self.clips:
+            return None
+        try:
+            # Sound() decodes and resamples to the mixer format up front
+            sound = pygame.mixer.Sound(file=io.BytesIO(data))
+        except Exception as e:
+            print(f"Couldn't decode speech clip: {e}")
+            return None
+        return sound if self.clips.put(key, sound) else None
+
+    def _synthesize(self, sentence):
+        """
+        Get audio for a sentence, from the clip store or cache when possible
+        
+        Args:
+            sentence (str): Text to be converted to speech
+            
+        Returns:
+            Tuple[Union[pygame.mixer.Sound, str, io.BytesIO], bool]: Decoded clip, audio
+            file path or in-memory buffer, and whether it is a temporary file that must
+            be removed after playback
+        """
+        # A clip from any configured engine will do, preferred engines first
+        keys = [backend.cache_key(sentence) for backend in self.tts.ordered_backends()]
+        
+        if self.clips:
+            clip = self.clips.lookup(keys)
+            if clip:
+                return clip, False
+        
+        if self.cache:
+            cached_path = self.cache.lookup(keys)
+            if cached_path and not self.in_memory and not self.clips:
+                return cached_path, False
+            if cached_path:
+                try:
+                    with open(cached_path, 'rb') as f:
+                        data = f.read()
+                    key, extension = os.path.splitext(os.path.basename(cached_path))
+                    clip = self._decode_clip(key, data)
+                    if clip:
+                        return clip, False
+                    if not self.in_memory:
+                        return cached_path, False
+                    return self._memory_clip(data, extension), False
+                except OSError:
+                    pass
+        
+        data, backend = self.tts.synthesize(sentence)
+        self.synthesis_calls += 1
+        key = backend.cache_key(sentence)
+        
+        cached_path = None
+        if self.cache:
+            cached_path = self.cache.store_bytes(key, data, backend.extension)
+        
+        clip = self._decode_clip(key, data)
+        if clip:
+            return clip, False
+        if self.in_memory:
+            return self._memory_clip(data, backend.extension), False
+        if cached_path:
+            return cached_path, False
+        
+        filepath = self._get_temp_filepath(backend.extension)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        return filepath, True
+
+    def _split_sentences(self, text, count=True):
+        """
+        Split text into the chunks that are synthesized one by one
+        
+        Args:
+            text (str): Text to be spoken
+            count (bool): Whether to count the text in the segmentation statistics
+            
+        Returns:
+            list: Non-empty chunks of whole sentences in order
+        """
+        return self.segmenter.segment(text, count=count)
+
+    def get_segmentation_stats(self):
+        """
+        Get text segmentation statistics
+        
+        Returns:
+            dict: Segments a plain period split would have produced, sentences found,
+            chunks sent for synthesis and actual TTS calls made
+        """
+        return dict(self.segmenter.get_stats(), synthesis_calls=self.synthesis_calls)
+
+    def prewarm(self, phrases):
         """
-        Clean up old temporary files
+        Pre-synthesize phrases into the audio cache in a low-priority background thread
+        
+        The worker waits for live speech to finish before each synthesis, so
+        it never competes with what is being said.
         
         Args:
-            initial (bool): Whether this is the initial cleanup
+            phrases (list): Phrases exactly as they will later be passed to speak()
         """
-        def try_remove_file(filepath):
+        if not self.cache or not phrases:
+            return
+        if self.prewarm_thread and self.prewarm_thread.is_alive():
+            return
+        
+        # Chunked exactly as speak() will, but not counted as spoken text
+        sentences = list(dict.fromkeys(
+            sentence for phrase in phrases if phrase
+            for sentence in self._split_sentences(phrase, count=False)
+        ))
+        self.prewarm_stats["queued"] += len(sentences)
+        self.prewarm_thread = threading.Thread(
+            target=self._prewarm_worker,
+            args=(sentences,),
+            daemon=True
+        )
+        self.prewarm_thread.start()
+
+    def _prewarm_worker(self, sentences):
+        """Synthesize missing sentences into the cache, yielding to live speech"""
+        for sentence in sentences:
+            if self.should_stop:
+                break
             try:
-                if os.path.exists(filepath):
-                    # Skip current audio file if it's being played
-                    if filepath == self.current_audio_file and pygame.mixer.music.get_busy():
-                        return
-                    pygame.mixer.music.unload()
-                    time.sleep(0.1)  # Give a small delay for file handle to be released
-                    os.remove(filepath)
+                if any(self.cache.contains(backend.cache_key(sentence))
+                       for backend in self.tts.ordered_backends()):
+                    self.prewarm_stats["already_cached"] += 1
+                    continue
+                
+                # Yield to live speech
+                self.wait_until_done()
+                
+                data, backend = self.tts.synthesize(sentence)
+                self.cache.store_bytes(backend.cache_key(sentence), data, backend.extension)
+                self.prewarm_stats["synthesized"] += 1
             except Exception as e:
-                if not initial:  # Only print errors after initialization
-                    print(f"Couldn't remove file {filepath}: {e}")
+                self.prewarm_stats["failed"] += 1
+                print(f"Couldn't pre-warm phrase '{sentence}': {e}")
+        
+        print(f"Audio cache pre-warm finished: {self.prewarm_stats}")
 
-        for directory in [self.temp_dir, self.cache_dir]:
-            if os.path.exists(directory):
-                for filename in os.listdir(directory):
-                    filepath = os.path.join(directory, filename)
-                    try_remove_file(filepath)
+    def get_cache_stats(self):
+        """
+        Get audio cache statistics
+        
+        Returns:
+            dict: Cache hit/miss counters and usage, empty if caching is disabled
+        """
+        return self.cache.get_stats() if self.cache else {}
 
-    def _get_temp_filepath(self):
-        """Generate a unique temporary file path"""
-        return os.path.join(self.temp_dir, f'speech_{uuid.uuid4()}.mp3')
+    def get_clip_stats(self):
+        """
+        Get decoded clip store statistics
+        
+        Returns:
+            dict: Hit/miss counters and memory usage, empty if the store is disabled
+        """
+        return self.clips.get_stats() if self.clips else {}
+
+    def get_janitor_stats(self):
+        """
+        Get temp file cleanup statistics
+        
+        Returns:
+            dict: Deleted files, reclaimed bytes and retry counters
+        """
+        return self.janitor.get_stats()
+
+    def get_tts_stats(self):
+        """
+        Get per-backend TTS latency statistics
+        
+        Returns:
+            dict: Request and failure counts, latencies and demotion state per backend
+        """
+        return self.tts.get_stats()
 
     def _process_speech_queue(self):
         """Process queued speech items in a separate thread"""
         while not self.should_stop:
             try:
-                if not self.speech_queue.empty() and not self.should_stop and not self.is_muted:
-                    text, priority = self.speech_queue.get()
-                    if text:
-                        self._speak_text(text)
-                    self.speech_queue.task_done()
-                time.sleep(0.1)
+                # Blocks without polling until something is queued
+                priority, _, expires_at, text, future = self.speech_queue.get()
             except Exception as e:
                 print(f"Speech queue error: {e}")
-                time.sleep(0.1)
+                continue
+            
+            try:
+                if expires_at is not None and time.monotonic() > expires_at:
+                    # Stale status messages are dropped rather than spoken late
+                    print(f"Dropping expired speech: {text}")
+                    future.cancel()
+                elif future.set_running_or_notify_cancel():
+                    completed = False
+                    if text and not self.should_stop and not self.is_muted:
+                        completed = self._speak_text(text)
+                    future.set_result(completed)
+            except Exception as e:
+                print(f"Speech queue error: {e}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.speech_queue.task_done()
+                self._finish_utterance()
+
+    def _finish_utterance(self):
+        """Account for a finished utterance and wake waiters once nothing is left"""
+        with self.speech_done:
+            self.pending_utterances -= 1
+            if self.pending_utterances <= 0:
+                self.pending_utterances = 0
+                self.speech_done.notify_all()
+
+    def _drain_queue(self):
+        """Drop all queued utterances, cancelling their futures"""
+        while True:
+            try:
+                _, _, _, _, future = self.speech_queue.get_nowait()
+            except Empty:
+                break
+            future.cancel()
+            self.speech_queue.task_done()
+            self._finish_utterance()
+
+    def _is_cancelled(self, generation):
+        """Check whether the utterance started in the given playback generation was cancelled"""
+        return self.should_stop or self.is_muted or generation != self.playback_generation
+
+    def _discard_synthesis(self, future):
+        """Cancel a pending synthesis job, removing its temp file once it finishes"""
+        def remove_temp_file(done):
+            try:
+                filepath, is_temp = done.result()
+                if is_temp:
+                    self.janitor.delete(filepath)
+            except Exception:
+                pass
+        
+        if not future.cancel():
+            future.add_done_callback(remove_temp_file)
+
+    def _play_clip(self, sound, generation):
+        """
+        Play a decoded clip on the speech channel and block until it finishes or is cancelled
+        
+        Args:
+            sound (pygame.mixer.Sound): Decoded clip to play
+            generation (int): Playback generation the utterance belongs to
+        """
+        self.speech_channel.set_volume(self.volume)
+        self.speech_channel.play(sound)
+        
+        # Wait for audio to complete
+        while self.speech_channel.get_busy() and not self._is_cancelled(generation):
+            pygame.time.Clock().tick(10)
+        self.speech_channel.stop()
+
+    def _play_file(self, source, generation):
+        """
+        Play an audio file or in-memory buffer and block until it finishes or is cancelled
+        
+        Args:
+            source (Union[pygame.mixer.Sound, str, io.BytesIO]): Decoded clip, audio file
+                path or encoded audio buffer to play
+            generation (int): Playback generation the utterance belongs to
+        """
+        if isinstance(source, pygame.mixer.Sound):
+            self._play_clip(source, generation)
+            return
+        
+        in_memory = isinstance(source, io.BytesIO)
+        if in_memory:
+            pygame.mixer.music.load(source, os.path.splitext(source.name)[1].lstrip('.'))
+        else:
+            pygame.mixer.music.load(source)
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play()
+        
+        # Wait for audio to complete
+        while pygame.mixer.music.get_busy() and not self._is_cancelled(generation):
+            pygame.time.Clock().tick(10)
+        
+        pygame.mixer.music.unload()
+        if not in_memory:
+            # Give a small delay for the file handle to be released
+            time.sleep(0.1)
+
+    def _report_playback(self, sentence, start, end):
+        """Tell whoever is interested (echo suppression) what is audible and when"""
+        if self.on_playback:
+            try:
+                self.on_playback(sentence, start, end)
+            except Exception as e:
+                print(f"Error reporting playback: {e}")
 
     def _speak_text(self, text):
         """
         Convert text to speech and play it
         
+        Sentences are synthesized by a bounded worker pool a few steps ahead of
+        playback, while playback itself stays in the original sentence order.
+        
         Args:
-            text (str): Text to be converted to speech
+            text (Union[str, SpeechStream]): Text to be converted to speech, or a
+                stream of sentences that is still being produced
+            
+        Returns:
+            bool: True if the whole text was spoken, False if it was cut short
         """
         if self.should_stop or self.is_muted:
-            return
+            return False
             
         self.is_speaking = True
+        self.playback_idle.clear()
+        self.playback_active.set()
+        completed = False
+        generation = self.playback_generation
+        pending = []
         
         try:
-            # Split text into sentences
-            sentences = [s.strip() for s in text.split('.') if s.strip()]
+            if isinstance(text, SpeechStream):
+                stream = text
+                merge_limits = (self.segmenter.first_chunk_chars, self.segmenter.max_chunk_chars)
+            else:
+                # Split text into chunks of whole sentences, already merged
+                stream = SpeechStream(self._split_sentences(text))
+                merge_limits = (None, None)
+            exhausted = False
             
-            for sentence in sentences:
-                if self.should_stop or self.is_muted:
-                    break
+            def schedule_next(timeout):
+                nonlocal exhausted
+                # Keep the first chunk short so audio starts fast
+                max_chars = merge_limits[1] if stream.chunk_count else merge_limits[0]
+                sentence = stream.next_sentence(timeout, max_chars)
+                if sentence is SpeechStream._END:
+                    exhausted = True
+                elif sentence is not None:
+                    pending.append((sentence, self.synthesis_pool.submit(self._synthesize, sentence)))
+                    return True
+                return False
+            
+            while not self._is_cancelled(generation):
+                # Top up the lookahead with whatever sentences are already available
+                while not exhausted and len(pending) < self.synthesis_lookahead:
+                    if not schedule_next(0):
+                        break
                 
-                # Generate new temp file path
-                self.current_audio_file = self._get_temp_filepath()
+                if not pending:
+                    if exhausted:
+                        break
+                    # Nothing to play yet, wait for the producer
+                    schedule_next(0.1)
+                    continue
                 
-                # Create and save audio file
-                tts = gTTS(text=sentence, lang='en', tld='co.in')
-                tts.save(self.current_audio_file)
+                # Create audio file, or reuse a cached one
+                sentence, future = pending.pop(0)
+                self.current_audio_file, is_temp = future.result()
                 
                 # Play the audio
                 try:
-                    pygame.mixer.music.load(self.current_audio_file)
-                    pygame.mixer.music.set_volume(self.volume)
-                    pygame.mixer.music.play()
-                    
-                    # Wait for audio to complete
-                    while pygame.mixer.music.get_busy() and not self.should_stop and not self.is_muted:
-                        pygame.time.Clock().tick(10)
-                    
-                    # Unload the music and add a small delay
-                    pygame.mixer.music.unload()
-                    time.sleep(0.1)
-                    
+                    if not self._is_cancelled(generation):
+                        started = time.monotonic()
+                        self._report_playback(sentence, started, None)
+                        try:
+                            self._play_file(self.current_audio_file, generation)
+                        finally:
+                            self._report_playback(sentence, started, time.monotonic())
                 finally:
-                    # Try to remove the file after playing
-                    try:
-                        if os.path.exists(self.current_audio_file):
-                            os.remove(self.current_audio_file)
-                    except Exception:
-                        pass  # Ignore deletion errors during playback
+                    # Remove the file after playing, retried in the background if still locked
+                    if is_temp:
+                        self.janitor.delete(self.current_audio_file)
+            
+            if merge_limits[0]:
+                self.segmenter.count_merged(stream.sentence_count, stream.chunk_count)
+            completed = not self._is_cancelled(generation)
                 
         except Exception as e:
             print(f"Speech error: {e}")
         finally:
+            for _, future in pending:
+                self._discard_synthesis(future)
             self.is_speaking = False
+            self.playback_active.clear()
+            self.playback_idle.set()
             self.current_audio_file = None
-  
-
+        return completed
 
-    def speak(self, text, priority=False):
+    def speak(self, text, priority=False, ttl=None):
         """
         Add text to the speech queue
         
         Args:
-            text (str): Text to be spoken
-            priority (bool): Whether this speech has priority
+            text (Union[str, SpeechStream]): Text to be spoken, or a stream of
+                sentences that is spoken as they arrive
+            priority (Union[int, str, bool]): SpeechPriority level or name;
+                True and False map to HIGH and NORMAL
+            ttl (float, optional): Seconds after which the text is discarded
+                instead of being spoken late
+            
+        Returns:
+            Optional[Future]: Resolves to True once the text has been spoken in full,
+            False if it was cut short; None if nothing was queued
         """
-        if text and not self.should_stop and not self.is_muted:
-            self.speech_queue.put((text, priority))
+        if not text or self.should_stop or self.is_muted:
+            return None
+        
+        level = SpeechPriority.resolve(priority)
+        if level == SpeechPriority.BACKGROUND and (self.is_speaking or self.pending_utterances):
+            return None
+        if level == SpeechPriority.INTERRUPT:
+            self.stop()
+        
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        future = Future()
+        with self.speech_done:
+            self.pending_utterances += 1
+        self.speech_queue.put((level, next(self.speech_sequence), expires_at, text, future))
+        return future
 
-    def wait_until_done(self):
-        """Wait until all speech is complete"""
-        while self.is_speaking or not self.speech_queue.empty():
-            time.sleep(0.1)
+    def play_earcon(self, event):
+        """
+        Play a short feedback tone without going through the speech queue
+        
+        Args:
+            event (str): Event name such as "wake", "ack", "success" or "error"
+            
+        Returns:
+            bool: True if an earcon was played
+        """
+        if self.is_muted or not self.earcons:
+            return False
+        return self.earcons.play(event)
+
+    def wait_until_done(self, timeout=None):
+        """
+        Wait until all speech is complete
+        
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if all speech finished, False on timeout
+        """
+        with self.speech_done:
+            return self.speech_done.wait_for(lambda: self.pending_utterances == 0, timeout)
 
     def toggle_mute(self):
         """
@@ -183,7 +738,7 @@ class AudioManager:
         self.is_muted = not self.is_muted
         if self.is_muted:
             pygame.mixer.music.unload()
-            self.speech_queue.queue.clear()
+            self._drain_queue()
         return self.is_muted
 
     def unmute(self):
@@ -191,24 +746,16 @@ class AudioManager:
         self.is_muted = False
         self.speak("Voice output restored")
 
-    """def stop(self):
-        Stop all audio operations and cleanup
-        self.should_stop = True
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.unload()
-        self.speech_queue.queue.clear()
-        time.sleep(0.2)  # Give a small delay for cleanup
-        self._cleanup_old_files()
-        pygame.mixer.quit()
-        """
     # Ai mute app 
     def stop(self):
         """Stop all AI speech immediately"""
         try:
-            # Clear speech queue
-            self.speech_queue.queue.clear()
+            # Clear speech queue and cancel the utterance in progress
+            self._drain_queue()
+            self.playback_generation += 1
             
             # Stop current speech playback
+            self.speech_channel.stop()
             pygame.mixer.music.stop()
             pygame.mixer.music.unload()
             
@@ -219,6 +766,17 @@ class AudioManager:
         except Exception as e:
             print(f"Error stopping audio: {e}")
 
+    def shutdown(self):
+        """Stop speech for good and release the synthesis workers and the janitor"""
+        self.should_stop = True
+        self.stop()
+        self.janitor.stop()
+        try:
+            self.synthesis_pool.shutdown(wait=False, cancel_futures=True)
+        except TypeError:
+            # Python 3.8 has no cancel_futures, queued sentences still get synthesized
+            self.synthesis_pool.shutdown(wait=False)
+
     def toggle_mute(self):
         """Toggle AI speech mute state"""
         try:
@@ -0,0 +1,165 @@
+import threading
+from collections import deque
+
+class BargeInMonitor:
+    """
+    Listens to the microphone while the assistant is speaking and cuts playback
+    as soon as the user starts talking over it
+
+    The assistant's own voice comes back through the microphone as speech
+    too, so the energy gate sits above the level playback itself reaches:
+    the monitor follows the peaks of the microphone during playback and only
+    sustained speech clearly louder than that interrupts.
+    """
+    def __init__(self, config, audio, speech):
+        """
+        Initialize the BargeInMonitor
+
+        Args:
+            config (dict): Configuration dictionary
+            audio (AudioManager): Audio output to interrupt
+            speech (SpeechRecognitionManager): Receives the captured speech
+        """
+        settings = config.get("audio_settings", {}).get("barge_in", {})
+        rec_settings = config["assistant_settings"]["recognition_settings"]
+
+        self.enabled = settings.get("enabled", True)
+        self.audio = audio
+        self.speech = speech
+        # Speaker output leaks into the microphone, so require more energy than a normal listen
+        self.energy_multiplier = settings.get("energy_multiplier", 1.5)
+        # ... and more than playback itself reaches at the microphone
+        self.echo_margin = settings.get("echo_margin", 1.5)
+        # Playback heard before the echo level is known, during which nothing interrupts
+        self.warmup_duration = settings.get("warmup_duration", 0.5)
+        self.min_speech_duration = settings.get("min_speech_duration", 0.6)
+        self.preroll_duration = settings.get("preroll_duration", 0.5)
+        self.pause_threshold = rec_settings.get("pause_threshold", 1.0)
+        self.phrase_time_limit = rec_settings.get("phrase_time_limit", 15)
+        # A microphone that delivers nothing for this long is treated as gone
+        self.read_timeout = settings.get("read_timeout", 1.0)
+
+        # Peak energy of the assistant's voice at the microphone, kept across playbacks
+        self.echo_level = None
+
+        self.should_stop = False
+        self.barge_ins = 0
+        self.thread = None
+
+    def start(self):
+        """Start monitoring in a background thread"""
+        if not self.enabled or self.thread:
+            return
+        self.thread = threading.Thread(target=self._monitor, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop monitoring"""
+        self.should_stop = True
+
+    def _threshold(self):
+        """Energy a chunk needs to count as the user talking over playback"""
+        threshold = self.speech.recognizer.energy_threshold * self.energy_multiplier
+        if self.echo_level is not None:
+            threshold = max(threshold, self.echo_level * self.echo_margin)
+        return threshold
+
+    def _learn_echo(self, energy):
+        """Follow the peaks of playback picked up by the microphone: rise fast, decay slowly"""
+        if self.echo_level is None:
+            self.echo_level = energy
+        elif energy > self.echo_level:
+            self.echo_level += 0.3 * (energy - self.echo_level)
+        else:
+            self.echo_level += 0.02 * (energy - self.echo_level)
+
+    def _monitor(self):
+        """Wait for playback to start, then watch the microphone until it ends"""
+        stream = self.speech.stream
+        while not self.should_stop:
+            # Sleeps without polling while nothing is being said
+            self.audio.playback_active.wait()
+            if self.should_stop:
+                break
+            try:
+                stream.start()
+                self._watch_playback(stream, stream.reader())
+            except Exception as e:
+                print(f"Barge-in monitor error: {e}")
+                # Don't spin on a broken microphone while playback continues
+                self.audio.playback_idle.wait()
+
+    def _watch_playback(self, stream, reader):
+        """
+        Read the microphone during playback and interrupt on sustained speech
+
+        Args:
+            stream (MicrophoneStream): Shared microphone stream
+            reader (RingReader): Cursor over the stream's captured buffers
+        """
+        chunk_duration = stream.seconds_per_buffer
+        preroll = deque(maxlen=max(1, int(self.preroll_duration / chunk_duration)))
+        loud_duration = 0.0
+        warmup = 0.0 if self.echo_level is not None else self.warmup_duration
+
+        while self.audio.playback_active.is_set() and not self.should_stop:
+            frame = reader.next(timeout=0.5)
+            if frame is None:
+                continue
+            index, energy, speech = frame
+            preroll.append(index)
+
+            if warmup > 0:
+                warmup -= chunk_duration
+                if speech:
+                    self._learn_echo(energy)
+                continue
+
+            if speech and energy > self._threshold():
+                loud_duration += chunk_duration
+            else:
+                loud_duration = 0.0
+                if speech:
+                    self._learn_echo(energy)
+
+            if loud_duration >= self.min_speech_duration:
+                print("\nBarge-in detected, stopping speech")
+                self.barge_ins += 1
+                # A listen() already in progress records the phrase itself
+                if self.speech.capturing:
+                    self.audio.stop()
+                    return
+                # Stopping playback releases the command loop, whose next listen() must wait
+                # for this phrase instead of starting its own capture halfway through it
+                self.speech.barge_in_idle.clear()
+                try:
+                    self.audio.stop()
+                    self._capture_rest(stream, reader, preroll[0])
+                finally:
+                    self.speech.barge_in_idle.set()
+                return
+
+    def _capture_rest(self, stream, reader, start):
+        """
+        Keep recording until the user pauses, then hand the phrase to speech recognition
+
+        Args:
+            stream (MicrophoneStream): Shared microphone stream
+            reader (RingReader): Cursor positioned after the speech onset
+            start (int): Index of the first buffer of the phrase
+        """
+        chunk_duration = stream.seconds_per_buffer
+        silence = 0.0
+        elapsed = (reader.position - start) * chunk_duration
+
+        while silence < self.pause_threshold and elapsed < self.phrase_time_limit:
+            frame = reader.next(timeout=self.read_timeout)
+            if frame is None:
+                print("Microphone stopped delivering audio, dropping interrupted speech")
+                return
+            _, _, speech = frame
+            elapsed += chunk_duration
+            silence = 0.0 if speech else silence + chunk_duration
+
+        end = reader.position
+        self.speech.submit_audio(stream.audio(start, end), start, end)
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+
+class ClipStore:
+    """
+    Bounded in-memory store of decoded speech clips (pygame.mixer.Sound) for zero-decode playback
+    """
+    def __init__(self, max_size_mb=32, max_clip_seconds=8.0):
+        """
+        Initialize the ClipStore
+
+        Args:
+            max_size_mb (float): Memory budget for decoded PCM in megabytes
+            max_clip_seconds (float): Longer clips are not kept decoded
+        """
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.max_clip_seconds = max_clip_seconds
+        self.lock = threading.Lock()
+
+        # Least recently used clips first: key -> (sound, size in bytes)
+        self.clips = OrderedDict()
+        self.total_size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _clip_size(sound):
+        """Get the number of PCM bytes held by a decoded clip"""
+        try:
+            return len(sound.get_raw())
+        except Exception:
+            return 0
+
+    def accepts(self, sound):
+        """Check whether a decoded clip is short enough to be kept"""
+        return sound.get_length() <= self.max_clip_seconds
+
+    def get(self, key):
+        """
+        Look up a decoded clip and mark it as recently used
+
+        Args:
+            key (str): Clip key, the same as its audio cache key
+
+        Returns:
+            Optional[pygame.mixer.Sound]: Decoded clip, None on a miss
+        """
+        return self.lookup([key])
+
+    def lookup(self, keys):
+        """
+        Look up the first decoded clip among candidate keys, counting a single hit or miss
+
+        Args:
+            keys (list): Clip keys in order of preference
+
+        Returns:
+            Optional[pygame.mixer.Sound]: Decoded clip, None on a miss
+        """
+        with self.lock:
+            for key in keys:
+                entry = self.clips.get(key)
+                if entry is not None:
+                    self.clips.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, sound):
+        """
+        Keep a decoded clip, evicting the least recently used ones to fit the budget
+
+        Args:
+            key (str): Clip key, the same as its audio cache key
+            sound (pygame.mixer.Sound): Decoded clip
+
+        Returns:
+            bool: Whether the clip was stored
+        """
+        size = self._clip_size(sound)
+        if not self.accepts(sound) or size > self.max_size:
+            return False
+
+        with self.lock:
+            if key in self.clips:
+                self.total_size -= self.clips.pop(key)[1]
+            self.clips[key] = (sound, size)
+            self.total_size += size
+            while self.total_size > self.max_size and self.clips:
+                _, (_, evicted_size) = self.clips.popitem(last=False)
+                self.total_size -= evicted_size
+                self.evictions += 1
+        return True
+
+    def get_stats(self):
+        """
+        Get clip store statistics
+
+        Returns:
+            dict: Hit/miss counters and memory usage
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "clips": len(self.clips),
+                "size_bytes": self.total_size,
+                "max_size_bytes": self.max_size
+            }
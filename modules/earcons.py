@@ -0,0 +1,95 @@
+import os
+import math
+from array import array
+import pygame
+
+class EarconPlayer:
+    """
+    Plays short pre-rendered feedback tones on their own mixer channel
+    """
+    # Tone sequences per event: (frequency in Hz, duration in seconds)
+    TONES = {
+        "wake": [(660, 0.06), (880, 0.08)],
+        "ack": [(880, 0.05)],
+        "success": [(660, 0.05), (990, 0.07)],
+        "error": [(440, 0.08), (330, 0.12)]
+    }
+
+    def __init__(self, config, channel_id=1):
+        """
+        Initialize the EarconPlayer
+
+        Args:
+            config (dict): Configuration dictionary containing audio settings
+            channel_id (int): Reserved mixer channel used for earcons
+        """
+        settings = config.get("audio_settings", {}).get("earcons", {})
+        self.volume = settings.get("volume", 0.6)
+        self.channel = pygame.mixer.Channel(channel_id)
+        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        # Render everything up front so playback never decodes or synthesizes
+        self.sounds = {}
+        files = settings.get("files", {})
+        for event in set(self.TONES) | set(files):
+            sound = None
+            if event in files:
+                sound = self._load_file(files[event])
+            if sound is None and event in self.TONES:
+                sound = self._render_tones(self.TONES[event])
+            if sound is not None:
+                sound.set_volume(self.volume)
+                self.sounds[event] = sound
+
+    def _load_file(self, path):
+        """Load a custom earcon clip, relative paths are resolved from the project folder"""
+        if not os.path.isabs(path):
+            path = os.path.join(self.base_dir, path)
+        try:
+            return pygame.mixer.Sound(path)
+        except Exception as e:
+            print(f"Couldn't load earcon {path}: {e}")
+            return None
+
+    def _render_tones(self, tones):
+        """
+        Render a tone sequence to PCM in the mixer's format
+
+        Args:
+            tones (list): (frequency, duration) pairs
+
+        Returns:
+            pygame.mixer.Sound: Rendered earcon
+        """
+        frequency, _, channels = pygame.mixer.get_init()
+        fade = int(frequency * 0.005)
+        samples = array('h')
+        for tone_frequency, duration in tones:
+            count = int(frequency * duration)
+            for i in range(count):
+                # Short linear fade in and out avoids clicks
+                envelope = min(1.0, i / fade, (count - i) / fade) if fade else 1.0
+                value = int(12000 * envelope * math.sin(2 * math.pi * tone_frequency * i / frequency))
+                for _ in range(channels):
+                    samples.append(value)
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+
+    def play(self, event):
+        """
+        Play the earcon for an event, interrupting any earcon still playing
+
+        Args:
+            event (str): Event name such as "wake", "ack", "success" or "error"
+
+        Returns:
+            bool: True if an earcon was played
+        """
+        sound = self.sounds.get(event)
+        if sound is None:
+            return False
+        try:
+            self.channel.play(sound)
+            return True
+        except Exception as e:
+            print(f"Error playing earcon {event}: {e}")
+            return False
@@ -0,0 +1,180 @@
+import re
+import time
+import threading
+from collections import deque
+from difflib import SequenceMatcher
+from typing import List, Optional, Tuple
+from .phrase_index import COMMON_WORDS
+
+class EchoSuppressor:
+    """
+    Recognizes the assistant's own voice coming back through the microphone
+
+    Every sentence played is kept with the time it was audible. A transcript
+    heard while, or shortly after, something was played is compared word by
+    word with that text: if it is mostly the same words in the same order it
+    is an echo and dropped. When only its beginning is echo (the user spoke
+    right as playback ended) that part is cut off and the rest is kept.
+
+    Users repeat the assistant's words ("the weather tomorrow" right after
+    "... the weather ..."), so an echo has to start with a contiguous run of
+    min_run played words, or a whole played sentence, and only words that
+    aren't common function words count towards the match.
+    """
+    def __init__(self, window=1.0, history=15.0, min_similarity=0.6, min_words=2, min_run=3):
+        """
+        Initialize the EchoSuppressor
+
+        Args:
+            window (float): Seconds after playback ends that it can still be picked up
+                (room reverb plus capture latency)
+            history (float): Seconds of played sentences kept
+            min_similarity (float): Share of a transcript's words found in the played text
+                for it to count as echo
+            min_words (int): Matching words, other than common ones, needed for echo
+            min_run (int): Length of the contiguous run of played words an echo starts with,
+                unless it covers most of a played sentence
+        """
+        self.window = window
+        self.history = history
+        self.min_similarity = min_similarity
+        self.min_words = min_words
+        self.min_run = min_run
+        self.lock = threading.Lock()
+        # [text words, start, end or None while still playing]
+        self.played = deque()
+        self.stats = {
+            "checked": 0,
+            "dropped": 0,
+            "trimmed": 0
+        }
+
+    @staticmethod
+    def _words(text: str):
+        """Lowercase words of a text"""
+        return re.findall(r"[a-z0-9']+", text.lower())
+
+    def on_playback(self, text: str, start: float, end: Optional[float] = None):
+        """
+        Note a sentence being played; call it when playback starts and again when it ends
+
+        Args:
+            text (str): Sentence spoken
+            start (float): time.monotonic() when playback started
+            end (float, optional): time.monotonic() when it ended, None while playing
+        """
+        with self.lock:
+            for entry in reversed(self.played):
+                if entry[1] == start:
+                    entry[2] = end
+                    break
+            else:
+                self.played.append([self._words(text), start, end])
+
+            horizon = time.monotonic() - self.history
+            while self.played and self.played[0][2] is not None and self.played[0][2] < horizon:
+                self.played.popleft()
+
+    def _recent_sentences(self, start: float, end: float) -> List[list]:
+        """Words of each sentence audible between start and end; the lock must be held"""
+        sentences = []
+        for played_words, played_start, played_end in self.played:
+            if played_start > end:
+                continue
+            if played_end is not None and played_end + self.window < start:
+                continue
+            sentences.append(played_words)
+        return sentences
+
+    @staticmethod
+    def _content(words) -> int:
+        """Number of words that aren't common function words"""
+        return sum(1 for word in words if word not in COMMON_WORDS)
+
+    def _starts_echo(self, block, sentences) -> bool:
+        """Whether a first matching block is long enough to be echo rather than repeated words"""
+        if block.size >= self.min_run:
+            return True
+        # A short sentence played and heard back whole
+        offset = 0
+        for sentence in sentences:
+            if offset <= block.b < offset + len(sentence):
+                return block.size >= 0.8 * len(sentence)
+            offset += len(sentence)
+        return False
+
+    def check(self, transcript: str, start: float, end: float) -> Tuple[int, float]:
+        """
+        Measure how much of a transcript is recently played text
+
+        Args:
+            transcript (str): Recognized text
+            start (float): time.monotonic() when the phrase started
+            end (float): time.monotonic() when it ended
+
+        Returns:
+            Tuple[int, float]: (number of leading words that are echo, share of those
+            words matched in the played text)
+        """
+        words = self._words(transcript)
+        with self.lock:
+            sentences = self._recent_sentences(start, end)
+        played = [word for sentence in sentences for word in sentence]
+        if not words or not played:
+            return 0, 0.0
+
+        matcher = SequenceMatcher(None, words, played, autojunk=False)
+        blocks = [block for block in matcher.get_matching_blocks() if block.size]
+        # Echo is picked up from the start of a phrase; allow one misheard word before it
+        if not blocks or blocks[0].a > 1 or not self._starts_echo(blocks[0], sentences):
+            return 0, 0.0
+
+        echo_words, similarity, matched = 0, 0.0, 0
+        for block in blocks:
+            matched += self._content(words[block.a:block.a + block.size])
+            cut = block.a + block.size
+            content = self._content(words[:cut])
+            # The echo part is the longest prefix whose meaningful words are mostly played words
+            if content and matched >= self.min_words and matched >= self.min_similarity * content:
+                echo_words, similarity = cut, matched / content
+        return echo_words, similarity
+
+    def filter(self, transcript: str, start: float, end: float) -> Optional[str]:
+        """
+        Remove the assistant's own voice from a transcript
+
+        Args:
+            transcript (str): Recognized text
+            start (float): time.monotonic() when the phrase started
+            end (float): time.monotonic() when it ended
+
+        Returns:
+            Optional[str]: The transcript, what follows its echoed beginning, or None
+            if it is all echo
+        """
+        echo_words, _ = self.check(transcript, start, end)
+        words = self._words(transcript)
+        with self.lock:
+            self.stats["checked"] += 1
+            if echo_words and echo_words >= len(words):
+                self.stats["dropped"] += 1
+            elif echo_words:
+                self.stats["trimmed"] += 1
+
+        if not echo_words:
+            return transcript
+        if echo_words >= len(words):
+            return None
+        return " ".join(words[echo_words:])
+
+    def get_stats(self) -> dict:
+        """
+        Get suppression statistics
+
+        Returns:
+            dict: Transcripts checked, dropped as echo and trimmed of a leading echo
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats["sentences"] = len(self.played)
+        return stats
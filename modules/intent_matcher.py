@@ -0,0 +1,361 @@
+from collections import deque
+from typing import Dict, Optional
+
+# Phrase tables of the command router
+COMMAND_VARIATIONS = {
+    'mute_commands': [
+        # AI speech muting
+        "shut up", "stop talking", "be quiet",
+        "silence please", "stop speaking", "mute voice",
+        "quiet now", "stop ai", "ai mute",
+        "stop assistant", "quiet please", "hush"
+    ],
+    'unmute_commands': [
+        # AI speech unmuting
+        "speak up", "continue talking", "unmute voice",
+        "start speaking", "unmute ai", "ai unmute",
+        "resume speaking", "voice on", "assistant speak",
+        "you can talk", "resume voice", "mute"
+    ],
+
+    'music_keywords': [
+        # Basic music commands
+        "play", "music", "song", "track",
+
+        # Playlist commands
+        "play playlist", "start playlist",
+        "shuffle playlist", "play mix",
+
+        # Artist commands
+        "play artist", "music by",
+
+        # Album commands
+        "play album", "start album",
+
+        # Genre commands
+        "play rock", "play jazz", "play pop",
+        "play classical", "play hip hop"
+    ],
+
+    'volume_commands': [
+        # Volume up
+        "volume up", "louder", "increase volume",
+        "turn it up", "raise volume",
+
+        # Volume down
+        "volume down", "quieter", "decrease volume",
+        "turn it down", "lower volume"
+    ],
+
+    'playback_controls': [
+        # Play/Pause
+        "play", "pause", "resume", "stop",
+
+        # Navigation
+        "next", "previous", "skip", "back",
+        "next song", "previous song",
+
+        # Shuffle/Repeat
+        "shuffle", "repeat", "repeat one",
+        "shuffle on", "shuffle off",
+
+        # Like/Save
+        "like song", "save song", "like this",
+        "add to favorites"
+    ]
+}
+
+SLEEP_PHRASES = ["go to sleep", "sleep now", "sleep mode", "stop listening", "you can sleep"]
+OPEN_VERBS = ["open", "start", "launch", "run"]
+CLOSE_VERBS = ["close", "exit", "quit", "terminate", "stop"]
+MINIMIZE_WORDS = ["minimize", "hide", "shrink"]
+MAXIMIZE_WORDS = ["maximize", "expand", "full screen"]
+SYSTEM_WORDS = ["shutdown", "restart", "sleep", "hibernate", "power off", "reboot"]
+GOODBYE_WORDS = ["goodbye", "bye", "see you", "later", "good night"]
+MUSIC_TARGETS = ["spotify", "music", "song", "player"]
+
+# Music actions, first match wins: (action, phrases found anywhere, whole commands)
+MUSIC_ACTIONS = [
+    ("launch", ["open spotify"], []),
+    ("play", ["play"], []),
+    ("pause", [], ["pause", "stop"]),
+    ("resume", [], ["resume", "continue"]),
+    ("next", [], ["next", "skip", "next song"]),
+    ("previous", [], ["previous", "back", "last song"]),
+    ("shuffle", ["shuffle"], []),
+    ("repeat", ["repeat"], []),
+    ("like", ["like", "save"], []),
+    ("volume_up", ["volume up", "louder"], []),
+    ("volume_down", ["volume down", "quieter"], []),
+    ("minimize", ["minimize"], []),
+    ("restore", ["restore"], []),
+    ("close", ["close"], []),
+]
+PLAY_RANDOM = {"play", "play music", "play song", "play something"}
+SEARCH_CATEGORIES = [("playlist", "playlists"), ("artist", "artists"), ("album", "albums")]
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton finding every occurrence of a fixed set of phrases in one pass
+    """
+    def __init__(self, phrases):
+        """
+        Initialize the PhraseAutomaton
+
+        Args:
+            phrases (iterable): Phrases to look for, matched as plain substrings
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        phrases = set(phrases)
+        for phrase in phrases:
+            if not phrase:
+                continue
+            state = 0
+            for char in phrase:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(phrase)
+
+        # Breadth-first, so a state's failure link is final before its children need it
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+        # Fold the failure links into a full transition table, so each character costs a
+        # single lookup; characters that occur in no phrase lead back to the root
+        alphabet = {char for phrase in phrases for char in phrase}
+        self.delta = [dict() for _ in self.goto]
+        order = [0]
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for child in self.goto[state].values():
+                order.append(child)
+                queue.append(child)
+        for state in order:
+            for char in alphabet:
+                if char in self.goto[state]:
+                    target = self.goto[state][char]
+                else:
+                    target = self.delta[self.fail[state]].get(char, 0) if state else 0
+                if target:
+                    self.delta[state][char] = target
+
+    def find(self, text: str) -> Dict[str, int]:
+        """
+        Scan a text once
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            Dict[str, int]: Each phrase found, mapped to where it first starts
+        """
+        hits = {}
+        state = 0
+        delta, output = self.delta, self.output
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if output[state]:
+                for phrase in output[state]:
+                    if phrase not in hits:
+                        hits[phrase] = index - len(phrase) + 1
+        return hits
+
+
+class Intent:
+    """
+    What a command asks for: the handler to run, its arguments and how well it matched
+    """
+    __slots__ = ("name", "slots", "confidence")
+
+    def __init__(self, name, slots=None, confidence=1.0):
+        """
+        Initialize the Intent
+
+        Args:
+            name (str): Intent name, "ai" when no command matched
+            slots (dict, optional): Arguments taken from the command
+            confidence (float): 1.0 for a command that is exactly a known phrase, down to
+                the share of it covered by the matched phrase; 0.0 for "ai"
+        """
+        self.name = name
+        self.slots = slots or {}
+        self.confidence = confidence
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, {self.slots!r}, {self.confidence:.2f})"
+
+
+class IntentMatcher:
+    """
+    Routes a command to an intent with one scan over the compiled phrase tables
+
+    Intents are tried in a fixed precedence, the same order the router has
+    always checked them in: music, volume, playback, sleep, mute, unmute,
+    open, write, close, minimize, maximize, system commands, goodbye, and
+    otherwise the AI.
+    """
+    def __init__(self, variations=None, system_commands=None, media=True):
+        """
+        Initialize the IntentMatcher
+
+        Args:
+            variations (dict, optional): Phrase tables, COMMAND_VARIATIONS by default
+            system_commands (dict, optional): System command names mapped to what they run
+            media (bool): Whether a media player is available; without one, volume
+                and playback phrases aren't commands
+        """
+        variations = variations or COMMAND_VARIATIONS
+        self.system_commands = dict(system_commands or {})
+
+        routes = [("music", variations['music_keywords'])]
+        if media:
+            routes.append(("volume", variations['volume_commands']))
+            routes.append(("playback", variations['playback_controls']))
+        routes += [
+            ("sleep", SLEEP_PHRASES),
+            ("mute", variations['mute_commands']),
+            ("unmute", variations['unmute_commands']),
+            ("open", OPEN_VERBS),
+            ("write", ["write"]),
+            ("close", CLOSE_VERBS),
+            ("minimize", MINIMIZE_WORDS),
+            ("maximize", MAXIMIZE_WORDS),
+            ("system", SYSTEM_WORDS),
+            ("goodbye", GOODBYE_WORDS),
+        ]
+        self.routes = routes
+
+        # Phrase -> precedence of every route it triggers
+        self.triggers = {}
+        for precedence, (_, phrases) in enumerate(routes):
+            for phrase in phrases:
+                self.triggers.setdefault(phrase, set()).add(precedence)
+
+        phrases = set(self.triggers) | set(self.system_commands) | set(MUSIC_TARGETS)
+        for _, found, _ in MUSIC_ACTIONS:
+            phrases.update(found)
+        phrases.update(word for word, _ in SEARCH_CATEGORIES)
+        self.automaton = PhraseAutomaton(phrases)
+
+        # Phrase or whole command -> (order, action) of the first music action it selects
+        self.music_found = {}
+        self.music_exact = {}
+        for order, (action, found, commands) in enumerate(MUSIC_ACTIONS):
+            for phrase in found:
+                self.music_found.setdefault(phrase, (order, action))
+            for command in commands:
+                self.music_exact.setdefault(command, (order, action))
+
+    def match(self, command: str) -> Intent:
+        """
+        Route a command
+
+        Args:
+            command (str): Lowercase, stripped command
+
+        Returns:
+            Intent: The first intent in precedence whose phrases occur in the command
+        """
+        hits = self.automaton.find(command)
+        # Precedence of every route triggered -> length of its longest phrase found
+        triggered = {}
+        for phrase in hits:
+            for precedence in self.triggers.get(phrase, ()):
+                if len(phrase) > triggered.get(precedence, 0):
+                    triggered[precedence] = len(phrase)
+        if command == "open spotify":
+            triggered[0] = len(command)
+
+        for precedence in sorted(triggered):
+            name = self.routes[precedence][0]
+            slots = self._slots(name, command, hits)
+            if slots is not None:
+                return Intent(name, slots, min(1.0, triggered[precedence] / len(command)))
+        return Intent("ai", {"text": command}, 0.0)
+
+    def _slots(self, name: str, command: str, hits: Dict[str, int]) -> Optional[dict]:
+        """Arguments of an intent, None if the command doesn't qualify after all"""
+        if name in ("music", "volume", "playback"):
+            return self.music_slots(command, hits)
+        if name == "write":
+            if hits.get("write") != 0:
+                return None
+            return {"text": command.replace("write", "", 1).strip()}
+        if name == "open":
+            target = command
+            for verb in OPEN_VERBS:
+                target = target.replace(verb, "").strip()
+            if "and write" in target:
+                app, text = target.split("and write", 1)
+                return {"target": app.strip(), "text": text.strip()}
+            return {"target": target, "text": None}
+        if name == "close":
+            target = command
+            for verb in CLOSE_VERBS:
+                target = target.replace(verb, "").strip()
+            return {"target": target, "music": any(word in hits for word in MUSIC_TARGETS)}
+        if name in ("minimize", "maximize"):
+            target = command
+            for word in (MINIMIZE_WORDS if name == "minimize" else MAXIMIZE_WORDS):
+                target = target.replace(word, "")
+            return {"target": target.strip()}
+        if name == "system":
+            for key, action in self.system_commands.items():
+                if key in hits:
+                    return {"command": key, "action": action}
+            # "power off", "reboot" without a configured command aren't handled here
+            return None
+        return {}
+
+    def music_slots(self, command: str, hits: Optional[Dict[str, int]] = None) -> dict:
+        """
+        Work out what a music command asks the player to do
+
+        Args:
+            command (str): Lowercase, stripped command
+            hits (dict, optional): Result of the automaton scan, done here if not given
+
+        Returns:
+            dict: "action", and for searches "search_term" and "category"; the
+            action is "unknown" if nothing matched
+        """
+        if hits is None:
+            hits = self.automaton.find(command)
+
+        candidates = [self.music_found[phrase] for phrase in hits if phrase in self.music_found]
+        if command in self.music_exact:
+            candidates.append(self.music_exact[command])
+        if not candidates:
+            return {"action": "unknown"}
+
+        _, action = min(candidates)
+        if action != "play":
+            return {"action": action}
+        if command in PLAY_RANDOM:
+            return {"action": "play_random"}
+
+        # Name the category before "play" is taken out, "playlist" contains it
+        search_term, category = command, "songs"
+        for word, name in SEARCH_CATEGORIES:
+            if word in hits:
+                search_term, category = search_term.replace(word, ""), name
+                break
+        search_term = " ".join(search_term.replace("play", "").split())
+        return {"action": "search", "search_term": search_term, "category": category}
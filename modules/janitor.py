@@ -0,0 +1,186 @@
+import os
+import time
+import heapq
+import threading
+
+class AudioJanitor:
+    """
+    Background cleanup of temporary audio files with retried deletions and disk quotas
+    """
+    def __init__(self, temp_dir, cache=None, max_temp_age=300, max_temp_mb=20,
+                 max_cache_age_days=30, interval=300, retry_delay=2.0, max_retries=5):
+        """
+        Initialize the AudioJanitor
+
+        Args:
+            temp_dir (str): Directory with temporary audio files
+            cache (TTSCache, optional): Audio cache whose old entries should expire
+            max_temp_age (float): Seconds after which a temp file is removed
+            max_temp_mb (float): Size quota for the temp directory in megabytes
+            max_cache_age_days (float): Days after which unused cache entries expire, 0 to disable
+            interval (float): Seconds between periodic sweeps
+            retry_delay (float): Initial delay before retrying a failed deletion, doubled per attempt
+            max_retries (int): Attempts before a deletion is given up
+        """
+        self.temp_dir = temp_dir
+        self.cache = cache
+        self.max_temp_age = max_temp_age
+        self.max_temp_size = int(max_temp_mb * 1024 * 1024)
+        self.max_cache_age = max_cache_age_days * 86400
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+
+        # Files left over from earlier runs are removed on the first sweep regardless of age
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        # Deletions to retry: (due time, attempt, path)
+        self.retries = []
+        self.wakeup = threading.Event()
+        self.should_stop = False
+        self.thread = None
+
+        self.stats = {
+            "sweeps": 0,
+            "files_deleted": 0,
+            "bytes_reclaimed": 0,
+            "retries": 0,
+            "failed_deletions": 0,
+            "cache_entries_expired": 0
+        }
+
+    def start(self):
+        """Start the janitor thread; the first sweep runs in the background"""
+        if self.thread:
+            return
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the janitor thread"""
+        self.should_stop = True
+        self.wakeup.set()
+
+    def delete(self, path):
+        """
+        Delete a file now, or queue it for retries if it is still in use
+
+        Args:
+            path (str): File to delete
+
+        Returns:
+            bool: True if the file is gone
+        """
+        if self._try_remove(path):
+            return True
+        self._schedule_retry(path, 1)
+        return False
+
+    def _try_remove(self, path):
+        """Remove a file and account for the reclaimed space"""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+        with self.lock:
+            self.stats["files_deleted"] += 1
+            self.stats["bytes_reclaimed"] += size
+        return True
+
+    def _schedule_retry(self, path, attempt):
+        """Queue a failed deletion with exponential backoff"""
+        with self.lock:
+            if attempt > self.max_retries:
+                self.stats["failed_deletions"] += 1
+                print(f"Couldn't remove file {path} after {self.max_retries} attempts")
+                return
+            due = time.monotonic() + self.retry_delay * (2 ** (attempt - 1))
+            heapq.heappush(self.retries, (due, attempt, path))
+        self.wakeup.set()
+
+    def _run(self):
+        """Sweep periodically and process due retries, sleeping in between"""
+        next_sweep = time.monotonic()
+        while not self.should_stop:
+            now = time.monotonic()
+            if now >= next_sweep:
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"Audio janitor sweep error: {e}")
+                next_sweep = now + self.interval
+
+            self._process_retries()
+
+            with self.lock:
+                next_due = self.retries[0][0] if self.retries else next_sweep
+            self.wakeup.wait(max(0.0, min(next_due, next_sweep) - time.monotonic()))
+            self.wakeup.clear()
+
+    def _process_retries(self):
+        """Retry deletions that are due"""
+        now = time.monotonic()
+        while True:
+            with self.lock:
+                if not self.retries or self.retries[0][0] > now:
+                    return
+                _, attempt, path = heapq.heappop(self.retries)
+                self.stats["retries"] += 1
+            if not self._try_remove(path):
+                self._schedule_retry(path, attempt + 1)
+
+    def sweep(self):
+        """Enforce the age and size quotas on the temp directory and expire old cache entries"""
+        with self.lock:
+            self.stats["sweeps"] += 1
+            first_sweep = self.stats["sweeps"] == 1
+
+        if os.path.isdir(self.temp_dir):
+            now = time.time()
+            files = []
+            for filename in os.listdir(self.temp_dir):
+                path = os.path.join(self.temp_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if not os.path.isfile(path):
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            remaining = []
+            for mtime, size, path in files:
+                expired = now - mtime > self.max_temp_age
+                stale = first_sweep and mtime < self.started_at
+                if expired or stale:
+                    self.delete(path)
+                else:
+                    remaining.append((mtime, size, path))
+
+            # Oldest first until the directory fits its quota
+            total = sum(size for _, size, _ in remaining)
+            for mtime, size, path in sorted(remaining):
+                if total <= self.max_temp_size:
+                    break
+                self.delete(path)
+                total -= size
+
+        if self.cache and self.max_cache_age:
+            expired = self.cache.expire(self.max_cache_age)
+            with self.lock:
+                self.stats["cache_entries_expired"] += expired["entries"]
+                self.stats["bytes_reclaimed"] += expired["bytes"]
+
+    def get_stats(self):
+        """
+        Get janitor statistics
+
+        Returns:
+            dict: Sweep count, deleted files, reclaimed bytes and retry counters
+        """
+        with self.lock:
+            return dict(self.stats, pending_retries=len(self.retries))
@@ -0,0 +1,537 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Optional, Tuple
+import numpy as np
+import speech_recognition as sr
+from .vad import VoiceActivityDetector
+from .noise_profile import NoiseProfile
+
+def frame_rms(data) -> float:
+    """
+    Compute the RMS energy of a chunk of 16-bit mono PCM
+
+    Args:
+        data (bytes | np.ndarray): Raw audio frames or int16 samples
+
+    Returns:
+        float: Root mean square of the samples
+    """
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, dtype=np.int16, count=len(data) // 2)
+    if not len(data):
+        return 0.0
+    return float(np.sqrt(np.mean(np.square(data, dtype=np.float64))))
+
+
+class RingReader:
+    """
+    Cursor over the ring buffer of a MicrophoneStream
+
+    Readers never copy audio; they only walk buffer indices and look up the
+    energy and speech decision computed by the capture thread.
+    """
+    def __init__(self, stream, position):
+        """
+        Initialize the RingReader
+
+        Args:
+            stream (MicrophoneStream): Stream to read from
+            position (int): Index of the first buffer to return
+        """
+        self.stream = stream
+        self.position = position
+
+    def next(self, timeout=None) -> Optional[Tuple[int, float, bool]]:
+        """
+        Wait for the next captured buffer
+
+        Args:
+            timeout (float, optional): Seconds to wait, forever if None
+
+        Returns:
+            Optional[Tuple[int, float, bool]]: (buffer index, energy, whether it is speech),
+            None on timeout
+        """
+        stream = self.stream
+        with stream.frames_ready:
+            if not stream.frames_ready.wait_for(lambda: stream.written > self.position, timeout):
+                return None
+            oldest = stream.written - stream.capacity
+            if self.position < oldest:
+                # Fell behind by more than the ring holds, those buffers are gone
+                stream.overruns += 1
+                self.position = oldest
+            index = self.position
+            slot = index % stream.capacity
+            energy = float(stream.energies[slot])
+            speech = bool(stream.speech[slot])
+        self.position += 1
+        return index, energy, speech
+
+
+class MicrophoneStream:
+    """
+    Long-lived microphone capture shared by wake word detection, command listening and barge-in
+
+    The microphone is opened once, calibrated once, and afterwards the energy
+    threshold follows the ambient level using only frames that aren't speech.
+    Captured audio goes into a preallocated ring buffer; consumers read it
+    through RingReader cursors, so a command can be picked up from the exact
+    buffer where the wake word ended. Every buffer is also classified as
+    speech or not by a VoiceActivityDetector, unless it is disabled.
+
+    With a profile directory, what has been learned about the device's noise
+    is saved and restored at the next start, which then skips calibration.
+    """
+    def __init__(self, recognizer, calibration_duration=1.0, dynamic_energy_ratio=1.5,
+                 dynamic_energy_damping=0.15, device_index=None, ring_seconds=30.0,
+                 vad_settings=None, profile_dir=None, profile_save_interval=60.0,
+                 noise_smoothing=0.05):
+        """
+        Initialize the MicrophoneStream
+
+        Args:
+            recognizer (sr.Recognizer): Recognizer whose energy threshold and timing settings are used
+            calibration_duration (float): Seconds of ambient audio used for the initial calibration
+            dynamic_energy_ratio (float): Speech must be this many times louder than ambient noise
+            dynamic_energy_damping (float): How slowly the threshold follows ambient changes
+            device_index (int, optional): PyAudio input device index
+            ring_seconds (float): Seconds of audio kept in the ring buffer
+            vad_settings (dict, optional): VoiceActivityDetector options, None for a plain
+                energy threshold
+            profile_dir (str, optional): Directory of per-device noise profiles, None to
+                calibrate at every start
+            profile_save_interval (float): Seconds between saves of the noise profile
+            noise_smoothing (float): Weight of each non-speech buffer in the noise estimates
+        """
+        self.recognizer = recognizer
+        self.calibration_duration = calibration_duration
+        self.dynamic_energy_ratio = dynamic_energy_ratio
+        self.dynamic_energy_damping = dynamic_energy_damping
+        self.device_index = device_index
+        self.ring_seconds = ring_seconds
+        self.vad_settings = vad_settings
+        self.vad = None
+        self.profile_dir = profile_dir
+        self.profile_save_interval = profile_save_interval
+        self.noise_smoothing = noise_smoothing
+        self.profile = None
+        self.profile_path = None
+        self.last_profile_save = 0.0
+        self.noise_floor = 0.0
+
+        self.source = None
+        self.sample_rate = None
+        self.sample_width = None
+        self.chunk_size = None
+        self.seconds_per_buffer = None
+
+        # Buffer i lives in row i % capacity; written counts buffers ever captured
+        self.ring = None
+        self.energies = None
+        self.speech = None
+        # time.monotonic() when each buffer finished capturing
+        self.times = None
+        self.capacity = 0
+        self.written = 0
+        self.overruns = 0
+        self.frames_ready = threading.Condition()
+
+        self.start_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.should_stop = False
+        self.thread = None
+        self.error = None
+
+    def start(self):
+        """
+        Open the microphone and start capturing, blocking until calibration is done
+
+        Raises:
+            OSError: If the microphone can't be opened
+        """
+        with self.start_lock:
+            if not (self.thread and self.thread.is_alive()):
+                self.source = sr.Microphone(device_index=self.device_index)
+                self.source.__enter__()
+                self.sample_rate = self.source.SAMPLE_RATE
+                self.sample_width = self.source.SAMPLE_WIDTH
+                self.chunk_size = self.source.CHUNK
+                self.seconds_per_buffer = self.chunk_size / self.sample_rate
+
+                capacity = max(1, int(math.ceil(self.ring_seconds / self.seconds_per_buffer)))
+                with self.frames_ready:
+                    if self.ring is None or self.ring.shape != (capacity, self.chunk_size):
+                        self.ring = np.zeros((capacity, self.chunk_size), dtype=np.int16)
+                        self.energies = np.zeros(capacity, dtype=np.float64)
+                        self.speech = np.zeros(capacity, dtype=bool)
+                        self.times = np.zeros(capacity, dtype=np.float64)
+                        self.capacity = capacity
+                        self.written = 0
+
+                if self.vad_settings is not None:
+                    self.vad = VoiceActivityDetector(self.sample_rate, self.seconds_per_buffer,
+                                                     **self.vad_settings)
+                self._load_profile()
+
+                self.should_stop = False
+                self.ready.clear()
+                self.thread = threading.Thread(target=self._capture, daemon=True)
+                self.thread.start()
+        self.ready.wait()
+
+    def stop(self):
+        """Stop capturing, save the noise profile and release the microphone"""
+        self.should_stop = True
+        if self.thread:
+            self.thread.join(timeout=1)
+        self.save_profile()
+        if self.source:
+            try:
+                self.source.__exit__(None, None, None)
+            except Exception:
+                pass
+        self.source = None
+        self.thread = None
+
+    def _device_name(self) -> str:
+        """Name of the opened input device, used to pick its noise profile"""
+        try:
+            audio = self.source.audio
+            if self.device_index is not None:
+                info = audio.get_device_info_by_index(self.device_index)
+            else:
+                info = audio.get_default_input_device_info()
+            return info.get("name") or "default"
+        except Exception:
+            return "default"
+
+    def _load_profile(self):
+        """Restore the saved noise profile of the opened device, if there is one"""
+        if not self.profile_dir:
+            return
+        device = self._device_name()
+        self.profile_path = NoiseProfile.path_for(self.profile_dir, device, self.sample_rate)
+        self.profile = NoiseProfile.load(self.profile_path)
+        if self.profile is None or not self.profile.energy_threshold:
+            self.profile = NoiseProfile(device, self.sample_rate)
+            return
+
+        self.recognizer.energy_threshold = self.profile.energy_threshold
+        self.noise_floor = self.profile.noise_floor
+        if self.vad:
+            self.vad.noise_spectrum = self.profile.spectrum
+        self.last_profile_save = time.monotonic()
+        print(f"Restored noise profile for {device}, energy threshold {self.profile.energy_threshold:.0f}")
+
+    def save_profile(self):
+        """Write what has been learned about the ambient noise to the device's profile"""
+        if not self.profile or not self.profile_path:
+            return
+        self.profile.noise_floor = self.noise_floor
+        self.profile.energy_threshold = self.recognizer.energy_threshold
+        if self.vad and self.vad.noise_spectrum is not None:
+            self.profile.spectrum = self.vad.noise_spectrum.copy()
+        try:
+            self.profile.save(self.profile_path)
+        except OSError as e:
+            print(f"Couldn't save noise profile: {e}")
+        self.last_profile_save = time.monotonic()
+
+    def _capture(self):
+        """Read the microphone continuously into the ring buffer"""
+        try:
+            # A restored profile already knows the room
+            if not (self.profile and self.profile.energy_threshold):
+                self._calibrate()
+                self.save_profile()
+        except Exception as e:
+            print(f"Error adjusting for ambient noise: {e}")
+        finally:
+            self.ready.set()
+
+        while not self.should_stop:
+            try:
+                data = self.source.stream.read(self.chunk_size)
+            except Exception as e:
+                self.error = e
+                print(f"Microphone stream error: {e}")
+                time.sleep(self.seconds_per_buffer)
+                continue
+
+            # The only copy a buffer ever gets until a phrase is handed to recognition
+            slot = self.written % self.capacity
+            frame = self.ring[slot]
+            samples = np.frombuffer(data, dtype=np.int16, count=min(len(data) // 2, self.chunk_size))
+            frame[:len(samples)] = samples
+            frame[len(samples):] = 0
+
+            energy = frame_rms(frame)
+            threshold = self.recognizer.energy_threshold
+            if self.vad:
+                speech = self.vad.update(frame, threshold)
+            else:
+                speech = energy > threshold
+            self.energies[slot] = energy
+            self.speech[slot] = speech
+            self.times[slot] = time.monotonic()
+            if not speech:
+                self._learn_noise(energy)
+
+            with self.frames_ready:
+                self.written += 1
+                self.frames_ready.notify_all()
+
+    def _calibrate(self):
+        """Set the initial energy threshold from a short stretch of ambient audio"""
+        print("\nAdjusting for ambient noise... Please wait...")
+        buffers = max(1, int(math.ceil(self.calibration_duration / self.seconds_per_buffer)))
+        energies = [frame_rms(self.source.stream.read(self.chunk_size)) for _ in range(buffers)]
+        ambient = sum(energies) / len(energies)
+        self.noise_floor = ambient
+        self.recognizer.energy_threshold = max(ambient * self.dynamic_energy_ratio, 1.0)
+        print(f"Energy threshold set to {self.recognizer.energy_threshold}")
+
+    def calibrate(self, duration=None):
+        """
+        Re-run the ambient calibration on the live stream
+
+        Args:
+            duration (float, optional): Seconds of ambient audio to measure
+        """
+        duration = duration or self.calibration_duration
+        reader = self.reader()
+        buffers = max(1, int(math.ceil(duration / self.seconds_per_buffer)))
+        energies = [reader.next()[1] for _ in range(buffers)]
+        ambient = sum(energies) / len(energies)
+        self.noise_floor = ambient
+        self.recognizer.energy_threshold = max(ambient * self.dynamic_energy_ratio, 1.0)
+        print(f"Energy threshold set to {self.recognizer.energy_threshold}")
+        self.save_profile()
+
+    def _learn_noise(self, energy):
+        """Refine the noise estimates from a buffer that isn't speech"""
+        self._adapt_threshold(energy)
+        self.noise_floor += self.noise_smoothing * (energy - self.noise_floor)
+        if self.vad:
+            self.vad.update_noise(self.noise_smoothing)
+        if time.monotonic() - self.last_profile_save > self.profile_save_interval:
+            self.save_profile()
+
+    def _adapt_threshold(self, energy):
+        """Move the threshold towards the current ambient level, using a non-speech frame"""
+        if not self.recognizer.dynamic_energy_threshold:
+            return
+        damping = self.dynamic_energy_damping ** self.seconds_per_buffer
+        target = energy * self.dynamic_energy_ratio
+        self.recognizer.energy_threshold = self.recognizer.energy_threshold * damping + target * (1 - damping)
+
+    @property
+    def position(self) -> int:
+        """Index of the next buffer to be captured"""
+        with self.frames_ready:
+            return self.written
+
+    def reader(self, position: Optional[int] = None) -> RingReader:
+        """
+        Get a cursor over captured buffers
+
+        Args:
+            position (int, optional): First buffer to read, defaults to the next one captured.
+                Buffers already overwritten are skipped.
+
+        Returns:
+            RingReader: Cursor starting at the position
+        """
+        with self.frames_ready:
+            if position is None:
+                position = self.written
+            return RingReader(self, max(position, self.written - self.capacity))
+
+    def frame(self, index: int) -> bytes:
+        """
+        Copy one buffer out of the ring
+
+        Args:
+            index (int): Buffer index, must still be held by the ring
+
+        Returns:
+            bytes: Raw audio of the buffer
+        """
+        with self.frames_ready:
+            return self.ring[index % self.capacity].tobytes()
+
+    def audio(self, start: int, end: int) -> sr.AudioData:
+        """
+        Copy a range of buffers out of the ring
+
+        Args:
+            start (int): First buffer index
+            end (int): Buffer index after the last one
+
+        Returns:
+            sr.AudioData: Audio of the range, clipped to what the ring still holds
+        """
+        with self.frames_ready:
+            start = max(start, self.written - self.capacity)
+            end = min(end, self.written)
+            count = max(0, end - start)
+            first = start % self.capacity if self.capacity else 0
+            if first + count <= self.capacity:
+                data = self.ring[first:first + count].tobytes()
+            else:
+                wrapped = first + count - self.capacity
+                data = self.ring[first:].tobytes() + self.ring[:wrapped].tobytes()
+        return sr.AudioData(data, self.sample_rate, self.sample_width)
+
+    def time_span(self, start: int, end: int) -> Tuple[float, float]:
+        """
+        When a buffer range was spoken
+
+        Args:
+            start (int): First buffer index
+            end (int): Buffer index after the last one
+
+        Returns:
+            Tuple[float, float]: time.monotonic() at the start and end of the range,
+            clipped to what the ring still holds
+        """
+        with self.frames_ready:
+            start = max(start, self.written - self.capacity)
+            end = min(end, self.written)
+            if end <= start:
+                now = time.monotonic()
+                return now, now
+            last = self.times[(end - 1) % self.capacity]
+            return float(self.times[start % self.capacity]) - self.seconds_per_buffer, float(last)
+
+    def speech_duration(self, start: int, end: int) -> float:
+        """
+        Seconds of a buffer range that were classified as speech
+
+        Args:
+            start (int): First buffer index
+            end (int): Buffer index after the last one
+
+        Returns:
+            float: Duration of the speech buffers
+        """
+        with self.frames_ready:
+            start = max(start, self.written - self.capacity)
+            end = min(end, self.written)
+            if end <= start:
+                return 0.0
+            slots = np.arange(start, end) % self.capacity
+            speech = np.count_nonzero(self.speech[slots])
+        return speech * self.seconds_per_buffer
+
+    def listen(self, timeout=None, phrase_time_limit=None, start=None) -> sr.AudioData:
+        """
+        Capture the next phrase, endpointed the same way as sr.Recognizer.listen
+
+        Args:
+            timeout (float, optional): Seconds to wait for speech to start
+            phrase_time_limit (float, optional): Maximum phrase length in seconds
+            start (int, optional): Buffer index to start from instead of the next one captured
+
+        Returns:
+            sr.AudioData: Captured phrase
+
+        Raises:
+            sr.WaitTimeoutError: If no speech started within the timeout, or capture stopped
+                in the middle of a phrase
+        """
+        phrase_start, phrase_end = self.listen_range(timeout, phrase_time_limit, start)
+        return self.audio(phrase_start, phrase_end)
+
+    def listen_range(self, timeout=None, phrase_time_limit=None, start=None, on_buffer=None,
+                     pause_for=None) -> Tuple[int, int]:
+        """
+        Find the next phrase in the ring buffer without copying it
+
+        Args:
+            timeout (float, optional): Seconds to wait for speech to start
+            phrase_time_limit (float, optional): Maximum phrase length in seconds
+            start (int, optional): Buffer index to start from instead of the next one captured
+            on_buffer (callable, optional): Called as on_buffer(index, phrase_start, speech) for
+                every buffer of a candidate phrase while it is captured; a new phrase_start
+                means the previous candidate was too short and was dropped
+            pause_for (callable, optional): Returns the silence in seconds that ends the phrase
+                at this point, or None for the recognizer's pause_threshold; asked after
+                every buffer so the endpoint can follow what has been said so far
+
+        Returns:
+            Tuple[int, int]: (first buffer index, buffer index after the last one)
+
+        Raises:
+            sr.WaitTimeoutError: If no speech started within the timeout, or capture stopped
+                in the middle of a phrase
+        """
+        self.start()
+        recognizer = self.recognizer
+        spb = self.seconds_per_buffer
+        pause_buffers = int(math.ceil(recognizer.pause_threshold / spb))
+        phrase_buffers = int(math.ceil(recognizer.phrase_threshold / spb))
+        non_speaking_buffers = int(math.ceil(recognizer.non_speaking_duration / spb))
+
+        reader = self.reader(start)
+        elapsed = 0.0
+        while True:
+            # Wait for speech to start, keeping a little audio from before it
+            preroll = deque(maxlen=max(1, non_speaking_buffers))
+            while True:
+                frame = reader.next(timeout=timeout)
+                if frame is None:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                index, _, speech = frame
+                elapsed += spb
+                if timeout and elapsed > timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                preroll.append(index)
+                if speech:
+                    break
+
+            # Record until the speaker pauses
+            phrase_start = preroll[0]
+            if on_buffer:
+                for index in preroll:
+                    on_buffer(index, phrase_start, index == preroll[-1])
+            phrase_count = 1
+            pause_count = 0
+            phrase_elapsed = 0.0
+            while True:
+                # Buffers keep arriving while capture runs; if none comes for the rest of the
+                # phrase time (or the start timeout), the stream has stopped
+                if phrase_time_limit:
+                    wait = max(phrase_time_limit - phrase_elapsed, 0.0) + recognizer.pause_threshold
+                else:
+                    wait = timeout or max(1.0, recognizer.pause_threshold + spb)
+                frame = reader.next(timeout=wait)
+                if frame is None:
+                    raise sr.WaitTimeoutError("listening timed out while capturing phrase")
+                index, _, speech = frame
+                if on_buffer:
+                    on_buffer(index, phrase_start, speech)
+                elapsed += spb
+                phrase_elapsed += spb
+                phrase_count += 1
+                if speech:
+                    pause_count = 0
+                else:
+                    pause_count += 1
+                pause = pause_for() if pause_for else None
+                limit = int(math.ceil(pause / spb)) if pause is not None else pause_buffers
+                if pause_count > limit:
+                    break
+                if phrase_time_limit and phrase_elapsed > phrase_time_limit:
+                    break
+
+            # Too short to be a phrase, treat it as noise and keep waiting
+            if phrase_count - pause_count >= phrase_buffers:
+                break
+
+        # Drop trailing silence beyond what recognizers need
+        phrase_end = reader.position - max(0, pause_count - non_speaking_buffers)
+        return phrase_start, phrase_end
@@ -0,0 +1,96 @@
+import os
+import re
+import json
+import time
+from typing import Optional
+import numpy as np
+
+class NoiseProfile:
+    """
+    Ambient noise learned for one input device, kept on disk between sessions
+    """
+    def __init__(self, device, sample_rate, noise_floor=0.0, energy_threshold=None, spectrum=None):
+        """
+        Initialize the NoiseProfile
+
+        Args:
+            device (str): Input device name
+            sample_rate (int): Capture sample rate the profile was learned at
+            noise_floor (float): Smoothed rms energy of non-speech audio
+            energy_threshold (float, optional): Speech energy threshold in use
+            spectrum (np.ndarray, optional): Average noise power per frequency bin
+        """
+        self.device = device
+        self.sample_rate = sample_rate
+        self.noise_floor = noise_floor
+        self.energy_threshold = energy_threshold
+        self.spectrum = spectrum
+        self.updated = time.time()
+
+    @staticmethod
+    def path_for(directory, device, sample_rate) -> str:
+        """
+        Get the file a device's profile is stored in
+
+        Args:
+            directory (str): Profile directory
+            device (str): Input device name
+            sample_rate (int): Capture sample rate
+
+        Returns:
+            str: Path of the profile file
+        """
+        slug = re.sub(r'[^a-z0-9]+', '_', device.lower()).strip('_') or "default"
+        return os.path.join(directory, f"{slug}_{sample_rate}.json")
+
+    @classmethod
+    def load(cls, path) -> Optional["NoiseProfile"]:
+        """
+        Read a saved profile
+
+        Args:
+            path (str): Profile file
+
+        Returns:
+            Optional[NoiseProfile]: The profile, None if it is missing or unreadable
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            spectrum = data.get("spectrum")
+            profile = cls(
+                data["device"],
+                data["sample_rate"],
+                noise_floor=data.get("noise_floor", 0.0),
+                energy_threshold=data.get("energy_threshold"),
+                spectrum=np.array(spectrum, dtype=np.float64) if spectrum else None
+            )
+            profile.updated = data.get("updated", profile.updated)
+            return profile
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable noise profile {path}: {e}")
+            return None
+
+    def save(self, path):
+        """
+        Write the profile atomically
+
+        Args:
+            path (str): Profile file
+        """
+        self.updated = time.time()
+        data = {
+            "device": self.device,
+            "sample_rate": self.sample_rate,
+            "noise_floor": self.noise_floor,
+            "energy_threshold": self.energy_threshold,
+            "spectrum": self.spectrum.tolist() if self.spectrum is not None else None,
+            "updated": self.updated
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
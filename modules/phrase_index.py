@@ -0,0 +1,297 @@
+import re
+import time
+import threading
+from typing import List, Tuple
+
+# Consonants that are easily confused in speech share one code; vowels only count at the start
+_SOUND_GROUPS = {
+    "b": "p", "p": "p",
+    "d": "t", "t": "t",
+    "c": "k", "g": "k", "k": "k", "q": "k",
+    "s": "s", "z": "s", "x": "s",
+    "f": "f", "v": "f",
+    "j": "j",
+    "m": "m", "n": "n",
+    "l": "l", "r": "r",
+}
+
+# Everyday words of free text; a span made only of these is never respelled
+COMMON_WORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could did do does
+for from get go got had has have he her him his how i if in into is it its just like me my
+no not now of on one or our out she so some than that the their them then there these they
+this to too up us was we were what when where which who why will with would you your
+""".split())
+
+def phonetic_key(text: str) -> str:
+    """
+    Reduce text to a rough sound code, ignoring word boundaries
+
+    "spotify" and "spot if i" both become "sptf", so a word split up
+    by the recognizer still matches.
+
+    Args:
+        text (str): Words to encode
+
+    Returns:
+        str: Consonant codes with repeats collapsed, led by the first letter
+    """
+    letters = re.sub(r"[^a-z]", "", text.lower())
+    if not letters:
+        return ""
+    letters = letters.replace("ph", "f").replace("ck", "k").replace("sh", "j").replace("ch", "j")
+    letters = re.sub(r"c(?=[eiy])", "s", letters)
+    code = [letters[0]]
+    for letter in letters[1:]:
+        sound = _SOUND_GROUPS.get(letter)
+        if sound and sound != code[-1]:
+            code.append(sound)
+    return "".join(code)
+
+def _grams(key: str, n: int = 3) -> set:
+    """Character n-grams of a key, padded so short keys still have some"""
+    padded = f"^{key}$"
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+def _similar_length(text: str, other: str) -> bool:
+    """Whether two texts are spelled with about as many letters"""
+    letters, other_letters = (len(re.sub(r"[^a-z]", "", t.lower())) for t in (text, other))
+    return min(letters, other_letters) >= 0.85 * max(letters, other_letters)
+
+def syllables(text: str) -> int:
+    """Rough syllable count: vowel groups, not counting a silent final e"""
+    count = 0
+    for word in re.findall(r"[a-z]+", text.lower()):
+        groups = len(re.findall(r"[aeiouy]+", word))
+        if groups > 1 and word.endswith("e") and not word.endswith(("le", "ee")):
+            groups -= 1
+        count += max(1, groups)
+    return count
+
+
+class PhraseIndex:
+    """
+    Scores recognizer hypotheses by how much of them is known vocabulary
+
+    Phrases are indexed by the trigrams of their phonetic key. A hypothesis
+    is scored by the share of its words covered by vocabulary phrases, so
+    among several alternatives the one that names a wake word, command, app
+    or site wins over a top guess that doesn't.
+
+    Respelling is kept to what can't turn a request into something else: a
+    whole hypothesis that sounds like a command becomes that command, and
+    inside free text only a span of two or more syllables that strongly
+    matches a phrase of two or more syllables, and isn't all common words,
+    is spelled as the phrase. Everything else is kept as recognized.
+    """
+    def __init__(self, phrases=(), commands=(), min_similarity=0.85, strong_similarity=0.9,
+                 rank_penalty=0.1):
+        """
+        Initialize the PhraseIndex
+
+        Args:
+            phrases (iterable): Vocabulary phrases, kept exactly as written
+            commands (iterable): Phrases a whole hypothesis may be respelled to
+            min_similarity (float): Trigram similarity needed for a hypothesis to be respelled
+                as a whole command
+            strong_similarity (float): Trigram similarity needed to respell a span inside free text
+            rank_penalty (float): Score lost per place down the recognizer's ranking
+        """
+        self.min_similarity = min_similarity
+        self.strong_similarity = strong_similarity
+        self.rank_penalty = rank_penalty
+        self.lock = threading.Lock()
+        self.phrases = []
+        self.phrase_set = set()
+        self.commands = {}
+        self.keys = []
+        self.grams = []
+        self.postings = {}
+        self.max_words = 1
+        self.stats = {
+            "queries": 0,
+            "alternatives": 0,
+            "reranked": 0,
+            "corrected": 0,
+            "cpu_seconds": 0.0
+        }
+        self.build(phrases, commands)
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        """Lowercase words of a phrase; underscores stay, so config keys like "spotify_web" survive"""
+        return re.findall(r"[a-z0-9_']+", text.lower())
+
+    def build(self, phrases, commands=()):
+        """
+        (Re)build the index from a vocabulary
+
+        Args:
+            phrases (iterable): Vocabulary phrases
+            commands (iterable): Phrases a whole hypothesis may be respelled to
+        """
+        commands = {" ".join(self._words(phrase)) for phrase in commands} - {""}
+        unique = sorted({" ".join(self._words(phrase)) for phrase in phrases} - {""} | commands)
+        # Commands indexed by their phonetic key, for matching a whole hypothesis
+        command_keys = {}
+        for command in sorted(commands):
+            command_keys.setdefault(phonetic_key(command), command)
+        command_grams = {key: _grams(key) for key in command_keys if len(key) >= 2}
+        keys = [phonetic_key(phrase) for phrase in unique]
+        grams = [_grams(key) for key in keys]
+        postings = {}
+        for index, phrase_grams in enumerate(grams):
+            for gram in phrase_grams:
+                postings.setdefault(gram, []).append(index)
+
+        with self.lock:
+            self.phrases = unique
+            self.phrase_set = set(unique)
+            self.commands = {key: (command_keys[key], grams) for key, grams in command_grams.items()}
+            self.keys = keys
+            self.grams = grams
+            self.postings = postings
+            # A phrase may come back split into more words than it has ("spot if i")
+            self.max_words = max((len(phrase.split()) for phrase in unique), default=0) + 2
+
+    def _best_match(self, span: str) -> Tuple[float, int]:
+        """Most similar vocabulary phrase to a span as (similarity, index); the lock must be held"""
+        key = phonetic_key(span)
+        if len(key) < 2:
+            return 0.0, -1
+        span_grams = _grams(key)
+        overlap = {}
+        for gram in span_grams:
+            for index in self.postings.get(gram, ()):
+                overlap[index] = overlap.get(index, 0) + 1
+
+        best, best_index = 0.0, -1
+        for index, shared in overlap.items():
+            # Dice coefficient of the two gram sets
+            similarity = 2.0 * shared / (len(span_grams) + len(self.grams[index]))
+            if similarity > best:
+                best, best_index = similarity, index
+        return best, best_index
+
+    def _match_command(self, text: str) -> Tuple[float, str]:
+        """Command a whole hypothesis sounds like as (similarity, command); the lock must be held"""
+        key = phonetic_key(text)
+        if key in self.commands:
+            return 1.0, self.commands[key][0]
+        if len(key) < 2:
+            return 0.0, ""
+        text_grams = _grams(key)
+        best, best_command = 0.0, ""
+        for command, grams in self.commands.values():
+            similarity = 2.0 * len(text_grams & grams) / (len(text_grams) + len(grams))
+            if similarity > best:
+                best, best_command = similarity, command
+        return best, best_command
+
+    def _respellable(self, span: str, phrase: str, similarity: float) -> bool:
+        """Whether a span of free text may be spelled as the phrase it sounds like"""
+        if similarity < self.strong_similarity:
+            return False
+        if all(word in COMMON_WORDS for word in span.split()):
+            return False
+        # Sound codes skip vowels, so "artist the" codes like "artist"; the spelling
+        # has to be about as long for the span not to swallow a word
+        if not _similar_length(span, phrase):
+            return False
+        return syllables(span) >= 2 and syllables(phrase) >= 2
+
+    def match(self, text: str) -> Tuple[float, str]:
+        """
+        Find the vocabulary in a hypothesis
+
+        Args:
+            text (str): Hypothesis
+
+        Returns:
+            Tuple[float, str]: (share of its words covered by vocabulary phrases, the
+            hypothesis with sound-alike spans spelled as the phrase they match)
+        """
+        words = self._words(text)
+        if not words:
+            return 0.0, text
+
+        with self.lock:
+            if not self.phrases:
+                return 0.0, text
+            joined = " ".join(words)
+            if joined in self.phrase_set:
+                return 1.0, text
+            # A short hypothesis may sound like a whole command
+            command_similarity, command = 0.0, ""
+            if len(words) <= self.max_words:
+                command_similarity, command = self._match_command(joined)
+
+            # covered[i]: most words covered among the first i using non-overlapping spans,
+            # spelled[i]: those words with matched spans replaced by their phrase
+            covered = [0.0] * (len(words) + 1)
+            spelled = [[] for _ in range(len(words) + 1)]
+            for end in range(1, len(words) + 1):
+                covered[end] = covered[end - 1]
+                spelled[end] = spelled[end - 1] + [words[end - 1]]
+                for start in range(max(0, end - self.max_words), end):
+                    span = " ".join(words[start:end])
+                    if span in self.phrase_set:
+                        similarity, phrase = 1.0, span
+                    else:
+                        similarity, index = self._best_match(span)
+                        if index < 0:
+                            continue
+                        phrase = self.phrases[index]
+                        # Sound-alikes that may not be respelled don't count towards the score either
+                        if not self._respellable(span, phrase, similarity):
+                            continue
+                    if covered[start] + similarity * (end - start) > covered[end]:
+                        covered[end] = covered[start] + similarity * (end - start)
+                        spelled[end] = spelled[start] + [phrase]
+        # It is that command unless its own words already spell out vocabulary as well
+        if (command_similarity >= self.min_similarity and command_similarity > covered[-1] / len(words)
+                and _similar_length(joined, command)):
+            return command_similarity, command
+        # Keep the recognizer's own text (punctuation, numbers) unless something was respelled
+        spelled = " ".join(spelled[-1])
+        return covered[-1] / len(words), spelled if spelled != joined else text
+
+    def rerank(self, alternatives: List[str]) -> Tuple[str, int]:
+        """
+        Pick the hypothesis that best fits the vocabulary
+
+        Args:
+            alternatives (List[str]): Hypotheses in the recognizer's order, best first
+
+        Returns:
+            Tuple[str, int]: (chosen hypothesis with vocabulary spelled as indexed,
+            its place in the recognizer's ranking)
+        """
+        started = time.process_time()
+        chosen, chosen_rank, chosen_score = alternatives[0], 0, None
+        for rank, text in enumerate(alternatives):
+            coverage, spelled = self.match(text)
+            score = coverage - rank * self.rank_penalty
+            if chosen_score is None or score > chosen_score:
+                chosen, chosen_rank, chosen_score = spelled, rank, score
+
+        with self.lock:
+            self.stats["queries"] += 1
+            self.stats["alternatives"] += len(alternatives)
+            self.stats["reranked"] += int(chosen_rank > 0)
+            self.stats["corrected"] += int(chosen != alternatives[chosen_rank])
+            self.stats["cpu_seconds"] += time.process_time() - started
+        return chosen, chosen_rank
+
+    def get_stats(self) -> dict:
+        """
+        Get re-ranking statistics
+
+        Returns:
+            dict: Vocabulary size, hypotheses scored, how often a lower-ranked one won
+            and how often sound-alike words were respelled
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats["phrases"] = len(self.phrases)
+        return stats
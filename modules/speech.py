@@ -1,6 +1,15 @@
 import speech_recognition as sr
+import os
+import re
 import time
+import queue
+import threading
 from typing import Optional, Tuple
+from .mic_stream import MicrophoneStream
+from .wake_spotter import WakeWordSpotter, SAMPLE_RATE
+from .asr_backends import ASRMetrics, create_asr_backend
+from .phrase_index import PhraseIndex
+from .echo_guard import EchoSuppressor
 
 class SpeechRecognitionManager:
     """
@@ -20,23 +29,159 @@ class SpeechRecognitionManager:
         self.recognizer.phrase_threshold = rec_settings.get("phrase_threshold", 0.5)  # Increased
         self.recognizer.non_speaking_duration = rec_settings.get("non_speaking_duration", 0.8)  # Increased
         
-        self.language = "en-IN"  # Set to Indian English
-        self.operation_timeout = 30  # Timeout for operations
-        self.phrase_time_limit = 15  # Maximum phrase duration
-        self.adjustment_duration = 1.0  # Duration for ambient noise adjustment
+        self.language = rec_settings.get("language", "en-IN")  # Indian English by default
+        self.operation_timeout = rec_settings.get("operation_timeout", 30)  # Timeout for operations
+        self.phrase_time_limit = rec_settings.get("phrase_time_limit", 15)  # Maximum phrase duration
+        
+        # Speech-to-text engine and its latency metrics
+        self.asr_metrics = ASRMetrics()
+        self.asr = create_asr_backend(config, self.recognizer, self.asr_metrics)
+        # Transcribe commands while they are spoken when the backend can
+        self.streaming = self.asr.streaming and rec_settings.get("asr", {}).get("streaming", True)
+        # Called with each partial hypothesis of a streamed command
+        self.on_partial = None
+        
+        # Adaptive endpointing: a streamed command that already matches a complete command
+        # closes after a short pause instead of the full pause_threshold
+        endpoint_settings = rec_settings.get("endpointing", {})
+        self.endpointing = self.streaming and endpoint_settings.get("enabled", True)
+        self.short_pause = endpoint_settings.get("short_pause", 0.25)
+        self.closed_commands = set()
+        self.endpoint_lock = threading.Lock()
+        self.endpoint_stats = {}
+        self.adjustment_duration = rec_settings.get("adjustment_duration", 1.0)  # Duration for ambient noise adjustment
+        
+        # One microphone stream for the whole session; it calibrates once, or not at all
+        # when a noise profile saved by an earlier session exists for the device
+        profile_settings = rec_settings.get("noise_profile", {})
+        profile_dir = None
+        if profile_settings.get("enabled", True):
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            profile_dir = os.path.join(base_dir, profile_settings.get("dir", "audio_profiles"))
+        self.stream = MicrophoneStream(
+            self.recognizer,
+            calibration_duration=self.adjustment_duration,
+            device_index=rec_settings.get("device_index"),
+            ring_seconds=rec_settings.get("ring_buffer_seconds", 30.0),
+            vad_settings=self._vad_settings(rec_settings.get("vad", {})),
+            profile_dir=profile_dir,
+            profile_save_interval=profile_settings.get("save_interval", 60.0)
+        )
+        # Buffer where the next listen() should start, set when the wake word came without a command
+        self.resume_position = None
         
         # Wake word settings
         self.wake_words = [word.lower() for word in config["assistant_settings"]["wake_words"]]
+        
+        # N-best hypotheses are re-ranked against the known vocabulary; commands are
+        # added by set_command_vocabulary()
+        rerank_settings = rec_settings.get("asr", {}).get("rerank", {})
+        self.phrase_index = None
+        self.base_vocabulary = list(self.wake_words)
+        for apps in config.get("applications", {}).values():
+            self.base_vocabulary.extend(apps)
+        self.base_vocabulary.extend(config.get("urls", {}))
+        if rerank_settings.get("enabled", True):
+            self.phrase_index = PhraseIndex(
+                self.base_vocabulary,
+                commands=self.wake_words,
+                min_similarity=rerank_settings.get("min_similarity", 0.85),
+                strong_similarity=rerank_settings.get("strong_similarity", 0.9),
+                rank_penalty=rerank_settings.get("rank_penalty", 0.1)
+            )
+        
+        # Local wake word spotting, so audio only goes to the cloud after the wake word
+        spot_settings = config["assistant_settings"].get("wake_word_spotting", {})
+        self.spotter = None
+        if spot_settings.get("enabled", True):
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self.spotter = WakeWordSpotter(
+                os.path.join(base_dir, spot_settings.get("template_dir", "wake_words")),
+                threshold=spot_settings.get("threshold"),
+                margin=spot_settings.get("margin", 1.25),
+                min_templates=spot_settings.get("min_templates", 2)
+            )
+            if not self.spotter.ready:
+                print("Not enough wake word recordings enrolled, wake word detection transcribes every phrase. "
+                      "Run enroll_wake_word.py to enable local spotting.")
+        
+        # Transcripts of the assistant's own voice picked up from the speakers are dropped;
+        # AudioManager.on_playback has to be connected to echo.on_playback
+        echo_settings = rec_settings.get("echo_suppression", {})
+        self.echo = None
+        if echo_settings.get("enabled", True):
+            self.echo = EchoSuppressor(
+                window=echo_settings.get("window", 1.0),
+                history=echo_settings.get("history", 15.0),
+                min_similarity=echo_settings.get("min_similarity", 0.6),
+                min_words=echo_settings.get("min_words", 2),
+                min_run=echo_settings.get("min_run", 3)
+            )
+        
+        # Phrases captured elsewhere (e.g. barge-in during playback) waiting to be recognized
+        self.pending_audio = queue.Queue()
+        # Set while listen() or detect_wake_word() is capturing from the microphone
+        self.capturing = False
+        # Cleared while barge-in records a phrase that interrupted playback
+        self.barge_in_idle = threading.Event()
+        self.barge_in_idle.set()
+
+    @staticmethod
+    def _vad_settings(settings: dict) -> Optional[dict]:
+        """VoiceActivityDetector options from the config, None if it is disabled"""
+        if not settings.get("enabled", True):
+            return None
+        return {key: value for key, value in settings.items() if key != "enabled"}
+
+    @staticmethod
+    def _normalize_phrase(text: str) -> str:
+        """Lowercase a phrase and reduce it to single-spaced words"""
+        return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
 
-    def adjust_for_ambient_noise(self, source, duration=None):
-        """Adjust recognition energy threshold based on ambient noise"""
+    def set_command_vocabulary(self, commands, open_ended=()):
+        """
+        Tell the endpointer which commands are complete as soon as they are heard
+        
+        A command that starts another command ("next" / "next song") or starts
+        with an open-ended verb ("play ...") could still go on, so it keeps the
+        normal pause.
+        
+        Args:
+            commands (iterable): Command phrases the router acts on
+            open_ended (iterable): Leading words of commands that take free text
+        """
+        phrases = {self._normalize_phrase(command) for command in commands}
+        phrases.discard("")
+        prefixes = {self._normalize_phrase(word) for word in open_ended}
+        
+        closed = set()
+        for phrase in phrases:
+            words = phrase.split()
+            if words[0] in prefixes:
+                continue
+            if any(other.startswith(phrase + " ") for other in phrases):
+                continue
+            closed.add(phrase)
+        self.closed_commands = closed
+        
+        if self.phrase_index:
+            # Only a transcript that sounds like a whole closed command or wake word is respelled as one
+            self.phrase_index.build(self.base_vocabulary + list(phrases) + list(prefixes),
+                                    commands=list(closed) + self.wake_words)
+
+    def adjust_for_ambient_noise(self, duration=None):
+        """
+        Re-calibrate the energy threshold on the live microphone stream
+        
+        Only needed after a big change in the environment; the threshold
+        otherwise adapts continuously from non-speech frames.
+        """
         if duration is None:
             duration = self.adjustment_duration
             
         try:
-            print("\nAdjusting for ambient noise... Please wait...")
-            self.recognizer.adjust_for_ambient_noise(source, duration=duration)
-            print(f"Energy threshold set to {self.recognizer.energy_threshold}")
+            self.stream.start()
+            self.stream.calibrate(duration)
         except Exception as e:
             print(f"Error adjusting for ambient noise: {e}")
 
@@ -52,6 +197,22 @@ class SpeechRecognitionManager:
                 return command if command else None
         return None
 
+    def _match_wake_word(self, text: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check recognized text for a wake word and a command following it
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (wake_word_detected, command if any)
+        """
+        # Check if wake word is present
+        wake_word_detected = any(word in text for word in self.wake_words)
+        if wake_word_detected:
+            # Check if there's a command after the wake word
+            command = self.extract_command_from_wake_word(text)
+            return True, command
+        
+        return False, None
+
     def detect_wake_word(self) -> Tuple[bool, Optional[str]]:
         """
         Listen for wake word and potential command
@@ -59,42 +220,223 @@ class SpeechRecognitionManager:
         Returns:
             Tuple[bool, Optional[str]]: (wake_word_detected, command if any)
         """
-        with sr.Microphone() as source:
-            try:
-                self.adjust_for_ambient_noise(source)
-                
-                print("\nWaiting for wake word...")
-                audio = self.recognizer.listen(
-                    source,
-                    timeout=None,  # No timeout for wake word detection
-                    phrase_time_limit=self.phrase_time_limit
-                )
-                
-                text = self.recognizer.recognize_google(audio, language=self.language)
-                text = text.lower()
-                print(f"Heard: {text}")
-                
-                # Check if wake word is present
-                wake_word_detected = any(word in text for word in self.wake_words)
-                if wake_word_detected:
-                    # Check if there's a command after the wake word
-                    command = self.extract_command_from_wake_word(text)
-                    return True, command
-                
-                return False, None
-                
-            except sr.WaitTimeoutError:
-                print("No speech detected within timeout period")
-                return False, None
-            except sr.UnknownValueError:
-                print("Could not understand audio")
-                return False, None
-            except sr.RequestError as e:
-                print(f"Could not request results: {e}")
-                return False, None
-            except Exception as e:
-                print(f"Wake word detection error: {e}")
+        had_pending, text = self._recognize_pending()
+        if had_pending:
+            return self._match_wake_word(text) if text else (False, None)
+        
+        try:
+            self.capturing = True
+            
+            print("\nWaiting for wake word...")
+            start, end = self.stream.listen_range(
+                timeout=None,  # No timeout for wake word detection
+                phrase_time_limit=self.phrase_time_limit
+            )
+            audio = self.stream.audio(start, end)
+            
+            if self.spotter and self.spotter.ready:
+                return self._spot_wake_word(audio, start, end)
+            
+            text = self._suppress_echo(self._transcribe(audio), start, end)
+            if text is None:
                 return False, None
+            text = text.lower()
+            print(f"Heard: {text}")
+            
+            detected, command = self._match_wake_word(text)
+            if detected and not command:
+                # Anything said after this phrase is the command
+                self.resume_position = end
+            return detected, command
+            
+        except sr.WaitTimeoutError:
+            print("No speech detected within timeout period")
+            return False, None
+        except sr.UnknownValueError:
+            print("Could not understand audio")
+            return False, None
+        except sr.RequestError as e:
+            print(f"Could not request results: {e}")
+            return False, None
+        except Exception as e:
+            print(f"Wake word detection error: {e}")
+            return False, None
+        finally:
+            self.capturing = False
+
+    def _spot_wake_word(self, audio: sr.AudioData, start: int, end: int) -> Tuple[bool, Optional[str]]:
+        """
+        Check a phrase for the wake word locally and recognize only what follows it
+        
+        Args:
+            audio (sr.AudioData): Captured phrase
+            start (int): Ring buffer index where the phrase starts
+            end (int): Ring buffer index after the phrase
+            
+        Returns:
+            Tuple[bool, Optional[str]]: (wake_word_detected, command if any)
+        """
+        match = self.spotter.spot(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+        if match is None:
+            return False, None
+        
+        word, distance, wake_end = match
+        print(f"Wake word '{word}' detected locally (distance {distance:.2f})")
+        
+        # Whatever follows the wake word is the command, straight from the ring buffer
+        command_start = start + int(wake_end / self.stream.seconds_per_buffer)
+        if self.stream.speech_duration(command_start, end) < self.recognizer.phrase_threshold:
+            # Nothing yet, the next listen() picks up from right after the wake word
+            self.resume_position = command_start
+            return True, None
+        
+        try:
+            text = self._suppress_echo(self._transcribe(self.stream.audio(command_start, end)), command_start, end)
+            if text is None:
+                return True, None
+            print(f"Command: {text}")
+            return True, text.lower()
+        except sr.UnknownValueError:
+            print("Could not understand command after wake word")
+        except sr.RequestError as e:
+            print(f"Could not request results: {e}")
+        return True, None
+
+    def enroll_wake_word(self, word: str) -> Optional[str]:
+        """
+        Record one sample of the wake word for local spotting
+        
+        Args:
+            word (str): Wake word to be spoken
+            
+        Returns:
+            Optional[str]: Path of the saved recording, None if nothing was captured
+        """
+        try:
+            audio = self.stream.listen(timeout=self.operation_timeout, phrase_time_limit=3)
+        except sr.WaitTimeoutError:
+            print("No speech detected within timeout period")
+            return None
+        return self.spotter.enroll(word, audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+
+    def _transcribe(self, audio: sr.AudioData) -> str:
+        """
+        Transcribe a phrase with the configured ASR backend, recording its latency
+        
+        Raises:
+            sr.UnknownValueError: If no speech could be recognized
+            sr.RequestError: If the backend couldn't be reached
+        """
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            if self.phrase_index:
+                text = self._rerank(self.asr.recognize_alternatives(audio))
+            else:
+                text = self.asr.recognize(audio)
+            outcome = "recognized"
+            return text
+        except sr.UnknownValueError:
+            outcome = "unrecognized"
+            raise
+        finally:
+            self.asr_metrics.record(self.asr.name, time.perf_counter() - start, outcome)
+
+    def _rerank(self, alternatives) -> str:
+        """Pick the alternative that best fits the command vocabulary"""
+        text, rank = self.phrase_index.rerank(alternatives)
+        if text != alternatives[0]:
+            print(f"Heard \"{alternatives[0]}\", using alternative {rank + 1}: \"{text}\"")
+        return text
+
+    def get_asr_stats(self) -> dict:
+        """
+        Get speech recognition statistics
+        
+        Returns:
+            dict: Request counts and latencies per ASR backend
+        """
+        return self.asr_metrics.get_stats()
+
+    def get_rerank_stats(self) -> dict:
+        """
+        Get N-best re-ranking statistics
+        
+        Returns:
+            dict: Hypotheses scored and how often they were changed, empty if re-ranking is disabled
+        """
+        return self.phrase_index.get_stats() if self.phrase_index else {}
+
+    def _suppress_echo(self, text: str, start: Optional[int], end: Optional[int]) -> Optional[str]:
+        """
+        Drop the assistant's own voice from a transcript
+        
+        Args:
+            text (str): Recognized text
+            start (int, optional): Ring buffer index where the phrase starts
+            end (int, optional): Ring buffer index after the phrase
+            
+        Returns:
+            Optional[str]: Text the user said, None if it was all echo
+        """
+        if not self.echo or start is None:
+            return text
+        filtered = self.echo.filter(text, *self.stream.time_span(start, end))
+        if filtered is None:
+            print(f"Ignoring my own voice: {text}")
+        elif filtered != text:
+            print(f"Ignoring my own voice at the start of: {text}")
+        return filtered
+
+    def get_echo_stats(self) -> dict:
+        """
+        Get echo suppression statistics
+        
+        Returns:
+            dict: Transcripts checked, dropped and trimmed, empty if suppression is disabled
+        """
+        return self.echo.get_stats() if self.echo else {}
+
+    def submit_audio(self, audio: sr.AudioData, start: Optional[int] = None, end: Optional[int] = None):
+        """
+        Queue an already captured phrase to be recognized by the next listen()
+        
+        Args:
+            audio (sr.AudioData): Captured phrase
+            start (int, optional): Ring buffer index where the phrase starts, for echo suppression
+            end (int, optional): Ring buffer index after the phrase
+        """
+        self.pending_audio.put((audio, start, end))
+
+    def _recognize_pending(self) -> Tuple[bool, Optional[str]]:
+        """
+        Recognize a queued phrase, if there is one
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (whether a phrase was queued, recognized text if any)
+        """
+        # An interrupting phrase still being recorded is queued once the user pauses
+        if not self.barge_in_idle.wait(timeout=self.phrase_time_limit + self.recognizer.pause_threshold + 1.0):
+            print("Interrupted speech is taking too long to capture, listening again")
+        try:
+            audio, start, end = self.pending_audio.get_nowait()
+        except queue.Empty:
+            return False, None
+        
+        try:
+            print("Processing interrupted speech...")
+            text = self._suppress_echo(self._transcribe(audio), start, end)
+            if text is None:
+                return True, None
+            print(f"Command: {text}")
+            return True, text.lower()
+        except sr.UnknownValueError:
+            print("Could not understand audio")
+        except sr.RequestError as e:
+            print(f"Could not request results: {e}")
+        except Exception as e:
+            print(f"Listening error: {e}")
+        return True, None
 
     def listen(self) -> Optional[str]:
         """
@@ -103,34 +445,196 @@ class SpeechRecognitionManager:
         Returns:
             Optional[str]: Recognized text if successful, None otherwise
         """
-        with sr.Microphone() as source:
+        had_pending, text = self._recognize_pending()
+        if had_pending:
+            return text
+        
+        start, self.resume_position = self.resume_position, None
+        try:
+            self.capturing = True
+            
+            print("\nListening...")
+            while True:
+                if self.streaming:
+                    text, (start, end) = self._listen_streaming(start)
+                else:
+                    start, end = self.stream.listen_range(
+                        timeout=self.operation_timeout,
+                        phrase_time_limit=self.phrase_time_limit,
+                        start=start
+                    )
+                    
+                    print("Processing speech...")
+                    text = self._transcribe(self.stream.audio(start, end))
+                text = self._suppress_echo(text, start, end)
+                if text is not None:
+                    break
+                # That was the speakers, keep listening for the user
+                start = end
+            print(f"Command: {text}")
+            return text.lower()
+            
+        except sr.WaitTimeoutError:
+            print("No speech detected within timeout period")
+            return None
+        except sr.UnknownValueError:
+            print("Could not understand audio")
+            return None
+        except sr.RequestError as e:
+            print(f"Could not request results: {e}")
+            return None
+        except Exception as e:
+            print(f"Listening error: {e}")
+            return None
+        finally:
+            self.capturing = False
+
+    def _listen_streaming(self, start=None) -> Tuple[str, Tuple[int, int]]:
+        """
+        Capture a command while it is being transcribed, reporting partial hypotheses
+        
+        Args:
+            start (int, optional): Ring buffer index to start listening from
+            
+        Returns:
+            Tuple[str, Tuple[int, int]]: Final transcript, or the complete command the phrase
+            closed early on, and the ring buffer range it was heard in
+            
+        Raises:
+            sr.WaitTimeoutError: If no speech started within the timeout
+            sr.UnknownValueError: If no speech could be recognized
+        """
+        phrase_start = None
+        asr_stream = None
+        hypothesis = ""
+        last_index = last_speech = None
+        
+        def feed(index, candidate_start, speech):
+            nonlocal phrase_start, asr_stream, hypothesis, last_index, last_speech
+            if candidate_start != phrase_start:
+                # New candidate phrase, the previous one was noise
+                phrase_start = candidate_start
+                asr_stream = self.asr.start_stream(self.stream.sample_rate)
+                hypothesis = ""
+            last_index = index
+            if speech:
+                last_speech = index
+            partial = asr_stream.feed(self.stream.frame(index))
+            if partial:
+                hypothesis = self._normalize_phrase(partial)
+                self._report_partial(partial)
+        
+        def pause_for():
+            if self.endpointing and hypothesis in self.closed_commands:
+                return self.short_pause
+            return None
+        
+        span = self.stream.listen_range(
+            timeout=self.operation_timeout,
+            phrase_time_limit=self.phrase_time_limit,
+            start=start,
+            on_buffer=feed,
+            pause_for=pause_for
+        )
+        
+        # Only the time from end of speech to the final transcript is left to wait for
+        end_of_speech = time.perf_counter()
+        silence = (last_index - last_speech) * self.stream.seconds_per_buffer if last_speech is not None else 0.0
+        if pause_for() is not None:
+            # The endpoint is confirmed on a complete command: hand it over for routing
+            # now and let the decoder finish in the background
+            self._record_endpoint(hypothesis, silence, True)
+            threading.Thread(target=self._drain_stream, args=(asr_stream, end_of_speech), daemon=True).start()
+            return hypothesis, span
+        
+        outcome = "failed"
+        text = ""
+        try:
+            if self.phrase_index:
+                text = self._rerank(asr_stream.finish_alternatives())
+            else:
+                text = asr_stream.finish()
+            outcome = "recognized"
+            return text, span
+        except sr.UnknownValueError:
+            outcome = "unrecognized"
+            raise
+        finally:
+            latency = time.perf_counter() - end_of_speech
+            self.asr_metrics.record(f"{self.asr.name}_streaming", latency, outcome)
+            self._record_endpoint(self._normalize_phrase(text), silence + latency, False)
+
+    def _drain_stream(self, asr_stream, end_of_speech: float):
+        """Finish a stream whose command was already handed over, for the latency statistics"""
+        outcome = "failed"
+        try:
+            asr_stream.finish()
+            outcome = "recognized"
+        except sr.UnknownValueError:
+            outcome = "unrecognized"
+        except Exception as e:
+            print(f"Error finishing speech stream: {e}")
+        finally:
+            self.asr_metrics.record(f"{self.asr.name}_streaming", time.perf_counter() - end_of_speech, outcome)
+
+    def _record_endpoint(self, command: str, delay: float, closed_early: bool):
+        """
+        Record how long a command waited between its last word and its transcript
+        
+        Args:
+            command (str): Normalized final transcript
+            delay (float): Trailing silence captured plus time to the final transcript
+            closed_early (bool): Whether the short pause ended the phrase
+        """
+        key = command if command in self.closed_commands else "open_ended"
+        with self.endpoint_lock:
+            stats = self.endpoint_stats.setdefault(key, {
+                "count": 0,
+                "short_closes": 0,
+                "total_delay": 0.0,
+                "max_delay": 0.0
+            })
+            stats["count"] += 1
+            stats["short_closes"] += int(closed_early)
+            stats["total_delay"] += delay
+            stats["max_delay"] = max(stats["max_delay"], delay)
+
+    def get_endpoint_stats(self) -> dict:
+        """
+        Get end-of-speech delay statistics
+        
+        Returns:
+            dict: Per complete command (everything else under "open_ended"): count, how
+            many closed on the short pause, and average/max seconds from the last word
+            to the final transcript
+        """
+        with self.endpoint_lock:
+            return {
+                command: {
+                    "count": stats["count"],
+                    "short_closes": stats["short_closes"],
+                    "avg_delay": stats["total_delay"] / stats["count"],
+                    "max_delay": stats["max_delay"]
+                }
+                for command, stats in self.endpoint_stats.items()
+            }
+
+    def _report_partial(self, text: str):
+        """Pass a partial hypothesis on to whoever is interested"""
+        if self.on_partial:
             try:
-                self.adjust_for_ambient_noise(source)
-                
-                print("\nListening...")
-                audio = self.recognizer.listen(
-                    source,
-                    timeout=self.operation_timeout,
-                    phrase_time_limit=self.phrase_time_limit
-                )
-                
-                print("Processing speech...")
-                text = self.recognizer.recognize_google(audio, language=self.language)
-                print(f"Command: {text}")
-                return text.lower()
-                
-            except sr.WaitTimeoutError:
-                print("No speech detected within timeout period")
-                return None
-            except sr.UnknownValueError:
-                print("Could not understand audio")
-                return None
-            except sr.RequestError as e:
-                print(f"Could not request results: {e}")
-                return None
+                self.on_partial(text.lower())
             except Exception as e:
-                print(f"Listening error: {e}")
-                return None
+                print(f"Error handling partial result: {e}")
+
+    def get_vad_stats(self) -> dict:
+        """
+        Get voice activity detection statistics
+        
+        Returns:
+            dict: Buffer counts from the detector, empty if it is disabled or not started
+        """
+        return self.stream.vad.get_stats() if self.stream.vad else {}
 
     def toggle_manual_sleep(self):
         """Toggle manual sleep mode"""
@@ -0,0 +1,227 @@
+import re
+import threading
+from typing import List, Optional
+
+# Words that end with a period without ending the sentence
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "vs", "etc", "e.g", "i.e",
+    "eg", "ie", "approx", "dept", "inc", "ltd", "corp", "fig",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+    "a.m", "p.m", "u.s", "u.k", "ph.d"
+}
+
+# Abbreviations that are also ordinary words, only when a number ("No. 5", "Est. 1990")
+# or, for the second set, a name ("St. James") follows
+NUMBER_ABBREVIATIONS = {"no", "est"}
+NAME_ABBREVIATIONS = {"st", "co"}
+
+# Sentence punctuation followed by whitespace, or a line break
+BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+def is_sentence_end(text: str, punctuation_index: int) -> bool:
+    """
+    Decide whether the punctuation at the given index really ends a sentence
+
+    Periods after known abbreviations ("e.g.", "Dr.") and single-letter
+    initials ("J. R. R.") are not treated as boundaries. Words like "no" are
+    abbreviations only before a number or name, so until the next word has
+    arrived they don't end a sentence either.
+
+    Args:
+        text (str): Text containing the punctuation
+        punctuation_index (int): Index of the '.', '!' or '?' character
+
+    Returns:
+        bool: True if the sentence ends here
+    """
+    if text[punctuation_index] != '.':
+        return True
+
+    word_start = punctuation_index
+    while word_start > 0 and not text[word_start - 1].isspace():
+        word_start -= 1
+    word = text[word_start:punctuation_index].lower().strip('("\'')
+
+    if not word:
+        return True
+    if word in ABBREVIATIONS:
+        return False
+    if word in NUMBER_ABBREVIATIONS or word in NAME_ABBREVIATIONS:
+        following = text[punctuation_index + 1:].lstrip()
+        if not following:
+            return False
+        if following[0].isdigit():
+            return False
+        if word in NAME_ABBREVIATIONS and following[0].isupper():
+            return False
+        return True
+    # Initials like "J." but not a lone number like "5."
+    if len(word) == 1 and word.isalpha():
+        return False
+    return True
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences, keeping numbers, URLs and abbreviations intact
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        List[str]: Non-empty sentences in order
+    """
+    sentences = []
+    start = 0
+    for match in BOUNDARY.finditer(text):
+        if match.group().strip('\n') and not is_sentence_end(text, match.start() - 1):
+            continue
+        sentence = text[start:match.start()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+
+    sentence = text[start:].strip()
+    if sentence:
+        sentences.append(sentence)
+    return sentences
+
+def merge_sentences(sentences: List[str], max_chars: int, first_chars: Optional[int] = None) -> List[str]:
+    """
+    Greedily merge consecutive sentences into chunks of bounded length
+
+    Args:
+        sentences (List[str]): Sentences in order
+        max_chars (int): Maximum chunk length; longer sentences are kept whole
+        first_chars (int, optional): Tighter limit for the first chunk so audio starts fast
+
+    Returns:
+        List[str]: Chunks in order
+    """
+    chunks = []
+    current = ""
+    for sentence in sentences:
+        limit = first_chars if (first_chars and not chunks) else max_chars
+        if current and len(current) + 1 + len(sentence) > limit:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class SentenceBoundaryDetector:
+    """
+    Splits incrementally arriving text (e.g. streamed LLM tokens) into complete sentences
+    """
+    def __init__(self):
+        """Initialize the SentenceBoundaryDetector"""
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add text and collect the sentences it completes
+
+        A boundary is only accepted once the character after the punctuation
+        has arrived, so "3." followed later by "5" is not split.
+
+        Args:
+            text (str): Next chunk of text
+
+        Returns:
+            List[str]: Sentences completed by this chunk, in order
+        """
+        if not text:
+            return []
+
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in BOUNDARY.finditer(self.buffer):
+            if match.group().strip('\n') and not is_sentence_end(self.buffer, match.start() - 1):
+                continue
+            sentence = self.buffer[start:match.start()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """
+        Return whatever text is left once the stream has ended
+
+        Returns:
+            Optional[str]: Trailing sentence, None if nothing is left
+        """
+        remainder = self.buffer.strip()
+        self.buffer = ""
+        return remainder or None
+
+
+class TextSegmenter:
+    """
+    Turns response text into synthesis chunks: whole sentences, short ones merged together
+    """
+    def __init__(self, max_chunk_chars=100, first_chunk_chars=60):
+        """
+        Initialize the TextSegmenter
+
+        Args:
+            max_chunk_chars (int): Maximum chunk length (gTTS sends at most 100 characters per request)
+            first_chunk_chars (int): Maximum length of the first chunk of a response
+        """
+        self.max_chunk_chars = max_chunk_chars
+        self.first_chunk_chars = first_chunk_chars
+        self.lock = threading.Lock()
+
+        self.naive_segments = 0
+        self.sentences = 0
+        self.chunks = 0
+
+    def segment(self, text: str, count: bool = True) -> List[str]:
+        """
+        Split text into synthesis chunks
+
+        Args:
+            text (str): Text to be spoken
+            count (bool): Whether to add the text to the statistics; off for text that
+                isn't spoken now, like phrases pre-synthesized into the cache
+
+        Returns:
+            List[str]: Chunks in order
+        """
+        sentences = split_sentences(text)
+        chunks = merge_sentences(sentences, self.max_chunk_chars, self.first_chunk_chars)
+        if not count:
+            return chunks
+        with self.lock:
+            # What splitting on every period used to produce, for comparison
+            self.naive_segments += len([s for s in text.split('.') if s.strip()])
+            self.sentences += len(sentences)
+            self.chunks += len(chunks)
+        return chunks
+
+    def count_merged(self, sentences: int, chunks: int):
+        """Account for sentences merged outside segment(), e.g. from a stream"""
+        with self.lock:
+            self.naive_segments += sentences
+            self.sentences += sentences
+            self.chunks += chunks
+
+    def get_stats(self) -> dict:
+        """
+        Get segmentation statistics
+
+        Returns:
+            dict: Naive period-split segment count, sentence count and chunks produced
+        """
+        with self.lock:
+            return {
+                "naive_segments": self.naive_segments,
+                "sentences": self.sentences,
+                "chunks": self.chunks
+            }
@@ -0,0 +1,348 @@
+import io
+import os
+import time
+import uuid
+import wave
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from gtts import gTTS
+from .tts_cache import TTSCache
+
+class TTSBackend:
+    """
+    Base class for text-to-speech engines used by AudioManager
+    """
+    name = "base"
+    # File extension of the audio produced by synthesize()
+    extension = ".mp3"
+
+    def voice_settings(self) -> dict:
+        """
+        Get the settings that affect the synthesized audio
+
+        Returns:
+            dict: Voice parameters, used as part of the cache key
+        """
+        return {}
+
+    def cache_key(self, text: str) -> str:
+        """Build the audio cache key for text synthesized by this backend"""
+        settings = dict(self.voice_settings(), backend=self.name)
+        return TTSCache.make_key(text, settings.pop("lang", None), settings.pop("tld", None), settings)
+
+    def synthesize(self, text: str) -> bytes:
+        """
+        Convert text to encoded audio
+
+        Args:
+            text (str): Text to be converted to speech
+
+        Returns:
+            bytes: Encoded audio in the backend's format
+        """
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """
+    Google Translate TTS, needs network access
+    """
+    name = "gtts"
+    extension = ".mp3"
+
+    def __init__(self, lang='en', tld='co.in', timeout=5):
+        """
+        Initialize the GTTSBackend
+
+        Args:
+            lang (str): TTS language
+            tld (str): Accent top level domain
+            timeout (float): Network timeout in seconds
+        """
+        self.lang = lang
+        self.tld = tld
+        self.timeout = timeout
+
+    def voice_settings(self) -> dict:
+        """Get the settings that affect the synthesized audio"""
+        return {"lang": self.lang, "tld": self.tld}
+
+    def synthesize(self, text: str) -> bytes:
+        """Convert text to MP3 audio through gTTS"""
+        buffer = io.BytesIO()
+        tts = gTTS(text=text, lang=self.lang, tld=self.tld, timeout=self.timeout)
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class Pyttsx3Backend(TTSBackend):
+    """
+    Offline engine through pyttsx3 (SAPI5 on Windows, espeak on Linux)
+    """
+    name = "pyttsx3"
+    extension = ".wav"
+
+    def __init__(self, temp_dir, rate=175, volume=1.0, voice_id=None):
+        """
+        Initialize the Pyttsx3Backend
+
+        Args:
+            temp_dir (str): Directory for the engine's intermediate files
+            rate (int): Speech rate in words per minute
+            volume (float): Engine volume between 0 and 1
+            voice_id (str, optional): Voice id, name or language to look for
+        """
+        import pyttsx3
+
+        self.temp_dir = temp_dir
+        self.rate = rate
+        self.volume = volume
+        # SAPI5 (COM) and NSSpeechSynthesizer only work on the thread that created the
+        # engine, so one thread owns it and runs every call made to it
+        self.engine_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyttsx3")
+        self.engine = None
+        self.voice = self.engine_thread.submit(self._init_engine, pyttsx3, voice_id).result()
+
+    def _init_engine(self, pyttsx3, voice_id):
+        """Create and configure the engine; runs on the engine thread"""
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', self.rate)
+        self.engine.setProperty('volume', self.volume)
+        return self._select_voice(voice_id)
+
+    def _select_voice(self, voice_id):
+        """Pick the installed voice matching voice_id, if any"""
+        if not voice_id:
+            return None
+
+        wanted = voice_id.lower().replace('_', '-')
+        for voice in self.engine.getProperty('voices'):
+            languages = [
+                (lang.decode('utf-8', 'ignore') if isinstance(lang, bytes) else str(lang)).lower()
+                for lang in (getattr(voice, 'languages', None) or [])
+            ]
+            candidates = [str(voice.id).lower(), str(voice.name).lower()] + languages
+            if any(wanted in candidate for candidate in candidates):
+                self.engine.setProperty('voice', voice.id)
+                return voice.id
+        return None
+
+    def voice_settings(self) -> dict:
+        """Get the settings that affect the synthesized audio"""
+        return {"lang": self.voice, "rate": self.rate, "volume": self.volume}
+
+    def _render(self, text: str, filepath: str):
+        """Render text to a WAV file; runs on the engine thread"""
+        self.engine.save_to_file(text, filepath)
+        self.engine.runAndWait()
+
+    def synthesize(self, text: str) -> bytes:
+        """Convert text to WAV audio with the local engine"""
+        # pyttsx3 can only render to a file
+        filepath = os.path.join(self.temp_dir, f'pyttsx3_{uuid.uuid4()}.wav')
+        try:
+            # Synthesis workers queue up on the engine thread, which also serializes them
+            self.engine_thread.submit(self._render, text, filepath).result()
+            with open(filepath, 'rb') as f:
+                return f.read()
+        finally:
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+
+class NullBackend(TTSBackend):
+    """
+    Produces silence without any engine, for tests and benchmarks on headless machines
+    """
+    name = "null"
+    extension = ".wav"
+
+    def __init__(self, sample_rate=16000, seconds_per_char=0.0, latency=0.0):
+        """
+        Initialize the NullBackend
+
+        Args:
+            sample_rate (int): Sample rate of the produced WAV
+            seconds_per_char (float): Length of silence generated per character of text
+            latency (float): Artificial synthesis delay in seconds
+        """
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self.latency = latency
+
+    def voice_settings(self) -> dict:
+        """Get the settings that affect the synthesized audio"""
+        return {"sample_rate": self.sample_rate, "seconds_per_char": self.seconds_per_char}
+
+    def synthesize(self, text: str) -> bytes:
+        """Return a silent WAV clip"""
+        if self.latency:
+            time.sleep(self.latency)
+        frames = int(len(text) * self.seconds_per_char * self.sample_rate)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as clip:
+            clip.setnchannels(1)
+            clip.setsampwidth(2)
+            clip.setframerate(self.sample_rate)
+            clip.writeframes(b'\x00\x00' * frames)
+        return buffer.getvalue()
+
+
+class TTSBackendSelector:
+    """
+    Picks a TTS backend per request, tracking latency and failing over when one is slow or down
+    """
+    def __init__(self, backends: List[TTSBackend], slow_threshold=2.5, cooldown=60, smoothing=0.3):
+        """
+        Initialize the TTSBackendSelector
+
+        Args:
+            backends (List[TTSBackend]): Backends in order of preference
+            slow_threshold (float): Synthesis time in seconds above which a backend is demoted
+            cooldown (float): Seconds a slow or failing backend is skipped before it is retried
+            smoothing (float): Weight of the newest sample in the latency moving average
+        """
+        if not backends:
+            raise ValueError("At least one TTS backend is required")
+
+        self.backends = backends
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.stats = {
+            backend.name: {
+                "requests": 0,
+                "failures": 0,
+                "avg_latency": None,
+                "last_latency": None,
+                "demoted_until": 0.0
+            }
+            for backend in backends
+        }
+
+    def ordered_backends(self) -> List[TTSBackend]:
+        """
+        Get backends in the order they should be tried right now
+
+        Returns:
+            List[TTSBackend]: Healthy backends by preference, then demoted ones
+        """
+        now = time.monotonic()
+        with self.lock:
+            healthy = [b for b in self.backends if self.stats[b.name]["demoted_until"] <= now]
+            demoted = sorted(
+                (b for b in self.backends if self.stats[b.name]["demoted_until"] > now),
+                key=lambda b: self.stats[b.name]["demoted_until"]
+            )
+        return healthy + demoted
+
+    def _record(self, backend, latency=None, failed=False):
+        """Update a backend's latency statistics and health"""
+        with self.lock:
+            stats = self.stats[backend.name]
+            stats["requests"] += 1
+            if failed:
+                stats["failures"] += 1
+                stats["demoted_until"] = time.monotonic() + self.cooldown
+                return
+
+            stats["last_latency"] = latency
+            if stats["avg_latency"] is None:
+                stats["avg_latency"] = latency
+            else:
+                stats["avg_latency"] += self.smoothing * (latency - stats["avg_latency"])
+            if stats["avg_latency"] > self.slow_threshold:
+                stats["demoted_until"] = time.monotonic() + self.cooldown
+            else:
+                stats["demoted_until"] = 0.0
+
+    def synthesize(self, text: str) -> Tuple[bytes, TTSBackend]:
+        """
+        Synthesize text with the best available backend, falling back on failure
+
+        Args:
+            text (str): Text to be converted to speech
+
+        Returns:
+            Tuple[bytes, TTSBackend]: Encoded audio and the backend that produced it
+        """
+        last_error: Optional[Exception] = None
+        for backend in self.ordered_backends():
+            start = time.perf_counter()
+            try:
+                data = backend.synthesize(text)
+            except Exception as e:
+                print(f"TTS backend {backend.name} failed: {e}")
+                self._record(backend, failed=True)
+                last_error = e
+                continue
+            self._record(backend, time.perf_counter() - start)
+            return data, backend
+
+        raise RuntimeError(f"All TTS backends failed: {last_error}")
+
+    def get_stats(self) -> dict:
+        """
+        Get per-backend latency statistics
+
+        Returns:
+            dict: Request and failure counts, latencies and demotion state per backend
+        """
+        now = time.monotonic()
+        with self.lock:
+            return {
+                name: dict(
+                    {k: v for k, v in stats.items() if k != "demoted_until"},
+                    demoted=stats["demoted_until"] > now
+                )
+                for name, stats in self.stats.items()
+            }
+
+
+def create_tts_backends(config, temp_dir) -> List[TTSBackend]:
+    """
+    Build the configured TTS backends, skipping ones that can't be initialized
+
+    Args:
+        config (dict): Full configuration dictionary
+        temp_dir (str): Directory for intermediate files
+
+    Returns:
+        List[TTSBackend]: Backends in order of preference
+    """
+    voice_settings = config["assistant_settings"]["voice_settings"]
+    tts_settings = config.get("audio_settings", {}).get("tts", {})
+
+    backends = []
+    for name in tts_settings.get("backends", ["gtts", "pyttsx3"]):
+        try:
+            if name == "gtts":
+                backends.append(GTTSBackend(
+                    lang=tts_settings.get("lang", "en"),
+                    tld=tts_settings.get("tld", "co.in"),
+                    timeout=tts_settings.get("timeout", 5)
+                ))
+            elif name == "pyttsx3":
+                backends.append(Pyttsx3Backend(
+                    temp_dir,
+                    rate=voice_settings.get("rate", 175),
+                    volume=voice_settings.get("volume", 1.0),
+                    voice_id=voice_settings.get("voice_id")
+                ))
+            elif name == "null":
+                backends.append(NullBackend(
+                    seconds_per_char=tts_settings.get("null_seconds_per_char", 0.0)
+                ))
+            else:
+                print(f"Unknown TTS backend: {name}")
+        except Exception as e:
+            print(f"Couldn't initialize TTS backend {name}: {e}")
+
+    if not backends:
+        print("No TTS backend available, falling back to silent output")
+        backends.append(NullBackend())
+    return backends
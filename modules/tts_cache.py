@@ -0,0 +1,297 @@
+import os
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+class TTSCache:
+    """
+    Persistent, content-addressed cache of synthesized speech clips with a size budget
+    """
+    def __init__(self, cache_dir, max_size_mb=50, extensions=('.mp3', '.wav')):
+        """
+        Initialize the TTSCache
+
+        Args:
+            cache_dir (str): Directory where cached clips are stored
+            max_size_mb (float): Size budget for the cache in megabytes
+            extensions (tuple): File extensions of cached clips, the first is the default
+        """
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.extensions = tuple(extensions)
+        self.lock = threading.Lock()
+
+        # Least recently used entries first: key -> (size in bytes, extension)
+        self.entries = OrderedDict()
+        self.total_size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files already on disk"""
+        found = []
+        for filename in os.listdir(self.cache_dir):
+            filepath = os.path.join(self.cache_dir, filename)
+            key, extension = os.path.splitext(filename)
+            if extension not in self.extensions:
+                # Leftovers from interrupted writes
+                if filename.startswith('.tmp'):
+                    try:
+                        os.remove(filepath)
+                    except OSError:
+                        pass
+                continue
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, key, stat.st_size, extension))
+
+        for _, key, size, extension in sorted(found):
+            self.entries[key] = (size, extension)
+            self.total_size += size
+
+        self._evict()
+
+    @staticmethod
+    def make_key(text, lang, tld, settings=None):
+        """
+        Build the cache key for a phrase
+
+        Args:
+            text (str): Text that is synthesized
+            lang (str): TTS language
+            tld (str): TTS accent top level domain
+            settings (dict, optional): Any other voice settings affecting the output
+
+        Returns:
+            str: Hex digest identifying the clip
+        """
+        payload = json.dumps(
+            {"text": text.strip(), "lang": lang, "tld": tld, "settings": settings or {}},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path_for(self, key, extension=None):
+        """Get the file path of a cache entry"""
+        if extension is None:
+            extension = self.entries[key][1] if key in self.entries else self.extensions[0]
+        return os.path.join(self.cache_dir, key + extension)
+
+    def get(self, key):
+        """
+        Look up a cached clip and mark it as recently used
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[str]: Path to the cached clip, None on a miss
+        """
+        return self.lookup([key])
+
+    def lookup(self, keys):
+        """
+        Look up the first cached clip among candidate keys, counting a single hit or miss
+
+        Args:
+            keys (list): Cache keys in order of preference
+
+        Returns:
+            Optional[str]: Path to the cached clip, None on a miss
+        """
+        with self.lock:
+            for key in keys:
+                if key not in self.entries:
+                    continue
+                filepath = self._path_for(key)
+                if not os.path.exists(filepath):
+                    # File disappeared behind our back
+                    self.total_size -= self.entries.pop(key)[0]
+                    continue
+                self.entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    os.utime(filepath, None)
+                except OSError:
+                    pass
+                return filepath
+
+            self.misses += 1
+            return None
+
+    def contains(self, key):
+        """Check for an entry without touching counters or LRU order"""
+        with self.lock:
+            return key in self.entries and os.path.exists(self._path_for(key))
+
+    def store_file(self, key, source_path):
+        """
+        Move a fully written clip into the cache
+
+        Args:
+            key (str): Cache key
+            source_path (str): Path of the synthesized clip; it is moved, not copied
+
+        Returns:
+            Optional[str]: Path to the cached clip, None if it couldn't be stored
+        """
+        extension = os.path.splitext(source_path)[1]
+        if extension not in self.extensions:
+            return None
+        filepath = self._path_for(key, extension)
+        try:
+            size = os.path.getsize(source_path)
+            if size > self.max_size:
+                return None
+            # Same-filesystem rename is atomic, so readers never see a partial clip
+            os.replace(source_path, filepath)
+        except OSError as e:
+            print(f"Couldn't store clip in audio cache: {e}")
+            return None
+
+        self._register(key, size, extension)
+        return filepath
+
+    def store_bytes(self, key, data, extension=None):
+        """
+        Atomically write a clip held in memory into the cache
+
+        Args:
+            key (str): Cache key
+            data (bytes): Encoded audio clip
+            extension (str, optional): File extension matching the clip format
+
+        Returns:
+            Optional[str]: Path to the cached clip, None if it couldn't be stored
+        """
+        extension = extension or self.extensions[0]
+        if len(data) > self.max_size or extension not in self.extensions:
+            return None
+
+        filepath = self._path_for(key, extension)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, filepath)
+        except OSError as e:
+            print(f"Couldn't store clip in audio cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        self._register(key, len(data), extension)
+        return filepath
+
+    def read(self, key):
+        """
+        Look up a cached clip and load it into memory
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[bytes]: Encoded audio clip, None on a miss
+        """
+        filepath = self.get(key)
+        if not filepath:
+            return None
+        try:
+            with open(filepath, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _register(self, key, size, extension):
+        """Account for a newly written entry and enforce the size budget"""
+        with self.lock:
+            if key in self.entries:
+                self.total_size -= self.entries.pop(key)[0]
+            self.entries[key] = (size, extension)
+            self.total_size += size
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its budget"""
+        skipped = []
+        while self.total_size > self.max_size and self.entries:
+            key, entry = self.entries.popitem(last=False)
+            size = entry[0]
+            try:
+                os.remove(self._path_for(key, entry[1]))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Probably still open by the mixer, try again on the next eviction
+                skipped.append((key, entry))
+                self.total_size -= size
+                continue
+            self.total_size -= size
+            self.evictions += 1
+
+        for key, entry in reversed(skipped):
+            self.entries[key] = entry
+            self.entries.move_to_end(key, last=False)
+            self.total_size += entry[0]
+
+    def expire(self, max_age):
+        """
+        Remove entries that haven't been used for a while
+
+        Args:
+            max_age (float): Seconds since last use after which an entry is removed
+
+        Returns:
+            dict: Number of entries and bytes removed
+        """
+        removed = {"entries": 0, "bytes": 0}
+        cutoff = time.time() - max_age
+        with self.lock:
+            # Least recently used first, stop at the first entry that is still fresh
+            for key in list(self.entries):
+                size, extension = self.entries[key]
+                filepath = self._path_for(key, extension)
+                try:
+                    if os.path.getmtime(filepath) > cutoff:
+                        break
+                    os.remove(filepath)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                del self.entries[key]
+                self.total_size -= size
+                removed["entries"] += 1
+                removed["bytes"] += size
+        return removed
+
+    def get_stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Hit/miss counters and current usage
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "size_bytes": self.total_size,
+                "max_size_bytes": self.max_size
+            }
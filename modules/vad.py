@@ -0,0 +1,214 @@
+import math
+import threading
+import numpy as np
+
+class VoiceActivityDetector:
+    """
+    Frame-level voice activity detection on 16-bit PCM
+
+    Each captured buffer is cut into short analysis frames that are scored
+    together: a frame counts as speech when it is loud enough, not noise-like
+    (spectral flatness) and not dominated by hiss or clicks (zero-crossing
+    rate). A small state machine then requires a short run of speech to
+    trigger and holds the decision through brief gaps between words.
+
+    Once a noise spectrum has been learned from non-speech buffers, it is
+    subtracted before energy and flatness are measured, so only sound above
+    the learned noise can count as speech. A tonal hum or fan that starts
+    later passes the flatness test, but no voice keeps the same spectrum for
+    long: "speech" that stays stationary for stationary_duration is learned
+    as noise instead.
+    """
+    def __init__(self, sample_rate, buffer_duration, frame_duration=0.016, max_flatness=0.3,
+                 max_zcr_rate=5000.0, min_voiced_fraction=0.3, attack_duration=0.05,
+                 hangover_duration=0.2, over_subtraction=2.0, stationary_duration=3.0,
+                 stationary_tolerance=1.0):
+        """
+        Initialize the VoiceActivityDetector
+
+        Args:
+            sample_rate (int): Sample rate of the audio
+            buffer_duration (float): Duration of each buffer passed to update()
+            frame_duration (float): Analysis frame length in seconds
+            max_flatness (float): Frames flatter than this (fans, hiss) aren't speech
+            max_zcr_rate (float): Frames with more zero crossings per second aren't speech
+            min_voiced_fraction (float): Share of a buffer's frames that must be speech
+            attack_duration (float): Speech needed before the detector switches on
+            hangover_duration (float): Silence needed before it switches off again
+            over_subtraction (float): Multiple of the noise spectrum taken off each frame;
+                a frame's noise varies around the average, so taking off just the average
+                leaves part of it
+            stationary_duration (float): Seconds of unchanging "speech" after which it is
+                taken for noise
+            stationary_tolerance (float): Mean change of the log spectrum between buffers
+                below which the sound counts as unchanging
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = max(32, int(sample_rate * frame_duration))
+        self.max_flatness = max_flatness
+        self.max_zcr = max_zcr_rate * self.frame_length / sample_rate
+        self.min_voiced_fraction = min_voiced_fraction
+        self.attack_buffers = max(1, int(math.ceil(attack_duration / buffer_duration)))
+        self.hangover_buffers = max(0, int(math.ceil(hangover_duration / buffer_duration)))
+        self.over_subtraction = over_subtraction
+        self.stationary_buffers = max(1, int(math.ceil(stationary_duration / buffer_duration)))
+        self.stationary_tolerance = stationary_tolerance
+
+        # Average noise power per bin, learned from buffers that aren't speech
+        self.noise_spectrum = None
+        self.last_spectrum = None
+
+        # Hangover state machine
+        self.active = False
+        self.run = 0
+        self.silence = 0
+
+        # Slowly following log spectrum, and how many buffers in a row stayed close to it
+        self.reference_spectrum = None
+        self.stationary_run = 0
+
+        self.lock = threading.Lock()
+        self.stats = {
+            "buffers": 0,
+            "loud_buffers": 0,
+            "voiced_buffers": 0,
+            "noise_rejected": 0,
+            "stationary_rejected": 0
+        }
+
+    def frame_features(self, samples: np.ndarray):
+        """
+        Score every analysis frame of a stretch of audio at once
+
+        Args:
+            samples (np.ndarray): int16 samples; a trailing partial frame is ignored
+
+        Returns:
+            tuple: (rms energy above the learned noise, zero crossings, spectral flatness)
+            arrays, one value per frame
+        """
+        count = len(samples) // self.frame_length
+        frames = samples[:count * self.frame_length].reshape(count, self.frame_length).astype(np.float32)
+        frames -= frames.mean(axis=1, keepdims=True)
+
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        crossings = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1)
+
+        power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+        self.last_spectrum = power.mean(axis=0)
+        noise = self.noise_spectrum
+        if noise is not None and noise.shape == self.last_spectrum.shape:
+            total = power.sum(axis=1) + 1e-10
+            power = np.maximum(power - self.over_subtraction * noise, 0.0)
+            # Scale the energy down to the share of the frame's power above the noise
+            energy = energy * np.sqrt(power.sum(axis=1) / total)
+        power = np.maximum(power, 0.0) + 1e-10
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return energy, crossings, flatness
+
+    def is_voiced(self, samples: np.ndarray, energy_threshold: float) -> bool:
+        """
+        Decide whether a buffer holds speech, without the hangover smoothing
+
+        Args:
+            samples (np.ndarray): int16 samples of one buffer
+            energy_threshold (float): Minimum rms energy for speech
+
+        Returns:
+            bool: True if enough of the buffer's frames look like speech
+        """
+        energy, crossings, flatness = self.frame_features(samples)
+        if not len(energy):
+            return False
+        loud = energy > energy_threshold
+        speech = loud & (flatness < self.max_flatness) & (crossings < self.max_zcr)
+        voiced = np.count_nonzero(speech) >= self.min_voiced_fraction * len(speech)
+
+        with self.lock:
+            self.stats["buffers"] += 1
+            if loud.any():
+                self.stats["loud_buffers"] += 1
+                if not voiced:
+                    self.stats["noise_rejected"] += 1
+        return voiced
+
+    def update(self, samples: np.ndarray, energy_threshold: float) -> bool:
+        """
+        Classify the next buffer of a continuous stream
+
+        Args:
+            samples (np.ndarray): int16 samples of one buffer
+            energy_threshold (float): Minimum rms energy for speech
+
+        Returns:
+            bool: True while speech is active, including the hangover after it
+        """
+        voiced = self.is_voiced(samples, energy_threshold)
+        if self._stationary() and voiced:
+            # No voice holds one spectrum this long, it is a hum or a fan: learn it as noise
+            voiced = False
+            self.update_noise(smoothing=0.2)
+            with self.lock:
+                self.stats["stationary_rejected"] += 1
+        if voiced:
+            self.run += 1
+            self.silence = 0
+            if self.run >= self.attack_buffers:
+                self.active = True
+        else:
+            self.run = 0
+            self.silence += 1
+            if self.silence > self.hangover_buffers:
+                self.active = False
+
+        if self.active:
+            with self.lock:
+                self.stats["voiced_buffers"] += 1
+        return self.active
+
+    def _stationary(self) -> bool:
+        """Whether the last scored buffer continues an unchanging sound of stationary_duration"""
+        if self.last_spectrum is None:
+            return False
+        spectrum = np.log(self.last_spectrum + 1e-10)
+        reference = self.reference_spectrum
+        if (reference is not None and reference.shape == spectrum.shape
+                and np.mean(np.abs(spectrum - reference)) < self.stationary_tolerance):
+            self.stationary_run += 1
+            reference += 0.1 * (spectrum - reference)
+        else:
+            self.reference_spectrum = spectrum
+            self.stationary_run = 0
+        return self.stationary_run >= self.stationary_buffers
+
+    def update_noise(self, smoothing=0.05):
+        """
+        Fold the last scored buffer into the noise spectrum; call it only for non-speech
+
+        Args:
+            smoothing (float): Weight of the new buffer in the moving average
+        """
+        if self.last_spectrum is None:
+            return
+        if self.noise_spectrum is None or self.noise_spectrum.shape != self.last_spectrum.shape:
+            self.noise_spectrum = self.last_spectrum.copy()
+        else:
+            self.noise_spectrum += smoothing * (self.last_spectrum - self.noise_spectrum)
+
+    def reset(self):
+        """Forget the current speech state"""
+        self.active = False
+        self.run = 0
+        self.silence = 0
+
+    def get_stats(self) -> dict:
+        """
+        Get detection statistics
+
+        Returns:
+            dict: Buffers seen, buffers above the energy threshold, buffers
+            classified as speech, loud buffers rejected as noise and voiced
+            buffers rejected for staying stationary too long
+        """
+        with self.lock:
+            return dict(self.stats)
@@ -0,0 +1,327 @@
+import os
+import time
+import wave
+import threading
+from typing import Optional, Tuple
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Triangular mel filters mapping an FFT power spectrum to mel bands"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mels = np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mels) / sample_rate).astype(int)
+
+    filters = np.zeros((n_mels, n_fft // 2 + 1))
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            filters[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            filters[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return filters
+
+def _dct_matrix(n_mels: int, n_coefficients: int) -> np.ndarray:
+    """Orthonormal DCT-II basis used to turn log mel energies into cepstra"""
+    n = np.arange(n_mels)
+    k = np.arange(n_coefficients)[:, None]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+
+class MFCCExtractor:
+    """
+    Computes mean-normalized MFCC features from 16-bit mono PCM
+    """
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_duration=0.025, hop_duration=0.010,
+                 n_mels=26, n_coefficients=13, speech_ratio=0.4):
+        """
+        Initialize the MFCCExtractor
+
+        Args:
+            sample_rate (int): Sample rate of the PCM passed to extract()
+            frame_duration (float): Analysis window in seconds
+            hop_duration (float): Step between windows in seconds
+            n_mels (int): Number of mel bands
+            n_coefficients (int): Cepstral coefficients kept per frame
+            speech_ratio (float): Position between the noise floor and the peak log energy
+                above which a frame counts as speech
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_duration)
+        self.hop_length = int(sample_rate * hop_duration)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.window = np.hamming(self.frame_length)
+        self.filters = _mel_filterbank(sample_rate, self.n_fft, n_mels)
+        self.dct = _dct_matrix(n_mels, n_coefficients)
+        self.speech_ratio = speech_ratio
+
+    def extract(self, pcm: bytes, trim: bool = False) -> np.ndarray:
+        """
+        Compute MFCC frames
+
+        Args:
+            pcm (bytes): 16-bit mono PCM at the extractor's sample rate
+            trim (bool): Drop the quiet frames before and after the speech
+
+        Returns:
+            np.ndarray: (frames, coefficients) array, empty if the audio is too short
+        """
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype=np.int16).astype(np.float32)
+        if len(samples) < self.frame_length:
+            return np.empty((0, self.dct.shape[0]), dtype=np.float32)
+
+        emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+        count = 1 + (len(emphasized) - self.frame_length) // self.hop_length
+        index = np.arange(self.frame_length)[None, :] + self.hop_length * np.arange(count)[:, None]
+        frames = emphasized[index] * self.window
+
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2 / self.n_fft
+        log_mel = np.log(power @ self.filters.T + 1e-10)
+        features = log_mel @ self.dct.T
+
+        # Frames well above the quietest ones count as speech
+        log_energy = np.log(power.sum(axis=1) + 1e-10)
+        floor = np.percentile(log_energy, 10)
+        speech = log_energy >= floor + self.speech_ratio * (log_energy.max() - floor)
+        # Cepstral mean normalization removes the microphone's channel colouring; taking
+        # the mean over speech only keeps it the same however much silence surrounds a word
+        features = features - features[speech].mean(axis=0)
+        if trim:
+            voiced = np.flatnonzero(speech)
+            features = features[voiced[0]:voiced[-1] + 1]
+        return features.astype(np.float32)
+
+
+def subsequence_dtw(template: np.ndarray, features: np.ndarray) -> Tuple[float, int]:
+    """
+    Find where a template best matches anywhere inside a longer feature sequence
+
+    The template may start and end at any frame of the sequence, so a wake word
+    at the start, middle or end of a phrase is found. Cells are filled one
+    anti-diagonal at a time since each only depends on the two before it.
+
+    Args:
+        template (np.ndarray): (n, d) template features
+        features (np.ndarray): (m, d) features to search
+
+    Returns:
+        Tuple[float, int]: (distance per template frame, index of the frame after the match)
+    """
+    n, m = len(template), len(features)
+    if n == 0 or m == 0:
+        return float("inf"), 0
+
+    # Euclidean frame-to-frame distances
+    cost = np.sqrt(np.maximum(
+        (template ** 2).sum(axis=1)[:, None] + (features ** 2).sum(axis=1)[None, :]
+        - 2.0 * template @ features.T, 0.0))
+
+    # Row 0 is free so the match may begin at any frame
+    total = np.full((n + 1, m + 1), np.inf, dtype=np.float64)
+    total[0, :] = 0.0
+    for k in range(2, n + m + 1):
+        i = np.arange(max(1, k - m), min(n, k - 1) + 1)
+        j = k - i
+        best = np.minimum(np.minimum(total[i - 1, j - 1], total[i - 1, j]), total[i, j - 1])
+        total[i, j] = cost[i - 1, j - 1] + best
+
+    end = int(np.argmin(total[n, 1:]))
+    return float(total[n, end + 1] / n), end + 1
+
+
+class WakeWordSpotter:
+    """
+    Local keyword spotting against enrolled wake word recordings
+
+    Each enrollment recording becomes an MFCC template. A phrase is accepted
+    when its closest template match is within the threshold, which by default
+    is derived from how far the enrolled recordings are from each other.
+    """
+    def __init__(self, template_dir, threshold=None, margin=1.25, min_templates=2):
+        """
+        Initialize the WakeWordSpotter
+
+        Args:
+            template_dir (str): Folder with one sub-folder of WAV recordings per wake word
+            threshold (float, optional): Fixed acceptance distance, calibrated from the templates if None
+            margin (float): Multiplier on the calibrated distance between enrolled recordings
+            min_templates (int): Recordings of a wake word needed before it is spotted
+        """
+        self.template_dir = template_dir
+        self.fixed_threshold = threshold
+        self.margin = margin
+        self.min_templates = min_templates
+        self.extractor = MFCCExtractor()
+        self.lock = threading.Lock()
+
+        # (wake word, features)
+        self.templates = []
+        # Wake words with at least min_templates recordings; only these are spotted
+        self.words = set()
+        self.threshold = threshold
+        self.stats = {
+            "phrases": 0,
+            "accepted": 0,
+            "rejected": 0,
+            "audio_seconds": 0.0,
+            "cpu_seconds": 0.0
+        }
+        self.load()
+
+    @property
+    def ready(self) -> bool:
+        """True once some wake word has enough recordings and an acceptance distance to spot locally"""
+        return bool(self.words) and self.threshold is not None
+
+    def load(self):
+        """(Re)load every enrolled recording from the template folder"""
+        templates = []
+        if os.path.isdir(self.template_dir):
+            for word in sorted(os.listdir(self.template_dir)):
+                word_dir = os.path.join(self.template_dir, word)
+                if not os.path.isdir(word_dir):
+                    continue
+                for filename in sorted(os.listdir(word_dir)):
+                    if not filename.lower().endswith(".wav"):
+                        continue
+                    try:
+                        pcm = read_wav(os.path.join(word_dir, filename))
+                    except (OSError, wave.Error, ValueError) as e:
+                        print(f"Couldn't load wake word recording {filename}: {e}")
+                        continue
+                    features = self.extractor.extract(pcm, trim=True)
+                    if len(features):
+                        templates.append((word, features))
+
+        counts = {}
+        for word, _ in templates:
+            counts[word] = counts.get(word, 0) + 1
+        words = {word for word, count in counts.items() if count >= self.min_templates}
+        templates = [(word, features) for word, features in templates if word in words]
+
+        with self.lock:
+            self.templates = templates
+            self.words = words
+            self.threshold = self.fixed_threshold or self._calibrate()
+
+    def _calibrate(self) -> Optional[float]:
+        """Acceptance distance: the worst match between recordings of the same word, plus a margin"""
+        worst = 0.0
+        for index, (word, features) in enumerate(self.templates):
+            for other_word, other in self.templates[index + 1:]:
+                if other_word != word:
+                    continue
+                # Search the longer recording so the shorter one fits inside it
+                template, search = (features, other) if len(features) <= len(other) else (other, features)
+                worst = max(worst, subsequence_dtw(template, search)[0])
+        return worst * self.margin if worst else None
+
+    def enroll(self, word: str, pcm: bytes) -> str:
+        """
+        Save a wake word recording and add it to the templates
+
+        Args:
+            word (str): Wake word spoken in the recording
+            pcm (bytes): 16-bit mono PCM at 16 kHz
+
+        Returns:
+            str: Path of the saved recording
+        """
+        word_dir = os.path.join(self.template_dir, word.lower())
+        os.makedirs(word_dir, exist_ok=True)
+        path = os.path.join(word_dir, f"{int(time.time() * 1000)}.wav")
+        write_wav(path, pcm)
+        self.load()
+        return path
+
+    def spot(self, pcm: bytes) -> Optional[Tuple[str, float, float]]:
+        """
+        Look for an enrolled wake word in a phrase
+
+        Args:
+            pcm (bytes): 16-bit mono PCM at 16 kHz
+
+        Returns:
+            Optional[Tuple[str, float, float]]: (wake word, distance, seconds into the
+            phrase where the wake word ends), None if no wake word was found
+        """
+        started = time.process_time()
+        features = self.extractor.extract(pcm)
+
+        with self.lock:
+            templates = list(self.templates)
+            threshold = self.threshold
+
+        best = None
+        for word, template in templates:
+            distance, end = subsequence_dtw(template, features)
+            if best is None or distance < best[1]:
+                best = (word, distance, end)
+
+        accepted = best is not None and threshold is not None and best[1] <= threshold
+        with self.lock:
+            self.stats["phrases"] += 1
+            self.stats["accepted" if accepted else "rejected"] += 1
+            self.stats["audio_seconds"] += len(pcm) / 2 / SAMPLE_RATE
+            self.stats["cpu_seconds"] += time.process_time() - started
+
+        if not accepted:
+            return None
+        word, distance, end = best
+        # Feature frame i covers samples starting at i * hop
+        return word, distance, (end - 1) * self.extractor.hop_length / SAMPLE_RATE + \
+            self.extractor.frame_length / SAMPLE_RATE
+
+    def get_stats(self) -> dict:
+        """
+        Get spotting statistics
+
+        Returns:
+            dict: Phrase counts, accept/reject counts, threshold and CPU time per second of audio
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats["templates"] = len(self.templates)
+            stats["words"] = sorted(self.words)
+            stats["threshold"] = self.threshold
+        stats["real_time_factor"] = (stats["cpu_seconds"] / stats["audio_seconds"]
+                                     if stats["audio_seconds"] else 0.0)
+        return stats
+
+
+def read_wav(path: str) -> bytes:
+    """
+    Read a WAV file as 16-bit mono PCM at 16 kHz
+
+    Raises:
+        ValueError: If the file isn't 16-bit PCM
+    """
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError("only 16-bit PCM recordings are supported")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE and len(samples):
+        positions = np.arange(0, len(samples), rate / SAMPLE_RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples.astype(np.int16).tobytes()
+
+def write_wav(path: str, pcm: bytes):
+    """Write 16-bit mono PCM at 16 kHz to a WAV file"""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from modules.echo_guard import EchoSuppressor
+
+# Played sentences older than the history are dropped relative to now
+T = time.monotonic()
+
+
+@pytest.fixture
+def echo():
+    """A suppressor that just played two sentences, ending at T + 10"""
+    suppressor = EchoSuppressor(window=1.0)
+    suppressor.on_playback("Here is the weather in Mumbai.", T + 5.0, T + 7.5)
+    suppressor.on_playback("It will be sunny with a light breeze.", T + 7.5, T + 10.0)
+    return suppressor
+
+
+def test_echo_is_dropped(echo):
+    assert echo.filter("here is the weather in mumbai", T + 6.0, T + 8.0) is None
+    assert echo.filter("it will be sunny with a light breeze", T + 8.0, T + 10.2) is None
+
+
+def test_leading_echo_is_trimmed(echo):
+    heard = "sunny with a light breeze what about tomorrow"
+    assert echo.filter(heard, T + 9.0, T + 10.8) == "what about tomorrow"
+
+
+@pytest.mark.parametrize("heard", [
+    "the weather tomorrow",
+    "what is the weather in delhi",
+    "is it sunny in delhi",
+    "will it be windy tomorrow",
+    "play some music",
+])
+def test_user_repeating_played_words_is_kept(echo, heard):
+    assert echo.filter(heard, T + 10.2, T + 11.5) == heard
+
+
+def test_short_sentence_heard_back_whole_is_dropped():
+    suppressor = EchoSuppressor(window=1.0)
+    suppressor.on_playback("Sure thing.", T + 1.0, T + 1.6)
+    assert suppressor.filter("sure thing", T + 1.1, T + 1.9) is None
+
+
+def test_outside_window_is_kept(echo):
+    assert echo.filter("here is the weather in mumbai", T + 12.0, T + 13.0) == "here is the weather in mumbai"
+
+
+def test_stats(echo):
+    echo.filter("here is the weather in mumbai", T + 6.0, T + 8.0)
+    echo.filter("sunny with a light breeze what about tomorrow", T + 9.0, T + 10.8)
+    echo.filter("the weather tomorrow", T + 10.2, T + 11.5)
+    stats = echo.get_stats()
+    assert (stats["checked"], stats["dropped"], stats["trimmed"]) == (3, 1, 1)
@@ -0,0 +1,56 @@
+import pytest
+
+from modules.intent_matcher import IntentMatcher, PhraseAutomaton
+
+SYSTEM_COMMANDS = {"shutdown": "shutdown /s /t 1", "restart": "shutdown /r /t 1"}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return IntentMatcher(system_commands=SYSTEM_COMMANDS)
+
+
+def test_automaton_finds_overlapping_phrases():
+    automaton = PhraseAutomaton(["he", "she", "his", "hers"])
+    assert automaton.find("ushers") == {"she": 1, "he": 2, "hers": 2}
+    assert automaton.find("xyz") == {}
+
+
+def test_automaton_reports_first_occurrence():
+    assert PhraseAutomaton(["play"]).find("play it, play it again") == {"play": 0}
+
+
+@pytest.mark.parametrize("command, name, slots", [
+    ("play", "music", {"action": "play_random"}),
+    ("play playlist chill vibes", "music",
+     {"action": "search", "search_term": "chill vibes", "category": "playlists"}),
+    ("open spotify", "music", {"action": "launch"}),
+    ("next song", "music", {"action": "next"}),
+    ("volume up", "volume", {"action": "volume_up"}),
+    ("go to sleep", "sleep", {}),
+    ("open chrome and write hello world", "open", {"target": "chrome", "text": "hello world"}),
+    ("write a poem", "write", {"text": "a poem"}),
+    ("close spotify", "close", {"target": "spotify", "music": True}),
+    ("minimize chrome", "minimize", {"target": "chrome"}),
+    ("shutdown computer", "system", {"command": "shutdown", "action": "shutdown /s /t 1"}),
+    ("goodbye", "goodbye", {}),
+])
+def test_commands_are_routed(matcher, command, name, slots):
+    intent = matcher.match(command)
+    assert (intent.name, intent.slots) == (name, slots)
+
+
+@pytest.mark.parametrize("command", ["what is the weather in delhi", "rewrite this", "power off"])
+def test_other_text_goes_to_the_ai(matcher, command):
+    intent = matcher.match(command)
+    assert (intent.name, intent.slots, intent.confidence) == ("ai", {"text": command}, 0.0)
+
+
+def test_confidence_is_share_of_command_matched(matcher):
+    assert matcher.match("go to sleep").confidence == 1.0
+    assert matcher.match("write a poem").confidence == pytest.approx(len("write") / len("write a poem"))
+
+
+def test_media_phrases_need_a_player():
+    intent = IntentMatcher(media=False).match("volume up")
+    assert intent.name == "ai"
@@ -0,0 +1,68 @@
+import os
+import json
+
+import pytest
+
+from modules.phrase_index import PhraseIndex, phonetic_key
+from modules.intent_matcher import COMMAND_VARIATIONS, SLEEP_PHRASES, GOODBYE_WORDS
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+
+@pytest.fixture(scope="module")
+def index():
+    """The vocabulary SpeechRecognitionManager builds from config.json and the command tables"""
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    wake_words = [word.lower() for word in config["assistant_settings"]["wake_words"]]
+    vocabulary = list(wake_words)
+    for apps in config["applications"].values():
+        vocabulary.extend(apps)
+    vocabulary.extend(config["urls"])
+
+    commands = [phrase for phrases in COMMAND_VARIATIONS.values() for phrase in phrases]
+    commands += SLEEP_PHRASES + GOODBYE_WORDS + [f"open {site}" for site in config["urls"]]
+    prefixes = ["play", "music", "song", "track", "write", "search"]
+    return PhraseIndex(vocabulary + commands + prefixes, commands=commands + wake_words)
+
+
+def test_phonetic_key_ignores_word_boundaries():
+    assert phonetic_key("spot if i") == phonetic_key("spotify")
+
+
+@pytest.mark.parametrize("transcript", [
+    "remind me to call mom",
+    "write a poem about rain",
+    "who wrote hamlet",
+    "what is the weather in mumbai",
+    "tell me a joke about coffee",
+    "play playlist the stock market",
+    "how are you",
+    "what is up",
+])
+def test_free_text_is_kept(index, transcript):
+    assert index.match(transcript)[1] == transcript
+    assert index.rerank([transcript]) == (transcript, 0)
+
+
+@pytest.mark.parametrize("transcript, expected", [
+    ("next sung", "next song"),
+    ("jervis", "jarvis"),
+    ("open you tube", "open youtube"),
+    ("open spot if i", "open spotify"),
+])
+def test_sound_alikes_are_respelled(index, transcript, expected):
+    assert index.match(transcript)[1] == expected
+
+
+def test_keys_keep_underscores(index):
+    assert index.match("open spotify web")[1] == "open spotify_web"
+
+
+def test_rerank_prefers_vocabulary(index):
+    assert index.rerank(["service open chrome", "jarvis open chrome"]) == ("jarvis open chrome", 1)
+
+
+def test_rerank_keeps_top_hypothesis_without_vocabulary(index):
+    alternatives = ["tell me about the war", "tell me about the wall"]
+    assert index.rerank(alternatives) == ("tell me about the war", 0)
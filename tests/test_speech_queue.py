@@ -0,0 +1,102 @@
+import time
+import itertools
+import threading
+from queue import PriorityQueue
+from concurrent.futures import Future
+
+import pytest
+
+from modules.audio import AudioManager, SpeechPriority, SpeechStream
+
+
+class Channel:
+    """Stands in for the mixer channel stop() silences"""
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def manager():
+    """An AudioManager with just its speech queue; speaking records the text instead of playing it"""
+    manager = AudioManager.__new__(AudioManager)
+    manager.speech_queue = PriorityQueue()
+    manager.speech_sequence = itertools.count()
+    manager.pending_utterances = 0
+    manager.speech_done = threading.Condition()
+    manager.speech_channel = Channel()
+    manager.playback_generation = 0
+    manager.current_audio_file = None
+    manager.is_speaking = False
+    manager.is_muted = False
+    manager.should_stop = False
+    manager.spoken = []
+    manager._speak_text = lambda text: manager.spoken.append(text) or True
+    yield manager
+    # Wake the worker so it sees should_stop
+    manager.should_stop = True
+    manager.speech_queue.put((SpeechPriority.BACKGROUND, -1, None, None, Future()))
+
+
+def start(manager):
+    """Play everything queued so far"""
+    threading.Thread(target=manager._process_speech_queue, daemon=True).start()
+    assert manager.wait_until_done(timeout=2)
+
+
+def test_higher_priority_is_spoken_first(manager):
+    manager.speak("first normal")
+    manager.speak("second normal")
+    manager.speak("urgent", priority="high")
+    manager.speak("also urgent", priority=True)
+    start(manager)
+    assert manager.spoken == ["urgent", "also urgent", "first normal", "second normal"]
+
+
+def test_background_is_dropped_while_busy(manager):
+    manager.speak("normal")
+    assert manager.speak("idle chatter", priority=SpeechPriority.BACKGROUND) is None
+    start(manager)
+    assert manager.spoken == ["normal"]
+
+
+def test_interrupt_cancels_queued_speech(manager):
+    queued = [manager.speak("one"), manager.speak("two")]
+    interrupt = manager.speak("now", priority="interrupt")
+    start(manager)
+    assert all(future.cancelled() for future in queued)
+    assert interrupt.result(timeout=1) is True
+    assert manager.spoken == ["now"]
+    assert manager.playback_generation == 1
+
+
+def test_expired_speech_is_dropped(manager):
+    stale = manager.speak("stale status", ttl=0.01)
+    fresh = manager.speak("fresh status", ttl=10)
+    time.sleep(0.05)
+    start(manager)
+    assert stale.cancelled()
+    assert fresh.result(timeout=1) is True
+    assert manager.spoken == ["fresh status"]
+
+
+def test_priority_names_resolve():
+    assert SpeechPriority.resolve("Interrupt") == SpeechPriority.INTERRUPT
+    assert SpeechPriority.resolve(True) == SpeechPriority.HIGH
+    assert SpeechPriority.resolve(False) == SpeechPriority.NORMAL
+    assert SpeechPriority.resolve("unknown") == SpeechPriority.NORMAL
+    assert SpeechPriority.resolve(7) == SpeechPriority.NORMAL
+
+
+def test_stream_merges_waiting_sentences():
+    stream = SpeechStream(["One.", "Two.", "A much longer third sentence."])
+    assert stream.next_sentence(timeout=0, max_chars=20) == "One. Two."
+    assert stream.next_sentence(timeout=0, max_chars=20) == "A much longer third sentence."
+    assert stream.next_sentence(timeout=0) is SpeechStream._END
+    assert (stream.sentence_count, stream.chunk_count) == (3, 2)
+
+
+def test_open_stream_times_out():
+    stream = SpeechStream()
+    stream.put("Hello.")
+    assert stream.next_sentence(timeout=0) == "Hello."
+    assert stream.next_sentence(timeout=0.01) is None
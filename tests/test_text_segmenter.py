@@ -0,0 +1,49 @@
+import pytest
+
+from modules.text_segmenter import (split_sentences, merge_sentences, SentenceBoundaryDetector,
+                                    TextSegmenter)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("No. Okay, starting now.", ["No.", "Okay, starting now."]),
+    ("I said no. Then I left.", ["I said no.", "Then I left."]),
+    ("It is the best. Trust me.", ["It is the best.", "Trust me."]),
+    ("Room No. 5 is free. Go there.", ["Room No. 5 is free.", "Go there."]),
+    ("Founded in Est. 1990 it grew. Now it is big.", ["Founded in Est. 1990 it grew.", "Now it is big."]),
+    ("Meet me at St. James Park. Bring food.", ["Meet me at St. James Park.", "Bring food."]),
+    ("Dr. Smith is in. He will see you.", ["Dr. Smith is in.", "He will see you."]),
+    ("J. R. R. Tolkien wrote it. Read it.", ["J. R. R. Tolkien wrote it.", "Read it."]),
+    ("It costs 3.5 dollars. Cheap!", ["It costs 3.5 dollars.", "Cheap!"]),
+    ("Visit example.com today. Thanks.", ["Visit example.com today.", "Thanks."]),
+    ("First line\nSecond line", ["First line", "Second line"]),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_merge_keeps_first_chunk_short():
+    sentences = ["Sure.", "Here is what I found about that.", "It is long enough to split."]
+    chunks = merge_sentences(sentences, max_chars=100, first_chars=20)
+    assert chunks == ["Sure.", "Here is what I found about that. It is long enough to split."]
+
+
+def test_merge_keeps_long_sentences_whole():
+    sentence = "word " * 40
+    assert merge_sentences([sentence.strip(), "Short."], max_chars=50) == [sentence.strip(), "Short."]
+
+
+def test_streamed_text_waits_for_the_word_after_no():
+    detector = SentenceBoundaryDetector()
+    assert detector.feed("Room No. ") == []
+    assert detector.feed("5 is free. ") == ["Room No. 5 is free."]
+    assert detector.feed("No. ") == []
+    assert detector.feed("Okay") == ["No."]
+    assert detector.flush() == "Okay"
+
+
+def test_segmenter_stats_skip_uncounted_text():
+    segmenter = TextSegmenter()
+    segmenter.segment("Hello there. How are you?", count=False)
+    assert segmenter.get_stats() == {"naive_segments": 0, "sentences": 0, "chunks": 0}
+    segmenter.segment("Hello there. How are you?")
+    assert segmenter.get_stats() == {"naive_segments": 2, "sentences": 2, "chunks": 1}
@@ -0,0 +1,61 @@
+import pytest
+
+from modules.tts_backends import NullBackend, TTSBackendSelector
+
+
+class FailingBackend(NullBackend):
+    """A backend that is down"""
+    name = "failing"
+
+    def synthesize(self, text):
+        raise OSError("no network")
+
+
+def backend(name, latency=0.0):
+    """A silent backend under its own name"""
+    backend = NullBackend(latency=latency)
+    backend.name = name
+    return backend
+
+
+def test_failing_backend_is_skipped_and_demoted():
+    fallback = backend("fallback")
+    selector = TTSBackendSelector([FailingBackend(), fallback], cooldown=60)
+    data, used = selector.synthesize("Hello")
+    assert used is fallback
+    assert data.startswith(b"RIFF")
+    assert [b.name for b in selector.ordered_backends()] == ["fallback", "failing"]
+    stats = selector.get_stats()
+    assert stats["failing"]["failures"] == 1
+    assert stats["failing"]["demoted"]
+    assert not stats["fallback"]["demoted"]
+
+
+def test_demoted_backend_is_retried_after_cooldown():
+    selector = TTSBackendSelector([FailingBackend(), backend("fallback")], cooldown=0)
+    selector.synthesize("Hello")
+    assert [b.name for b in selector.ordered_backends()] == ["failing", "fallback"]
+
+
+def test_slow_backend_is_demoted():
+    fast = backend("fast")
+    selector = TTSBackendSelector([backend("slow", latency=0.05), fast], slow_threshold=0.02)
+    assert selector.synthesize("Hello")[1].name == "slow"
+    assert selector.synthesize("Hello")[1] is fast
+    assert selector.get_stats()["slow"]["demoted"]
+
+
+def test_all_backends_failing_raises():
+    selector = TTSBackendSelector([FailingBackend()])
+    with pytest.raises(RuntimeError):
+        selector.synthesize("Hello")
+
+
+def test_backends_are_required():
+    with pytest.raises(ValueError):
+        TTSBackendSelector([])
+
+
+def test_cache_key_depends_on_backend():
+    assert backend("a").cache_key("Hello") != backend("b").cache_key("Hello")
+    assert NullBackend().cache_key("Hello") == NullBackend().cache_key("Hello")
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from modules.tts_cache import TTSCache
+
+CLIP = b"x" * 10
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A cache with room for three 10-byte clips"""
+    return TTSCache(str(tmp_path), max_size_mb=30 / (1024 * 1024))
+
+
+def files(cache):
+    return sorted(os.listdir(cache.cache_dir))
+
+
+def test_store_and_read(cache):
+    key = TTSCache.make_key("Hello there", "en", "co.in")
+    assert cache.read(key) is None
+    path = cache.store_bytes(key, CLIP)
+    assert path == os.path.join(cache.cache_dir, key + ".mp3")
+    assert cache.read(key) == CLIP
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["size_bytes"]) == (1, 1, 1, 10)
+
+
+def test_key_depends_on_voice_settings():
+    key = TTSCache.make_key("Hello", "en", "co.in")
+    assert key == TTSCache.make_key(" Hello ", "en", "co.in")
+    assert key != TTSCache.make_key("Hello", "en", "com")
+    assert key != TTSCache.make_key("Hello", "en", "co.in", {"backend": "pyttsx3"})
+
+
+def test_least_recently_used_is_evicted(cache):
+    for key in ("a", "b", "c"):
+        cache.store_bytes(key, CLIP)
+    assert cache.get("a")
+    cache.store_bytes("d", CLIP)
+    assert files(cache) == ["a.mp3", "c.mp3", "d.mp3"]
+    assert cache.get("b") is None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_clip_larger_than_budget_is_not_stored(cache):
+    assert cache.store_bytes("big", b"x" * 31) is None
+    assert files(cache) == []
+
+
+def test_failed_write_leaves_nothing_behind(cache, monkeypatch):
+    def fail(source, target):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    assert cache.store_bytes("a", CLIP) is None
+    monkeypatch.undo()
+    assert files(cache) == []
+    assert not cache.contains("a")
+
+
+def test_store_file_moves_the_clip(cache, tmp_path):
+    source = tmp_path / "synthesized.wav"
+    source.write_bytes(CLIP)
+    path = cache.store_file("a", str(source))
+    assert path == os.path.join(cache.cache_dir, "a.wav")
+    assert not source.exists()
+    assert cache.read("a") == CLIP
+
+
+def test_index_is_rebuilt_from_disk(cache):
+    for index, key in enumerate(("a", "b", "c")):
+        cache.store_bytes(key, CLIP)
+        os.utime(os.path.join(cache.cache_dir, key + ".mp3"), (1000 + index, 1000 + index))
+    # Left over from a write that was interrupted
+    with open(os.path.join(cache.cache_dir, ".tmpabc"), "wb") as f:
+        f.write(b"partial")
+
+    reopened = TTSCache(cache.cache_dir, max_size_mb=20 / (1024 * 1024))
+    assert files(reopened) == ["b.mp3", "c.mp3"]
+    assert list(reopened.entries) == ["b", "c"]
+
+
+def test_expire_removes_unused_entries(cache):
+    cache.store_bytes("old", CLIP)
+    cache.store_bytes("new", CLIP)
+    os.utime(os.path.join(cache.cache_dir, "old.mp3"), (1000, 1000))
+    assert cache.expire(3600) == {"entries": 1, "bytes": 10}
+    assert files(cache) == ["new.mp3"]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from modules.vad import VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+BUFFER = 1600  # 0.1 s, as captured by MicrophoneStream
+THRESHOLD = 300
+
+
+def hum(buffers, amplitude=3000, seed=0):
+    """A 100 Hz mains hum with two harmonics over faint hiss"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(buffers * BUFFER) / SAMPLE_RATE
+    signal = sum(amplitude / k * np.sin(2 * np.pi * 100 * k * t) for k in (1, 2, 3))
+    return (signal + rng.normal(0, 30, len(t))).astype(np.int16)
+
+
+def voice(buffers, amplitude=4000, seed=1):
+    """A voiced sound with a wandering pitch, syllable-rate loudness and changing timbre"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(buffers * BUFFER) / SAMPLE_RATE
+    pitch = 150 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    envelope = 0.2 + 0.8 * np.abs(np.sin(2 * np.pi * 2.5 * t))
+    formant = 1 + 0.8 * np.sin(2 * np.pi * 1.3 * t)
+    signal = envelope * sum(amplitude / k * (formant if k > 3 else 1) * np.sin(k * phase) for k in range(1, 10))
+    return np.clip(signal + rng.normal(0, 30, len(t)), -32000, 32000).astype(np.int16)
+
+
+def buffers(samples):
+    return [samples[i:i + BUFFER] for i in range(0, len(samples), BUFFER)]
+
+
+def test_voice_is_voiced():
+    vad = VoiceActivityDetector(SAMPLE_RATE, BUFFER / SAMPLE_RATE)
+    assert all(vad.is_voiced(buffer, THRESHOLD) for buffer in buffers(voice(10)))
+
+
+def test_learned_hum_is_not_voiced():
+    vad = VoiceActivityDetector(SAMPLE_RATE, BUFFER / SAMPLE_RATE)
+    hum_buffers = buffers(hum(60))
+    for buffer in hum_buffers[:50]:
+        vad.is_voiced(buffer, THRESHOLD)
+        vad.update_noise()
+    assert not any(vad.is_voiced(buffer, THRESHOLD) for buffer in hum_buffers[50:])
+
+
+def test_voice_over_learned_hum_is_voiced():
+    vad = VoiceActivityDetector(SAMPLE_RATE, BUFFER / SAMPLE_RATE)
+    hum_samples = hum(60)
+    for buffer in buffers(hum_samples[:50 * BUFFER]):
+        vad.is_voiced(buffer, THRESHOLD)
+        vad.update_noise()
+    mixed = np.clip(hum_samples[50 * BUFFER:].astype(np.int32) + voice(10), -32000, 32000).astype(np.int16)
+    assert all(vad.is_voiced(buffer, THRESHOLD) for buffer in buffers(mixed))
+
+
+def test_hum_starting_mid_stream_stops_counting_as_speech():
+    vad = VoiceActivityDetector(SAMPLE_RATE, BUFFER / SAMPLE_RATE, stationary_duration=3.0)
+    active = [vad.update(buffer, THRESHOLD) for buffer in buffers(hum(80))]
+    # Speech for at most the stationary duration plus the hangover, then noise for good
+    assert active.index(False) <= 35
+    assert not any(active[40:])
+    assert vad.get_stats()["stationary_rejected"] >= 1
+
+
+def test_long_speech_is_not_learned_as_noise():
+    vad = VoiceActivityDetector(SAMPLE_RATE, BUFFER / SAMPLE_RATE, stationary_duration=3.0)
+    active = [vad.update(buffer, THRESHOLD) for buffer in buffers(voice(80))]
+    assert all(active)
+    assert vad.get_stats()["stationary_rejected"] == 0